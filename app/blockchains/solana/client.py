@@ -2,11 +2,12 @@ import base64
 import dataclasses
 import logging
 import struct
+import threading
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Mapping, Union, Dict
 
 import base58
-import multiprocess as mp
 from solana.publickey import PublicKey
 from solana.rpc import commitment
 from solana.rpc.api import MemcmpOpt, Client
@@ -428,18 +429,26 @@ def nft_get_token_account_by_token_key(token_key: str) -> PublicKey:
 #   The could be use to fetch the new collection.
 
 
-def _get_transaction(client_signature_pair):
-    client, sig = client_signature_pair
-    try:
-        resp = client.get_confirmed_transaction(sig)
-    except Exception as e:
-        logger.error("Cannot get transaction data due to %s", str(e))
-        return None
-    return resp.get('result')
+# One client per worker thread of `get_multi_transactions`, so its connection
+# pool is reused by every batch the thread sends.
+_thread_local = threading.local()
+
+
+def _get_transactions_batch(signatures: List[str]) -> Dict[str, dict]:
+    client = getattr(_thread_local, 'client', None)
+    if client is None:
+        client = _thread_local.client = CustomClient(settings.SOLANA_RPC_ENDPOINT, timeout=60)
+    responses = client.get_transactions_batch(signatures, batch_size=len(signatures))
+    return {
+        signature: responses.get(signature, {}).get('result')
+        for signature in signatures
+    }
 
 
 def get_multi_transactions(signatures: List[str], batch_size=50) -> Dict[str, dict]:
     """
+    Fetches transactions with JSON-RPC batch requests of `batch_size` signatures,
+    at most `SOLANA_RPC_MAX_PARALLEL_BATCHES` batches are sent in parallel.
 
     Args:
         signatures:
@@ -449,33 +458,20 @@ def get_multi_transactions(signatures: List[str], batch_size=50) -> Dict[str, di
         Dict, mapping from signatures to the transaction data. The values can be null
         if the fetch for the trasactions failed.
     """
-    batches = int(round(len(signatures) / batch_size))
-    if batches == 0:
-        batches = 1
-    clients = [
-        CustomClient(settings.SOLANA_RPC_ENDPOINT, timeout=60)
-        for _ in range(batches)
+    batches = [
+        signatures[start:start + batch_size]
+        for start in range(0, len(signatures), batch_size)
     ]
-    client_signature_pairs = [
-        (clients[i % batches], signature)
-        for i, signature in enumerate(signatures)
-    ]
-    pool = mp.Pool(batches)
-    try:
-        all_result = list(pool.imap(
-            _get_transaction,
-            client_signature_pairs,
-            chunksize=batch_size
-        ))
-        pool.close()
-    finally:
-        pool.terminate()
-        pool.join()
-
-    return dict(zip(
-        signatures,
-        all_result
-    ))
+    if not batches:
+        return {}
+
+    all_result = {}
+    max_workers = min(len(batches), settings.SOLANA_RPC_MAX_PARALLEL_BATCHES)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch_result in executor.map(_get_transactions_batch, batches):
+            all_result.update(batch_result)
+
+    return {signature: all_result.get(signature) for signature in signatures}
 
 
 def fetch_transactions_for_pubkey_para(
@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 from typing import Optional, Union
 
 import httpx
@@ -68,6 +68,71 @@ class CustomClient(Client):
         super().__init__(endpoint, commitment, blockhash_cache, timeout=timeout)
         self._provider = CustomHTTPProvider(endpoint, timeout=timeout)
 
+    def get_transactions_batch(
+            self,
+            signatures: List[str],
+            batch_size: int = 50,
+            encoding: str = "json"
+    ) -> Dict[str, RPCResponse]:
+        """
+        Fetches transactions with JSON-RPC batch requests, one HTTP request per
+        `batch_size` signatures. Responses are mapped back to signatures by request
+        id, signatures whose response is an error or missing are fetched again with
+        single calls.
+
+        Returns:
+            Dict, mapping from signatures to the RPC responses.
+        """
+        responses = {}
+        for start in range(0, len(signatures), batch_size):
+            batch = signatures[start:start + batch_size]
+            responses.update(self._post_batch(batch, encoding))
+
+        for signature in signatures:
+            if 'result' in responses.get(signature, {}):
+                continue
+            try:
+                responses[signature] = self.get_confirmed_transaction(signature, encoding)
+            except Exception as e:
+                logger.error("Cannot get transaction data due to %s", str(e))
+                responses[signature] = {'error': str(e)}
+
+        return responses
+
+    def _post_batch(self, signatures: List[str], encoding: str) -> Dict[str, RPCResponse]:
+        request = [
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "getConfirmedTransaction",
+                "params": [signature, encoding],
+            }
+            for request_id, signature in enumerate(signatures)
+        ]
+        try:
+            raw_response = requests.post(
+                self._provider.endpoint_uri,
+                data=json.dumps(request),
+                headers={"Content-Type": "application/json"},
+                auth=self._provider.auth,
+                timeout=self._provider.timeout,
+            )
+            raw_response.raise_for_status()
+            results = self._provider.json_decode(raw_response.text)
+        except (requests.RequestException, ValueError) as e:
+            logger.error("Batch request has failed due to %s", str(e))
+            return {}
+
+        if not isinstance(results, list):
+            # Batches are not supported, a single error is returned for the request.
+            return {}
+
+        return {
+            signatures[result['id']]: result
+            for result in results
+            if isinstance(result.get('id'), int) and 0 <= result['id'] < len(signatures)
+        }
+
 
 class CustomAsyncHTTPProvider(AsyncHTTPProvider):
 
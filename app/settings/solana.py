@@ -7,6 +7,8 @@ SOLANA_RPC_WSS_ENDPOINT = system.get_secure_env('SOLANA_RPC_WSS_ENDPOINT')
 SOLANA_RPC_CLUSTER_USERNAME = system.get_secure_env('SOLANA_RPC_CLUSTER_USERNAME')
 SOLANA_RPC_CLUSTER_PASSWORD = system.get_secure_env('SOLANA_RPC_CLUSTER_PASSWORD')
 SOLANA_RPC_CLUSTER_BASIC_AUTH = (SOLANA_RPC_CLUSTER_USERNAME, SOLANA_RPC_CLUSTER_PASSWORD)
+# Maximum number of batch requests sent to the RPC endpoint in parallel
+SOLANA_RPC_MAX_PARALLEL_BATCHES = int(os.getenv('SOLANA_RPC_MAX_PARALLEL_BATCHES', '8'))
 
 # For Secondary Event Streaming
 SOLANA_SME_KINESIS_STREAM = os.environ['SOLANA_SME_KINESIS_STREAM']
@@ -129,7 +129,8 @@ class KinesisStreamer:
     PRODUCER_LOG_ONLY = 1
     PRODUCER_LOCAL_CONSUMER = 2
 
-    def __init__(self, stream_name, region, endpoint_url=None, producer_mode=0, handler=None):
+    def __init__(self, stream_name, region, endpoint_url=None, producer_mode=0, handler=None,
+                 partition_key=None):
         """
 
         Args:
@@ -142,8 +143,11 @@ class KinesisStreamer:
                 2 - Locally simulates Lambda invocation to invoke the consumer.
             handler: Consumer function that follows the Lambda Kinesis contract
                 to receive messages for local run. Only meaningful when producer_mode = 2.
+            partition_key: Function returning partition key of a record. Random
+                partition keys are used by default.
         """
         self.stream_name = stream_name
+        self.partition_key = partition_key or (lambda _: str(uuid.uuid4()))
         self.region = region
         if producer_mode == self.PRODUCER_LOCAL_CONSUMER:
             # Use local handler directly (if one is wrapped)
@@ -213,7 +217,7 @@ class KinesisStreamer:
                 Records=[
                     {
                         'Data': orjson.dumps(rec),
-                        'PartitionKey': str(uuid.uuid4()),
+                        'PartitionKey': self.partition_key(rec),
                     } for rec in records
                 ],
                 StreamName=self.stream_name
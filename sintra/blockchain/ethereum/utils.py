@@ -28,6 +28,15 @@ def ethereum_market_program_id_map() -> Dict[str, int]:
     }
 
 
+def ethereum_market_topics_map() -> Dict[str, List[str]]:
+    open_sea_topics = settings.blockchain.ethereum.market.open_sea.event_topics
+
+    return {
+        settings.blockchain.ethereum.market.open_sea.program_account: open_sea_topics,
+        settings.blockchain.ethereum.market.open_sea.program_account_v2: open_sea_topics,
+    }
+
+
 def ethereum_market_accounts() -> List[str]:
     return list(ethereum_market_program_id_map().keys())
 
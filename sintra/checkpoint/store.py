@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import boto3
+
+from sintra.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore(ABC):
+    """Persists the last processed position (transaction signature or
+    block number) of every market account."""
+
+    @abstractmethod
+    def load(self, market_accounts: List[str]) -> Dict[str, str]:
+        """Load stored checkpoints.
+
+        Args:
+            market_accounts (List[str]): Market accounts to load checkpoints for.
+
+        Returns:
+            Dict[str, str]: Checkpoints of market accounts that have one.
+
+        """
+
+    @abstractmethod
+    def save(self, checkpoints: Dict[str, str]) -> None:
+        """Store checkpoints, overwriting the previous ones.
+
+        Args:
+            checkpoints (Dict[str, str]): Checkpoints mapped by market account.
+
+        """
+
+
+class FileCheckpointStore(CheckpointStore):
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+
+    def load(self, market_accounts: List[str]) -> Dict[str, str]:
+        if not self.path.exists():
+            return {}
+
+        with open(self.path, "r") as checkpoint_file:
+            checkpoints = json.load(checkpoint_file)
+
+        return {
+            account: checkpoints[account]
+            for account in market_accounts
+            if account in checkpoints
+        }
+
+    def save(self, checkpoints: Dict[str, str]) -> None:
+        stored = {}
+        if self.path.exists():
+            with open(self.path, "r") as checkpoint_file:
+                stored = json.load(checkpoint_file)
+        stored.update(checkpoints)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_suffix(".tmp")
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump(stored, checkpoint_file)
+        os.replace(temporary_path, self.path)
+
+
+class DynamoDBCheckpointStore(CheckpointStore):
+    def __init__(self, table_name: str) -> None:
+        active_param = str(settings.localstack.active).lower()
+        active = active_param == "true"
+
+        if active:
+            self.client = boto3.client(
+                "dynamodb",
+                region_name=settings.localstack.region,
+                endpoint_url=settings.localstack.endpoint,
+            )
+        else:
+            self.client = boto3.client("dynamodb")
+
+        self.table_name = table_name
+
+    def load(self, market_accounts: List[str]) -> Dict[str, str]:
+        checkpoints = {}
+        for account in market_accounts:
+            response = self.client.get_item(
+                TableName=self.table_name,
+                Key={"market_account": {"S": account}},
+                ConsistentRead=True,
+            )
+            if "Item" in response:
+                checkpoints[account] = response["Item"]["checkpoint"]["S"]
+
+        return checkpoints
+
+    def save(self, checkpoints: Dict[str, str]) -> None:
+        for account, checkpoint in checkpoints.items():
+            self.client.put_item(
+                TableName=self.table_name,
+                Item={
+                    "market_account": {"S": account},
+                    "checkpoint": {"S": checkpoint},
+                },
+            )
+
+
+def build_checkpoint_store(store_type: str) -> Optional[CheckpointStore]:
+    if store_type == "file":
+        return FileCheckpointStore(settings.checkpoint.path)
+    if store_type == "dynamodb":
+        return DynamoDBCheckpointStore(settings.checkpoint.table_name)
+    if store_type == "none":
+        return None
+
+    raise ValueError(f"Unknown checkpoint store type: {store_type}.")
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable
+
+
+class SignatureCache:
+    """Bounded set of recently seen transaction signatures.
+
+    Entries are evicted in least recently seen order once `max_size` is
+    exceeded, or when they haven't been seen for `ttl` seconds, so memory
+    usage stays bounded regardless of the transaction rate.
+    """
+
+    def __init__(
+        self, max_size: int, ttl: float, clock: Callable[[], float] = monotonic
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, signature: str) -> bool:
+        seen_at = self._entries.get(signature)
+        return seen_at is not None and self.clock() - seen_at < self.ttl
+
+    def add(self, signature: str) -> bool:
+        """Mark signature as seen.
+
+        Args:
+            signature (str): Transaction signature.
+
+        Returns:
+            bool: True if signature hasn't been seen within TTL, False otherwise.
+
+        """
+        now = self.clock()
+        self._expire(now)
+
+        seen = signature in self._entries
+        self._entries[signature] = now
+        self._entries.move_to_end(signature)
+        if seen:
+            return False
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return True
+
+    def _expire(self, now: float) -> None:
+        # Entries are ordered by last seen time, so expired ones are at the front.
+        while self._entries:
+            signature, seen_at = next(iter(self._entries.items()))
+            if now - seen_at < self.ttl:
+                break
+            del self._entries[signature]
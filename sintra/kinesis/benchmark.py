@@ -0,0 +1,163 @@
+"""Shard heat benchmark of partition strategies over recorded traffic.
+
+Recorded traffic is a JSON lines file of records, e.g. signature records or
+secondary market events. Every record is assigned a shard of a stream with
+evenly split hash key ranges, and per shard load is compared to the Kinesis
+write limits of 1000 records and 1 MiB per second.
+
+Usage:
+    python -m sintra.kinesis.benchmark records.jsonl --shards 4 --key signature
+"""
+import argparse
+import json
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sintra.kinesis.partition import (
+    HASH_KEY_SPACE,
+    Partitioner,
+    PartitionStrategy,
+    hash_key,
+)
+
+SHARD_MAX_RECORDS_PER_SECOND = 1000
+SHARD_MAX_BYTES_PER_SECOND = 1024 * 1024
+
+
+@dataclass
+class ShardHeat:
+    strategy: str
+    records: List[int]
+    peak_records_per_second: List[int]
+    peak_bytes_per_second: List[int]
+    throttled_seconds: int
+    hottest_keys: List[Tuple[str, int]]
+
+    @property
+    def heat(self) -> float:
+        """Load of the busiest shard relative to the mean shard load."""
+        mean = sum(self.records) / len(self.records)
+        return max(self.records) / mean if mean else 0
+
+    def report(self) -> str:
+        lines = [
+            f"Strategy: {self.strategy}",
+            f"  Records per shard: {self.records}",
+            f"  Heat (max / mean): {self.heat:.2f}",
+            f"  Peak records/s per shard: {self.peak_records_per_second}",
+            f"  Peak bytes/s per shard: {self.peak_bytes_per_second}",
+            f"  Shard-seconds over write limits: {self.throttled_seconds}",
+        ]
+        if self.hottest_keys:
+            lines.append(f"  Hottest partition keys: {self.hottest_keys}")
+        return "\n".join(lines)
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as records_file:
+        for line in records_file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def to_seconds(timestamp: float) -> int:
+    """Convert timestamp in seconds, milliseconds, microseconds or nanoseconds
+    to whole seconds."""
+    for divisor in (1e9, 1e6, 1e3):
+        if timestamp >= 1e9 * divisor:
+            return int(timestamp / divisor)
+    return int(timestamp)
+
+
+def shard_heat(
+    records: List[Dict[str, Any]],
+    shards: int,
+    strategy: str,
+    key: str,
+    time_key: Optional[str] = "timestamp",
+) -> ShardHeat:
+    """Assign records to shards with partition strategy and measure load.
+
+    Args:
+        records (List[Dict[str, Any]]): Recorded records.
+        shards (int): Number of shards in stream.
+        strategy (str): Partition strategy.
+        key (str): Record field used as partition key.
+        time_key (Optional[str]): Record field with record timestamp, used
+            to measure per second load.
+
+    Returns:
+        ShardHeat: Load of shards.
+
+    """
+    partitioner = Partitioner(strategy, key)
+    shard_range = HASH_KEY_SPACE // shards
+    counts = [0] * shards
+    per_second: Dict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0])
+    keys: Counter = Counter()
+
+    for record in records:
+        partition_key, explicit_hash_key = partitioner.partition(
+            SimpleNamespace(**record)
+        )
+        record_hash_key = (
+            int(explicit_hash_key)
+            if explicit_hash_key is not None
+            else hash_key(partition_key)
+        )
+        shard = min(record_hash_key // shard_range, shards - 1)
+        counts[shard] += 1
+        if strategy == PartitionStrategy.KEY:
+            keys[partition_key] += 1
+
+        if time_key is not None and record.get(time_key) is not None:
+            load = per_second[(shard, to_seconds(record[time_key]))]
+            load[0] += 1
+            load[1] += len(json.dumps(record)) + len(partition_key)
+
+    peak_records, peak_bytes = [0] * shards, [0] * shards
+    throttled = 0
+    for (shard, _), (second_records, second_bytes) in per_second.items():
+        peak_records[shard] = max(peak_records[shard], second_records)
+        peak_bytes[shard] = max(peak_bytes[shard], second_bytes)
+        if (
+            second_records > SHARD_MAX_RECORDS_PER_SECOND
+            or second_bytes > SHARD_MAX_BYTES_PER_SECOND
+        ):
+            throttled += 1
+
+    return ShardHeat(
+        strategy=strategy,
+        records=counts,
+        peak_records_per_second=peak_records,
+        peak_bytes_per_second=peak_bytes,
+        throttled_seconds=throttled,
+        hottest_keys=keys.most_common(5),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("records", help="JSON lines file of recorded records.")
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--key", default="signature", help="Partition key field.")
+    parser.add_argument(
+        "--strategy",
+        choices=[member.value for member in PartitionStrategy],
+        action="append",
+        help="Strategy to benchmark, all of them by default.",
+    )
+    parser.add_argument("--time-key", default="timestamp")
+    args = parser.parse_args()
+
+    records = list(read_records(args.records))
+    print(f"Records: {len(records)}, shards: {args.shards}")
+    for strategy in args.strategy or [member.value for member in PartitionStrategy]:
+        heat = shard_heat(records, args.shards, strategy, args.key, args.time_key)
+        print(heat.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Kept identical in `sintra/kinesis/partition.py` (worker) and
+# `sintra/lambda/shared/partition.py` (lambdas). Lambda images are built from
+# `sintra/lambda` only and the worker image excludes it, so neither can import
+# the other. `tests/sintra/kinesis/test_partition.py` checks they stay in sync.
+import hashlib
+import math
+import random
+import uuid
+from enum import Enum
+from typing import Any, Optional, Tuple
+
+# Kinesis maps partition keys to 128-bit hash keys with MD5, every shard owns
+# a contiguous range of hash keys.
+HASH_KEY_SPACE = 2**128
+
+# Golden ratio conjugate scaled to the hash key space. Stepping by it spreads
+# consecutive records evenly over any number of equally sized shards.
+_GOLDEN_STEP = (math.isqrt(5 * HASH_KEY_SPACE**2) - HASH_KEY_SPACE) // 2 | 1
+
+
+class PartitionStrategy(str, Enum):
+    KEY = "key"
+    EXPLICIT = "explicit"
+    RANDOM = "random"
+
+
+def hash_key(partition_key: str) -> int:
+    """Return hash key Kinesis maps partition key to."""
+    return int.from_bytes(hashlib.md5(partition_key.encode()).digest(), "big")
+
+
+class Partitioner:
+    """Chooses partition key and explicit hash key of records.
+
+    Strategies:
+        key: Partition key is the `key` attribute of record (e.g. signature,
+            token or market), records with the same key land on the same
+            shard and keep their order.
+        explicit: Partition key is the `key` attribute, but explicit hash keys
+            spread consecutive records evenly over all shards regardless of
+            the key, trading per-key ordering for balanced shards.
+        random: Random partition key.
+    """
+
+    def __init__(self, strategy: str = PartitionStrategy.KEY, key: str = "") -> None:
+        if strategy not in list(PartitionStrategy):
+            raise ValueError(f"Unknown partition strategy: {strategy}.")
+        if strategy != PartitionStrategy.RANDOM and not key:
+            raise ValueError(f"Partition strategy {strategy} requires a key.")
+
+        self.strategy = strategy
+        self.key = key
+        # Random start, so partitioners of concurrent producers, or of
+        # successive lambda invocations, don't all begin on the same shard.
+        self._hash_key = random.randrange(HASH_KEY_SPACE)
+
+    def partition(self, record: Any) -> Tuple[str, Optional[str]]:
+        """Return partition key and explicit hash key of record.
+
+        Args:
+            record (Any): Record with the `key` attribute.
+
+        Returns:
+            Tuple[str, Optional[str]]: Partition key and explicit hash key,
+                None if shard is chosen by partition key.
+
+        """
+        if self.strategy == PartitionStrategy.RANDOM:
+            return str(uuid.uuid4()), None
+
+        partition_key = str(getattr(record, self.key))
+        if self.strategy == PartitionStrategy.EXPLICIT:
+            self._hash_key = (self._hash_key + _GOLDEN_STEP) % HASH_KEY_SPACE
+            return partition_key, str(self._hash_key)
+
+        return partition_key, None
@@ -1,15 +1,34 @@
+import asyncio
+import functools
 import json
 import logging
-from typing import Any, List
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import boto3
+from strenum import StrEnum
 
 from sintra.config import settings
 from sintra.exception import ProduceRecordFailedException
 from sintra.kinesis.record import KinesisRecord
+from sintra.kinesis.spill import SpillBuffer, SpillEntry
 
 logger = logging.getLogger(__name__)
 
+KINESIS_MAX_BATCH_SIZE = 500
+
+
+class RecordEncoding(StrEnum):
+    JSON = "json"
+    BINARY = "binary"
+
+
+def serialize_record(record: KinesisRecord) -> bytes:
+    """Serialize record in the encoding configured for the signature stream."""
+    if settings.kinesis.encoding == RecordEncoding.BINARY:
+        return record.to_bytes()
+    return json.dumps(record.to_dikt()).encode()
+
 
 class KinesisProducer:
     def __init__(self) -> None:
@@ -28,8 +47,7 @@ class KinesisProducer:
     def produce_record(
         self, stream_name: str, record: KinesisRecord, partition_key: Any
     ) -> None:
-        record_dikt: str = json.dumps(record.to_dikt())
-        record_to_send = record_dikt.encode()
+        record_to_send = serialize_record(record)
 
         try:
             self.client.put_record(
@@ -40,15 +58,273 @@ class KinesisProducer:
             raise ProduceRecordFailedException from error
 
     def produce_records(
-        self, stream_name: str, records: List[KinesisRecord], partition_key: Any
+        self,
+        stream_name: str,
+        records: List[KinesisRecord],
+        partition_keys: List[Any],
+        explicit_hash_keys: Optional[List[Optional[str]]] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1,
+    ) -> None:
+        """Send records with a single PutRecords call. Only the entries
+        reported as failed are retried, with exponential backoff.
+
+        Explicit hash key of record, if given, overrides the shard chosen by
+        its partition key.
+
+        Raises:
+            ProduceRecordFailedException: If request fails or some of the
+                records are still failing after all retries.
+
+        """
+        if explicit_hash_keys is None:
+            explicit_hash_keys = [None] * len(records)
+
+        entries: List[Dict[str, Any]] = []
+        for record, partition_key, explicit_hash_key in zip(
+            records, partition_keys, explicit_hash_keys
+        ):
+            entry = {
+                "Data": serialize_record(record),
+                "PartitionKey": str(partition_key),
+            }
+            if explicit_hash_key is not None:
+                entry["ExplicitHashKey"] = explicit_hash_key
+            entries.append(entry)
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.client.put_records(
+                    StreamName=stream_name, Records=entries
+                )
+            except Exception as error:
+                logger.error(error)
+                raise ProduceRecordFailedException from error
+
+            if response["FailedRecordCount"] == 0:
+                return
+
+            entries = [
+                entry
+                for entry, result in zip(entries, response["Records"])
+                if "ErrorCode" in result
+            ]
+            logger.warning(
+                f"Failed to put {len(entries)} records (attempt {attempt + 1})."
+            )
+            if attempt < max_retries:
+                time.sleep(retry_backoff * 2**attempt)
+
+        raise ProduceRecordFailedException(
+            f"Failed to put {len(entries)} records after {max_retries} retries."
+        )
+
+
+class BufferedKinesisProducer:
+    """Asynchronous producer which decouples record publishing from the caller.
+
+    Records are put on a bounded queue and drained by a background task that
+    aggregates them into PutRecords batches of up to `max_batch_size` records,
+    waiting at most `linger` seconds for a batch to fill up. Batches are sent
+    from a thread executor, so the event loop is never blocked by a Kinesis
+    round trip.
+
+    If a batch can't be sent and a spill buffer is given, the batch and every
+    record enqueued after it are written to the spill instead of failing the
+    producer. Spilled records are replayed in order every `replay_interval`
+    seconds until the spill is empty, after which records are sent directly
+    again.
+    """
+
+    def __init__(
+        self,
+        producer: KinesisProducer,
+        stream_name: str,
+        max_queue_size: int,
+        max_batch_size: int = KINESIS_MAX_BATCH_SIZE,
+        linger: float = 0.05,
+        max_retries: int = 3,
+        on_acknowledged: Optional[Callable[[List[KinesisRecord]], None]] = None,
+        spill: Optional[SpillBuffer] = None,
+        replay_interval: float = 5,
+    ) -> None:
+        self.producer = producer
+        self.stream_name = stream_name
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.max_batch_size = min(max_batch_size, KINESIS_MAX_BATCH_SIZE)
+        self.linger = linger
+        self.max_retries = max_retries
+        self.on_acknowledged = on_acknowledged
+        self.spill = spill
+        self.replay_interval = replay_interval
+        self._drain_task: Optional[asyncio.Task] = None
+        self.enqueued_count = 0
+        self.sent_count = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize()
+
+    @property
+    def spill_depth(self) -> int:
+        return len(self.spill) if self.spill is not None else 0
+
+    def start(self) -> None:
+        if self._drain_task is None:
+            self._drain_task = asyncio.ensure_future(self._drain())
+
+    async def produce_record(
+        self,
+        record: KinesisRecord,
+        partition_key: Any,
+        explicit_hash_key: Optional[str] = None,
     ) -> None:
-        records_to_send: List[bytes] = [
-            json.dumps(record.to_dikt()).encode() for record in records
-        ]
+        """Enqueue record for publishing. Waits only if the queue is full.
+
+        Raises:
+            ProduceRecordFailedException: If background publishing has failed.
 
+        """
+        self._raise_on_failure()
         try:
-            self.client.put_records(
-                StreamName=stream_name, Data=records_to_send, PartitionKey=partition_key
+            self.queue.put_nowait((record, partition_key, explicit_hash_key))
+        except asyncio.QueueFull:
+            logger.warning(f"Producer queue is full ({self.queue_depth} records).")
+            await self._until_drain_fails(
+                self.queue.put((record, partition_key, explicit_hash_key))
             )
-        except Exception as error:
-            raise ProduceRecordFailedException from error
+        self.enqueued_count += 1
+
+    async def close(self) -> None:
+        """Flush queued records and stop the background task."""
+        if self._drain_task is None:
+            return
+
+        await self._until_drain_fails(self.queue.join())
+        self._drain_task.cancel()
+        self._raise_on_failure()
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_event_loop()
+        replay_at = 0.0
+        # Kept across iterations, so that waiting for the next record can
+        # time out for a replay without losing the record.
+        getter: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if self.spill_depth and loop.time() >= replay_at:
+                    if not await self._replay():
+                        replay_at = loop.time() + self.replay_interval
+
+                if getter is None:
+                    getter = asyncio.ensure_future(self.queue.get())
+                timeout = max(replay_at - loop.time(), 0) if self.spill_depth else None
+                await asyncio.wait([getter], timeout=timeout)
+                if not getter.done():
+                    continue
+
+                batch = [getter.result()]
+                getter = None
+                await self._drain_batch(batch)
+        finally:
+            if getter is not None:
+                getter.cancel()
+
+    async def _drain_batch(self, batch: List[SpillEntry]) -> None:
+        if self.queue.qsize() < self.max_batch_size - 1:
+            await asyncio.sleep(self.linger)
+
+        while len(batch) < self.max_batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+
+        try:
+            if self.spill_depth:
+                # Keep records in order behind the spilled ones.
+                await self._spill(batch)
+                return
+
+            try:
+                await self._send(batch)
+            except ProduceRecordFailedException:
+                if self.spill is None:
+                    raise
+                logger.warning(
+                    f"Can't send batch of {len(batch)} records to Kinesis, "
+                    f"spilling to {self.spill.directory}."
+                )
+                await self._spill(batch)
+                return
+
+            self.sent_count += len(batch)
+        finally:
+            for _ in batch:
+                self.queue.task_done()
+
+    async def _send(self, batch: List[SpillEntry]) -> None:
+        loop = asyncio.get_event_loop()
+        records = [record for record, _, _ in batch]
+        await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.producer.produce_records,
+                self.stream_name,
+                records,
+                [partition_key for _, partition_key, _ in batch],
+                [explicit_hash_key for _, _, explicit_hash_key in batch],
+                max_retries=self.max_retries,
+            ),
+        )
+        logger.debug(f"Sent batch of {len(batch)} records.")
+        if self.on_acknowledged is not None:
+            self.on_acknowledged(records)
+
+    async def _spill(self, batch: List[SpillEntry]) -> None:
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.spill.append, batch)
+
+    async def _replay(self) -> bool:
+        """Send the oldest spilled records.
+
+        Returns:
+            bool: False if records couldn't be sent, True otherwise.
+
+        """
+        loop = asyncio.get_event_loop()
+        batch = await loop.run_in_executor(None, self.spill.peek, self.max_batch_size)
+        if batch:
+            try:
+                await self._send(batch)
+            except ProduceRecordFailedException:
+                logger.warning(
+                    f"Replaying spilled records has failed, {self.spill_depth} "
+                    f"records are waiting in {self.spill.directory}."
+                )
+                return False
+
+        # Records spilled by a previous run were never counted as enqueued.
+        depth, recovered = len(self.spill), self.spill.recovered_records
+        await loop.run_in_executor(None, self.spill.commit)
+        self.sent_count += (depth - len(self.spill)) - (
+            recovered - self.spill.recovered_records
+        )
+        if self.spill.empty:
+            logger.info("Spilled records have been replayed.")
+        return True
+
+    async def _until_drain_fails(self, coroutine: Awaitable[Any]) -> None:
+        future = asyncio.ensure_future(coroutine)
+        await asyncio.wait(
+            [future, self._drain_task], return_when=asyncio.FIRST_COMPLETED
+        )
+        if not future.done():
+            future.cancel()
+        self._raise_on_failure()
+
+    def _raise_on_failure(self) -> None:
+        if (
+            self._drain_task is not None
+            and self._drain_task.done()
+            and not self._drain_task.cancelled()
+            and self._drain_task.exception() is not None
+        ):
+            raise ProduceRecordFailedException from self._drain_task.exception()
@@ -1,6 +1,44 @@
+import struct
 from dataclasses import dataclass
 from typing import Any, Dict
 
+from based58 import b58decode, b58encode
+
+# Version byte leading every binary encoded record. JSON encoded records
+# always start with "{", so consumers can tell the two apart.
+BINARY_FORMAT_VERSION = 1
+
+# Version, blockchain ID, market address and timestamp in nanoseconds.
+_HEADER = struct.Struct(">BIIQ")
+
+# Encodings of text fields, chosen per value as the most compact lossless one.
+_TEXT_UTF8 = 0
+_TEXT_BASE58 = 1
+_TEXT_HEX = 2
+
+
+def _pack_text(value: str) -> bytes:
+    """Pack text field as encoding kind, length and raw bytes.
+
+    Base58 strings (Solana signatures and accounts) and lowercase "0x"
+    prefixed hex strings (Ethereum transaction hashes) are stored as the raw
+    bytes they represent. Anything else, e.g. checksummed Ethereum addresses
+    whose letter case has to be preserved, is stored as UTF-8.
+    """
+    kind, raw = _TEXT_UTF8, value.encode()
+    try:
+        decoded = b58decode(raw)
+        if b58encode(decoded) == raw:
+            kind, raw = _TEXT_BASE58, decoded
+    except ValueError:
+        if value.startswith("0x") and value == value.lower():
+            try:
+                kind, raw = _TEXT_HEX, bytes.fromhex(value[2:])
+            except ValueError:
+                pass
+
+    return struct.pack(">BB", kind, len(raw)) + raw
+
 
 @dataclass
 class KinesisRecord:
@@ -22,3 +60,28 @@ class KinesisRecord:
             "signature": self.signature,
             "timestamp": self.timestamp,
         }
+
+    def to_bytes(self) -> bytes:
+        """Encode record in the compact binary format.
+
+        Layout (big-endian): version byte, blockchain ID (uint32), market
+        address (uint32), timestamp (uint64), followed by signature, market
+        account and market name, each prefixed by its length.
+
+        Returns:
+            bytes: Encoded record.
+
+        """
+        market = self.market.encode()
+        return (
+            _HEADER.pack(
+                BINARY_FORMAT_VERSION,
+                self.blockchain_id,
+                self.market_address,
+                self.timestamp,
+            )
+            + _pack_text(self.signature)
+            + _pack_text(self.market_account)
+            + struct.pack(">B", len(market))
+            + market
+        )
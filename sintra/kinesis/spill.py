@@ -0,0 +1,193 @@
+import json
+import logging
+import os
+from collections import deque
+from pathlib import Path
+from typing import IO, Deque, List, Optional, Tuple
+
+from sintra.exception import ProduceRecordFailedException
+from sintra.kinesis.record import KinesisRecord
+
+logger = logging.getLogger(__name__)
+
+# Record, partition key and explicit hash key of a spilled record.
+SpillEntry = Tuple[KinesisRecord, str, Optional[str]]
+
+_SEGMENT_SUFFIX = ".spill"
+
+
+class SpillBuffer:
+    """Local write-ahead spill of records that couldn't be sent to Kinesis.
+
+    Records are appended as JSON lines to segment files named by increasing
+    sequence number, a new segment is started once the current one reaches
+    `segment_size` bytes. Records are read back in the order they were
+    appended, and a segment is deleted once all of its records have been
+    replayed.
+
+    Read position is kept in memory only, so records of a segment that was
+    only partially replayed when the worker stopped are replayed again from
+    the start of the segment after restart. Consumers already handle
+    duplicate signatures, e.g. after backfill.
+    """
+
+    def __init__(
+        self, directory: str, segment_size: int, max_size: Optional[int] = None
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.max_size = max_size
+
+        self.segments: Deque[int] = deque(
+            sorted(
+                int(path.stem) for path in self.directory.glob(f"*{_SEGMENT_SUFFIX}")
+            )
+        )
+        self.size = sum(self._path(segment).stat().st_size for segment in self.segments)
+        self.records = sum(self._count_records(segment) for segment in self.segments)
+        # Records spilled by a previous run of the worker, they are replayed
+        # before any record of this run.
+        self.recovered_records = self.records
+        if self.records:
+            logger.info(
+                f"Recovered {self.records} spilled records from {self.directory}."
+            )
+
+        self._offset = 0
+        self._writer: Optional[IO[bytes]] = None
+        self._writer_size = 0
+        # Lines and bytes read by the last `peek`.
+        self._peeked = (0, 0)
+
+    def __len__(self) -> int:
+        return self.records
+
+    @property
+    def empty(self) -> bool:
+        return self.records == 0
+
+    def append(self, entries: List[SpillEntry]) -> None:
+        """Append records to the spill and flush them to disk.
+
+        Raises:
+            ProduceRecordFailedException: If spill is full or records can't be
+                written.
+
+        """
+        data = b"".join(
+            json.dumps(
+                {
+                    "record": record.to_dikt(),
+                    "partition_key": partition_key,
+                    "explicit_hash_key": explicit_hash_key,
+                }
+            ).encode()
+            + b"\n"
+            for record, partition_key, explicit_hash_key in entries
+        )
+        if self.max_size is not None and self.size + len(data) > self.max_size:
+            raise ProduceRecordFailedException(
+                f"Spill buffer is full ({self.size} bytes)."
+            )
+
+        try:
+            writer = self._segment_writer()
+            writer.write(data)
+            writer.flush()
+            os.fsync(writer.fileno())
+        except OSError as error:
+            logger.error(error)
+            raise ProduceRecordFailedException from error
+
+        self._writer_size += len(data)
+        self.size += len(data)
+        self.records += len(entries)
+
+    def peek(self, count: int) -> List[SpillEntry]:
+        """Read up to `count` oldest records without removing them. Records
+        are read from a single segment, so fewer records, or none at all if
+        the oldest segment is exhausted, may be returned even if the spill
+        is not empty.
+
+        Returns:
+            List[SpillEntry]: Oldest records, removed by `commit` once they
+                are replayed.
+
+        """
+        entries: List[SpillEntry] = []
+        lines, size = 0, 0
+        if not self.segments:
+            self._peeked = (lines, size)
+            return entries
+
+        with open(self._path(self.segments[0]), "rb") as segment_file:
+            segment_file.seek(self._offset)
+            for line in segment_file:
+                if len(entries) == count:
+                    break
+
+                size += len(line)
+                if not line.endswith(b"\n"):
+                    # Torn write of a crashed worker, it was never counted.
+                    break
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError as error:
+                    logger.error(f"Skipping corrupted spilled record: {error}")
+                    continue
+                entries.append(
+                    (
+                        KinesisRecord(**entry["record"]),
+                        entry["partition_key"],
+                        entry["explicit_hash_key"],
+                    )
+                )
+
+        self._peeked = (lines, size)
+        return entries
+
+    def commit(self) -> None:
+        """Remove records returned by the last `peek`."""
+        count, size = self._peeked
+        self._peeked = (0, 0)
+        self._offset += size
+        self.size -= size
+        self.records = max(self.records - count, 0)
+        self.recovered_records = max(self.recovered_records - count, 0)
+
+        # Drop fully replayed segments, including empty ones left behind by
+        # a crashed worker.
+        while self.segments:
+            head = self.segments[0]
+            active = len(self.segments) == 1 and self._writer is not None
+            head_size = self._writer_size if active else self._path(head).stat().st_size
+            if self._offset < head_size:
+                return
+
+            if active:
+                self._writer.close()
+                self._writer = None
+            self._path(head).unlink()
+            self.segments.popleft()
+            self._offset = 0
+
+        self.size = 0
+
+    def _segment_writer(self) -> IO[bytes]:
+        if self._writer is None or self._writer_size >= self.segment_size:
+            if self._writer is not None:
+                self._writer.close()
+            segment = self.segments[-1] + 1 if self.segments else 0
+            self._writer = open(self._path(segment), "ab")
+            self._writer_size = 0
+            self.segments.append(segment)
+        return self._writer
+
+    def _count_records(self, segment: int) -> int:
+        with open(self._path(segment), "rb") as segment_file:
+            return sum(1 for line in segment_file if line.endswith(b"\n"))
+
+    def _path(self, segment: int) -> Path:
+        return self.directory / f"{segment:012d}{_SEGMENT_SUFFIX}"
@@ -1,15 +1,16 @@
 import asyncio
-import base64
 import json
 import logging
 import os
 from typing import Any, Dict, List
 
+from shared.aggregation import kinesis_event_data
+from shared.kinesis import KinesisProducer
+from shared.partition import Partitioner
 from src.config import settings
 from src.exception import DecodingException, UnableToFetchMetadataException
 from src.metadata import MetadataFetcher, SolanaMetadataFetcher, EthereumMetadataFetcher
 from src.model import NFTMetadata, SecondaryMarketEvent
-from src.producer import KinesisProducer
 from src.utils import ethereum_address, solana_address, transaction_event_type
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,12 @@ if len(logging.getLogger().handlers) > 0:
 else:
     logging.basicConfig(level=logging.INFO)
 
+# Created once per execution environment, so explicit hash keys keep cycling
+# through the shards across invocations instead of restarting with every batch.
+partitioner = Partitioner(
+    settings.kinesis.partition.strategy,
+    settings.kinesis.partition.key,
+)
 solana_metadata_fetcher: MetadataFetcher = SolanaMetadataFetcher()
 ethereum_metadata_fetcher: MetadataFetcher = EthereumMetadataFetcher()
 
@@ -39,6 +46,7 @@ def lambda_handler(event: Dict[str, Any], context):
         os.getenv("AWS_SECRET_ACCESS_KEY"),
         os.getenv("AWS_REGION"),
         localstack_active,
+        aggregate=settings.kinesis.aggregate,
     )
 
     records = event["Records"]
@@ -50,9 +58,8 @@ def lambda_handler(event: Dict[str, Any], context):
     async_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(async_loop)
 
-    for record in records:
+    for market_data in kinesis_event_data(records):
         try:
-            market_data = base64.b64decode(record["kinesis"]["data"]).decode("utf-8")
             market_record = json.loads(market_data)
             market_event: SecondaryMarketEvent = SecondaryMarketEvent.from_dict(
                 market_record
@@ -117,9 +124,12 @@ def lambda_handler(event: Dict[str, Any], context):
 
     logger.info("Sending NFT metadata batch.")
     if len(nft_metadata_list) > 0:
-        kinesis.produce_records(
-            settings.kinesis.stream_name,
-            nft_metadata_list,
+        async_loop.run_until_complete(
+            kinesis.produce_records(
+                settings.kinesis.stream_name,
+                nft_metadata_list,
+                partitioner=partitioner,
+            )
         )
 
         return {"message": "Successfully processed signature batch."}
@@ -1,14 +1,15 @@
 import asyncio
-import base64
 import json
 import logging
 import os
 from typing import List
 
+from shared.aggregation import kinesis_event_data
+from shared.kinesis import KinesisProducer
+from shared.partition import Partitioner
 from src.config import settings
 from src.exception import DecodingException, FetchTokenDataException
 from src.model import NFTData, NFTMetadata
-from src.producer import KinesisProducer
 from src.token_data import (
     SolanaTokenDataFetcher,
     TokenDataFetcher,
@@ -25,6 +26,13 @@ if len(logging.getLogger().handlers) > 0:
 else:
     logging.basicConfig(level=logging.INFO)
 
+# Created once per execution environment, so explicit hash keys keep cycling
+# through the shards across invocations instead of restarting with every batch.
+partitioner = Partitioner(
+    settings.kinesis.partition.strategy,
+    settings.kinesis.partition.key,
+)
+
 
 def lambda_handler(event, context):
     localstack_active_var = str(settings.localstack.active).lower()
@@ -55,20 +63,9 @@ def lambda_handler(event, context):
     async_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(async_loop)
 
-    for record in records:
+    for metadata in kinesis_event_data(records):
         try:
-            metadata = None
-
-            try:
-                metadata = base64.b64decode(record["kinesis"]["data"]).decode("utf-8")
-            except Exception as error:
-                logger.error(
-                    f"Error occurred while decoding received data: {error}\n"
-                    f"Kinesis record: {record['kinesis']}"
-                )
-                continue
-
-            logger.info(f"Received record: {metadata}")
+            logger.info(f"Received record: {metadata!r}")
 
             metadata_record = json.loads(metadata)
             nft_metadata: NFTMetadata = NFTMetadata.from_dict(metadata_record)
@@ -99,7 +96,13 @@ def lambda_handler(event, context):
             logger.error(f"JSON decoding failed with error: {error}")
 
     if len(nft_data_list) > 0:
-        kinesis.produce_records(settings.kinesis.stream_name, nft_data_list)
+        async_loop.run_until_complete(
+            kinesis.produce_records(
+                settings.kinesis.stream_name,
+                nft_data_list,
+                partitioner=partitioner,
+            )
+        )
         return {
             "message": f"Successfully processed metadata batch of length: {len(nft_data_list)}."
         }
@@ -3,13 +3,18 @@
 import base64
 import json
 import os
+import sys
 import time
+from pathlib import Path
 from typing import Any, Dict, Generator
 
 import boto3
 import pytest
 from moto import mock_kinesis
 
+# Modules shared between lambdas are copied next to `src` in the image.
+sys.path.append(str(Path(__file__).absolute().parents[2]))
+
 
 @pytest.fixture(scope="session")
 def aws_credentials() -> None:
@@ -1,12 +1,17 @@
 # pylint: disable=redefined-outer-name
 
 import os
+import sys
+from pathlib import Path
 from typing import Generator
 
 import boto3
 import pytest
 from moto import mock_kinesis
 
+# Modules shared between lambdas are copied next to `src` in the image.
+sys.path.append(str(Path(__file__).absolute().parents[2]))
+
 
 @pytest.fixture(scope="session")
 def aws_credentials() -> None:
@@ -0,0 +1,222 @@
+import base64
+import hashlib
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Magic prefix of records aggregated in the Kinesis Producer Library format.
+KPL_MAGIC = b"\xf3\x89\x9a\xc2"
+
+# Default maximum size of aggregated record, same as the KPL default.
+AGGREGATION_MAX_SIZE = 51200
+
+# Size of trailing MD5 digest of aggregated record.
+_DIGEST_SIZE = 16
+
+
+def _varint(value: int) -> bytes:
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _length_delimited(field_number: int, value: bytes) -> bytes:
+    return _varint(field_number << 3 | 2) + _varint(len(value)) + value
+
+
+def _uint(field_number: int, value: int) -> bytes:
+    return _varint(field_number << 3) + _varint(value)
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value, shift = 0, 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Aggregated record is truncated.")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, offset
+
+
+def _fields(message: bytes) -> Iterator[Tuple[int, Union[int, bytes]]]:
+    offset = 0
+    while offset < len(message):
+        key, offset = _read_varint(message, offset)
+        field_number, wire_type = key >> 3, key & 0x07
+        if wire_type == 0:
+            value, offset = _read_varint(message, offset)
+            yield field_number, value
+        elif wire_type == 2:
+            length, offset = _read_varint(message, offset)
+            if offset + length > len(message):
+                raise ValueError("Aggregated record is truncated.")
+            yield field_number, message[offset : offset + length]
+            offset += length
+        elif wire_type in (1, 5):
+            offset += 8 if wire_type == 1 else 4
+        else:
+            raise ValueError(
+                f"Unsupported wire type in aggregated record: {wire_type}."
+            )
+
+
+def deaggregate(data: bytes) -> List[bytes]:
+    """Unpack user records of KPL aggregated record.
+
+    Args:
+        data (bytes): Kinesis record data.
+
+    Raises:
+        ValueError: If aggregated record is malformed.
+
+    Returns:
+        List[bytes]: Data of aggregated user records, or the data itself if
+            it isn't an aggregated record.
+
+    """
+    if not data.startswith(KPL_MAGIC) or len(data) < len(KPL_MAGIC) + _DIGEST_SIZE:
+        return [data]
+
+    message = data[len(KPL_MAGIC) : -_DIGEST_SIZE]
+    if hashlib.md5(message).digest() != data[-_DIGEST_SIZE:]:
+        # Same as the KCL, data that only looks aggregated is passed as is.
+        return [data]
+
+    records: List[bytes] = []
+    for field_number, record in _fields(message):
+        if field_number == 3 and isinstance(record, bytes):
+            records.append(
+                next(
+                    (
+                        value
+                        for number, value in _fields(record)
+                        if number == 3 and isinstance(value, bytes)
+                    ),
+                    b"",
+                )
+            )
+
+    return records
+
+
+def kinesis_event_data(records: List[Dict[str, Any]]) -> Iterator[bytes]:
+    """Yield data of Kinesis event records, unpacking aggregated records.
+
+    Records that can't be decoded are logged and skipped.
+
+    Args:
+        records (List[Dict[str, Any]]): Records of Kinesis event.
+
+    Yields:
+        bytes: Data of user record.
+
+    """
+    for record in records:
+        try:
+            data = base64.b64decode(record["kinesis"]["data"])
+            user_records = deaggregate(data)
+        except (ValueError, KeyError, TypeError) as error:
+            logger.error(f"Failed to decode Kinesis record: {record.get('kinesis')}")
+            logger.error(error)
+            continue
+
+        yield from user_records
+
+
+class RecordAggregator:
+    """Packs user records into a single Kinesis record in the KPL aggregated
+    format, so that consumers using the KCL or the KPL de-aggregation modules
+    can unpack them.
+
+    Aggregated record is the magic prefix, an `AggregatedRecord` protobuf
+    message and the MD5 digest of the message. The message is encoded here
+    directly, it only needs varints and length-delimited fields.
+    """
+
+    def __init__(self, max_size: int = AGGREGATION_MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.partition_keys: Dict[str, int] = {}
+        self.explicit_hash_keys: Dict[str, int] = {}
+        self.records: List[bytes] = []
+        self.size = len(KPL_MAGIC) + _DIGEST_SIZE
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def partition_key(self) -> str:
+        """Partition key of aggregated record, the one of the first record."""
+        return next(iter(self.partition_keys))
+
+    @property
+    def explicit_hash_key(self) -> Optional[str]:
+        return next(iter(self.explicit_hash_keys), None)
+
+    def add(
+        self, data: bytes, partition_key: str, explicit_hash_key: Optional[str] = None
+    ) -> bool:
+        """Add record to aggregation.
+
+        Args:
+            data (bytes): Record data.
+            partition_key (str): Record partition key.
+            explicit_hash_key (Optional[str]): Record explicit hash key.
+
+        Returns:
+            bool: False if record doesn't fit and the aggregation has to be
+                flushed first, True otherwise.
+
+        """
+        size = 0
+        if partition_key not in self.partition_keys:
+            size += len(_length_delimited(1, partition_key.encode()))
+        if (
+            explicit_hash_key is not None
+            and explicit_hash_key not in self.explicit_hash_keys
+        ):
+            size += len(_length_delimited(2, explicit_hash_key.encode()))
+
+        record = self._record(data, partition_key, explicit_hash_key)
+        size += len(_length_delimited(3, record))
+        if self.records and self.size + size > self.max_size:
+            return False
+
+        self.partition_keys.setdefault(partition_key, len(self.partition_keys))
+        if explicit_hash_key is not None:
+            self.explicit_hash_keys.setdefault(
+                explicit_hash_key, len(self.explicit_hash_keys)
+            )
+        self.records.append(record)
+        self.size += size
+        return True
+
+    def to_bytes(self) -> bytes:
+        message = b"".join(
+            [_length_delimited(1, key.encode()) for key in self.partition_keys]
+            + [_length_delimited(2, key.encode()) for key in self.explicit_hash_keys]
+            + [_length_delimited(3, record) for record in self.records]
+        )
+        return KPL_MAGIC + message + hashlib.md5(message).digest()
+
+    def _record(
+        self, data: bytes, partition_key: str, explicit_hash_key: Optional[str]
+    ) -> bytes:
+        # Unknown keys get the index they will have once the record is added.
+        record = _uint(
+            1, self.partition_keys.get(partition_key, len(self.partition_keys))
+        )
+        if explicit_hash_key is not None:
+            record += _uint(
+                2,
+                self.explicit_hash_keys.get(
+                    explicit_hash_key, len(self.explicit_hash_keys)
+                ),
+            )
+        return record + _length_delimited(3, data)
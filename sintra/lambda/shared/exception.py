@@ -0,0 +1,10 @@
+class SharedException(Exception):
+    """Base exception class for modules shared between lambdas."""
+
+
+class ProduceRecordFailedException(SharedException):
+    """Raised when client fails to produce record."""
+
+
+class EnvironmentVariableMissingException(SharedException):
+    """Raised when environment variable doesn't exist."""
@@ -0,0 +1,219 @@
+import asyncio
+import functools
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import boto3
+from shared.aggregation import AGGREGATION_MAX_SIZE, RecordAggregator
+from shared.exception import (
+    EnvironmentVariableMissingException,
+    ProduceRecordFailedException,
+)
+from shared.partition import Partitioner
+
+logger = logging.getLogger(__name__)
+
+# PutRecords limits. Record size and request size include partition keys.
+KINESIS_MAX_BATCH_SIZE = 500
+KINESIS_MAX_REQUEST_BYTES = 5 * 1024 * 1024
+KINESIS_MAX_RECORD_BYTES = 1024 * 1024
+
+
+@dataclass
+class KinesisEntry:
+    """Data and keys of record put to Kinesis stream."""
+
+    data: bytes
+    partition_key: str
+    explicit_hash_key: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.data) + len(self.partition_key.encode())
+
+    def to_request(self) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {"Data": self.data, "PartitionKey": self.partition_key}
+        if self.explicit_hash_key is not None:
+            entry["ExplicitHashKey"] = self.explicit_hash_key
+        return entry
+
+
+def to_json(record: Any) -> bytes:
+    return json.dumps(record.to_dict()).encode()
+
+
+def batch_entries(entries: Sequence[KinesisEntry]) -> Iterator[List[KinesisEntry]]:
+    """Split entries into batches within PutRecords count and size limits.
+
+    Raises:
+        ProduceRecordFailedException: If single entry exceeds record size
+            limit.
+
+    """
+    batch: List[KinesisEntry] = []
+    batch_size = 0
+    for entry in entries:
+        if entry.size > KINESIS_MAX_RECORD_BYTES:
+            raise ProduceRecordFailedException(
+                f"Record with partition key {entry.partition_key} has "
+                f"{entry.size} bytes, limit is {KINESIS_MAX_RECORD_BYTES}."
+            )
+
+        if batch and (
+            len(batch) == KINESIS_MAX_BATCH_SIZE
+            or batch_size + entry.size > KINESIS_MAX_REQUEST_BYTES
+        ):
+            yield batch
+            batch, batch_size = [], 0
+
+        batch.append(entry)
+        batch_size += entry.size
+
+    if batch:
+        yield batch
+
+
+def aggregate_entries(
+    entries: Sequence[KinesisEntry], max_size: int = AGGREGATION_MAX_SIZE
+) -> List[KinesisEntry]:
+    """Pack entries into KPL aggregated records of at most `max_size` bytes.
+
+    Aggregated record is put under partition key of its first entry.
+    """
+    aggregated: List[KinesisEntry] = []
+    aggregator = RecordAggregator(max_size)
+
+    def flush() -> None:
+        aggregated.append(
+            KinesisEntry(
+                aggregator.to_bytes(),
+                aggregator.partition_key,
+                aggregator.explicit_hash_key,
+            )
+        )
+
+    for entry in entries:
+        if not aggregator.add(entry.data, entry.partition_key, entry.explicit_hash_key):
+            flush()
+            aggregator = RecordAggregator(max_size)
+            aggregator.add(entry.data, entry.partition_key, entry.explicit_hash_key)
+
+    if len(aggregator) > 0:
+        flush()
+
+    return aggregated
+
+
+class KinesisProducer:
+    """Asynchronous Kinesis producer shared by the lambdas.
+
+    Records are split into PutRecords requests within the count and size
+    limits and sent one request at a time from a thread executor, so that
+    records sharing a partition key keep their order. Only the entries
+    reported as failed are retried, with exponential backoff. Small records
+    can optionally be packed into KPL aggregated records.
+    """
+
+    def __init__(
+        self,
+        access_key_id: Optional[str],
+        secret_access_key: Optional[str],
+        region: Optional[str],
+        localstack_active: bool,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1,
+        aggregate: bool = False,
+        aggregation_max_size: int = AGGREGATION_MAX_SIZE,
+    ) -> None:
+        if localstack_active:
+            if access_key_id is None or secret_access_key is None:
+                raise EnvironmentVariableMissingException("Missing AWS credentials.")
+
+            self.client = boto3.client(
+                "kinesis",
+                aws_access_key_id=access_key_id,
+                aws_secret_access_key=secret_access_key,
+                region_name=region,
+            )
+        else:
+            self.client = boto3.client("kinesis")
+
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.aggregate = aggregate
+        self.aggregation_max_size = aggregation_max_size
+
+    async def produce_records(
+        self,
+        stream_name: str,
+        records: Sequence[Any],
+        partitioner: Partitioner,
+        serialize: Callable[[Any], bytes] = to_json,
+    ) -> None:
+        """Serialize and put records to stream.
+
+        Args:
+            stream_name (str): Name of Kinesis stream.
+            records (Sequence[Any]): Records to put.
+            partitioner (Partitioner): Chooses partition key and explicit
+                hash key of record.
+            serialize (Callable[[Any], bytes]): Serializes record, JSON of
+                `to_dict()` by default.
+
+        Raises:
+            ProduceRecordFailedException: If some of the records couldn't be
+                put.
+
+        """
+        await self.put_entries(
+            stream_name,
+            [
+                KinesisEntry(serialize(record), *partitioner.partition(record))
+                for record in records
+            ],
+        )
+
+    async def put_entries(
+        self, stream_name: str, entries: Sequence[KinesisEntry]
+    ) -> None:
+        if self.aggregate:
+            entries = aggregate_entries(entries, self.aggregation_max_size)
+
+        for batch in batch_entries(entries):
+            await self._put_batch(stream_name, batch)
+
+    async def _put_batch(self, stream_name: str, batch: List[KinesisEntry]) -> None:
+        loop = asyncio.get_event_loop()
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        self.client.put_records,
+                        StreamName=stream_name,
+                        Records=[entry.to_request() for entry in batch],
+                    ),
+                )
+            except Exception as error:
+                logger.error(error)
+                raise ProduceRecordFailedException from error
+
+            if response["FailedRecordCount"] == 0:
+                return
+
+            batch = [
+                entry
+                for entry, result in zip(batch, response["Records"])
+                if "ErrorCode" in result
+            ]
+            logger.warning(
+                f"Failed to put {len(batch)} records (attempt {attempt + 1})."
+            )
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_backoff * 2**attempt)
+
+        raise ProduceRecordFailedException(
+            f"Failed to put {len(batch)} records after {self.max_retries} retries."
+        )
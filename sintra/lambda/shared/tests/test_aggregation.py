@@ -0,0 +1,54 @@
+import base64
+
+import pytest
+from shared.aggregation import (
+    KPL_MAGIC,
+    RecordAggregator,
+    deaggregate,
+    kinesis_event_data,
+)
+
+
+def event_record(data: bytes) -> dict:
+    return {"kinesis": {"data": base64.b64encode(data).decode()}}
+
+
+class TestAggregation:
+    def test_deaggregate(self) -> None:
+        aggregator = RecordAggregator()
+        user_records = [f'{{"index": {index}}}'.encode() for index in range(100)]
+        for index, data in enumerate(user_records):
+            explicit_hash_key = str(index) if index % 2 else None
+            assert aggregator.add(data, f"key-{index % 3}", explicit_hash_key)
+
+        aggregated = aggregator.to_bytes()
+
+        assert aggregated.startswith(KPL_MAGIC)
+        assert len(aggregated) == aggregator.size
+        assert deaggregate(aggregated) == user_records
+
+    def test_add_when_aggregation_full(self) -> None:
+        aggregator = RecordAggregator(max_size=100)
+
+        assert aggregator.add(b"x" * 60, "key")
+        assert not aggregator.add(b"x" * 60, "key")
+        assert len(aggregator) == 1
+
+    @pytest.mark.parametrize(
+        "data",
+        [b'{"index": 1}', KPL_MAGIC + b"\x00" * 16, KPL_MAGIC + b"\x1a\x02" * 10],
+    )
+    def test_deaggregate_when_not_aggregated(self, data: bytes) -> None:
+        assert deaggregate(data) == [data]
+
+    def test_kinesis_event_data(self) -> None:
+        aggregator = RecordAggregator()
+        aggregator.add(b"first", "key")
+        aggregator.add(b"second", "key")
+        records = [
+            event_record(b"plain"),
+            {"kinesis": {"data": "not base64!"}},
+            event_record(aggregator.to_bytes()),
+        ]
+
+        assert list(kinesis_event_data(records)) == [b"plain", b"first", b"second"]
@@ -0,0 +1,148 @@
+import asyncio
+import os
+from typing import Any, Dict, Generator, List
+from unittest.mock import MagicMock
+
+import boto3
+import pytest
+from moto import mock_kinesis
+from shared.aggregation import KPL_MAGIC
+from shared.exception import ProduceRecordFailedException
+from shared.kinesis import (
+    KINESIS_MAX_BATCH_SIZE,
+    KINESIS_MAX_RECORD_BYTES,
+    KinesisEntry,
+    KinesisProducer,
+    aggregate_entries,
+    batch_entries,
+)
+from shared.partition import Partitioner
+
+
+@pytest.fixture(scope="module")
+def aws_credentials() -> None:
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+
+
+@pytest.fixture
+def kinesis_stream(aws_credentials) -> Generator[str, None, None]:
+    with mock_kinesis():
+        boto3.client("kinesis").create_stream(StreamName="test-stream", ShardCount=1)
+        yield "test-stream"
+
+
+def stream_data(stream_name: str) -> List[bytes]:
+    client = boto3.client("kinesis")
+    shard_id = client.describe_stream(StreamName=stream_name)["StreamDescription"][
+        "Shards"
+    ][0]["ShardId"]
+    iterator = client.get_shard_iterator(
+        StreamName=stream_name, ShardId=shard_id, ShardIteratorType="TRIM_HORIZON"
+    )["ShardIterator"]
+    return [
+        record["Data"]
+        for record in client.get_records(ShardIterator=iterator)["Records"]
+    ]
+
+
+class Record:
+    def __init__(self, key: str) -> None:
+        self.key = key
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"key": self.key}
+
+
+class TestBatching:
+    def test_batch_entries_by_count(self) -> None:
+        entries = [KinesisEntry(b"data", "key")] * (KINESIS_MAX_BATCH_SIZE + 1)
+
+        batches = list(batch_entries(entries))
+
+        assert [len(batch) for batch in batches] == [KINESIS_MAX_BATCH_SIZE, 1]
+
+    def test_batch_entries_by_size(self) -> None:
+        entries = [KinesisEntry(b"x" * (KINESIS_MAX_RECORD_BYTES - 3), "key")] * 6
+
+        batches = list(batch_entries(entries))
+
+        assert [len(batch) for batch in batches] == [5, 1]
+
+    def test_batch_entries_when_record_too_large(self) -> None:
+        entries = [KinesisEntry(b"x" * KINESIS_MAX_RECORD_BYTES, "key")]
+
+        with pytest.raises(ProduceRecordFailedException):
+            list(batch_entries(entries))
+
+    def test_aggregate_entries(self) -> None:
+        entries = [KinesisEntry(b"x" * 100, f"key-{index}") for index in range(1000)]
+
+        aggregated = aggregate_entries(entries, max_size=10000)
+
+        assert 10 < len(aggregated) < 20
+        assert all(entry.data.startswith(KPL_MAGIC) for entry in aggregated)
+        assert all(len(entry.data) <= 10000 for entry in aggregated)
+        assert aggregated[0].partition_key == "key-0"
+
+
+class TestKinesisProducer:
+    def test_produce_records(self, kinesis_stream: str) -> None:
+        producer = KinesisProducer(None, None, None, False)
+        records = [Record(f"key-{index}") for index in range(3)]
+
+        asyncio.run(
+            producer.produce_records(
+                kinesis_stream, records, partitioner=Partitioner("key", "key")
+            )
+        )
+
+        assert stream_data(kinesis_stream) == [
+            b'{"key": "key-0"}',
+            b'{"key": "key-1"}',
+            b'{"key": "key-2"}',
+        ]
+
+    def test_produce_records_retries_failed_entries(self, kinesis_stream: str) -> None:
+        producer = KinesisProducer(None, None, None, False, retry_backoff=0)
+        producer.client = MagicMock()
+        producer.client.put_records.side_effect = [
+            {
+                "FailedRecordCount": 1,
+                "Records": [
+                    {"SequenceNumber": "1", "ShardId": "shardId-000000000000"},
+                    {"ErrorCode": "ProvisionedThroughputExceededException"},
+                ],
+            },
+            {"FailedRecordCount": 0, "Records": [{"SequenceNumber": "2"}]},
+        ]
+
+        asyncio.run(
+            producer.put_entries(
+                kinesis_stream,
+                [KinesisEntry(b"first", "key"), KinesisEntry(b"second", "key")],
+            )
+        )
+
+        retried = producer.client.put_records.call_args_list[1].kwargs["Records"]
+        assert retried == [{"Data": b"second", "PartitionKey": "key"}]
+
+    def test_produce_records_when_retries_exhausted(self, kinesis_stream: str) -> None:
+        producer = KinesisProducer(
+            None, None, None, False, max_retries=1, retry_backoff=0
+        )
+        producer.client = MagicMock()
+        producer.client.put_records.return_value = {
+            "FailedRecordCount": 1,
+            "Records": [{"ErrorCode": "InternalFailure"}],
+        }
+
+        with pytest.raises(ProduceRecordFailedException):
+            asyncio.run(
+                producer.put_entries(kinesis_stream, [KinesisEntry(b"data", "key")])
+            )
+
+        assert producer.client.put_records.call_count == 2
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+from shared.partition import HASH_KEY_SPACE, Partitioner, hash_key
+
+
+class TestPartitioner:
+    def test_partition_by_key(self) -> None:
+        partitioner = Partitioner("key", "token_key")
+
+        partition_key, explicit_hash_key = partitioner.partition(
+            SimpleNamespace(token_key="token")
+        )
+
+        assert partition_key == "token"
+        assert explicit_hash_key is None
+
+    def test_partition_explicit_spreads_evenly(self) -> None:
+        partitioner = Partitioner("explicit", "token_key")
+        shards = [0] * 4
+
+        for _ in range(1000):
+            _, explicit_hash_key = partitioner.partition(
+                SimpleNamespace(token_key="hot-token")
+            )
+            shards[int(explicit_hash_key) * 4 // HASH_KEY_SPACE] += 1
+
+        assert max(shards) - min(shards) <= 2
+
+    def test_partition_explicit_starts_at_random_offset(self) -> None:
+        first = Partitioner("explicit", "token_key")
+        second = Partitioner("explicit", "token_key")
+        record = SimpleNamespace(token_key="hot-token")
+
+        first_hash_keys = [first.partition(record)[1] for _ in range(10)]
+        second_hash_keys = [second.partition(record)[1] for _ in range(10)]
+
+        assert not set(first_hash_keys) & set(second_hash_keys)
+
+    def test_partition_random(self) -> None:
+        partitioner = Partitioner("random")
+
+        first, _ = partitioner.partition(SimpleNamespace())
+        second, _ = partitioner.partition(SimpleNamespace())
+
+        assert first != second
+
+    @pytest.mark.parametrize("strategy, key", [("round-robin", "key"), ("key", "")])
+    def test_partitioner_when_invalid(self, strategy: str, key: str) -> None:
+        with pytest.raises(ValueError):
+            Partitioner(strategy, key)
+
+    def test_hash_key(self) -> None:
+        # MD5 of "a" as 128-bit integer.
+        assert hash_key("a") == 0x0CC175B9C0F1B6A831C399E269772661
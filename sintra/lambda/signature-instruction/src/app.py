@@ -1,11 +1,19 @@
 import asyncio
-import base64
 import json
 import logging
-import os
-from typing import Any, Dict, List, Tuple
-
-from src.async_client import SolanaHTTPClient
+from typing import Any, Dict, List, Optional, Union
+
+from shared.aggregation import kinesis_event_data
+from shared.kinesis import KinesisProducer
+from src.async_client import EthereumHTTPClient, SolanaHTTPClient
+from src.clients import (
+    ethereum_client,
+    event_loop,
+    kinesis_producer,
+    parsing_service,
+    partitioner,
+    solana_client,
+)
 from src.config import settings
 from src.exception import (
     SecondaryMarketDataMissingException,
@@ -20,8 +28,6 @@ from src.model import (
     SolanaTransaction,
 )
 from src.parsing import TransactionParsing
-from src.producer import KinesisProducer
-from web3 import Web3
 
 logger = logging.getLogger(__name__)
 
@@ -34,179 +40,194 @@ else:
 
 
 def lambda_handler(event: Dict[str, Any], context):
-    logger.info("Connecting to Kinesis service...")
+    # Clients are created on the first invocation and reused by warm ones.
+    async_loop = event_loop()
+    kinesis: KinesisProducer = kinesis_producer()
+    parsing: TransactionParsing = parsing_service()
 
-    localstack_active_var = str(settings.localstack.active).lower()
-    localstack_active = localstack_active_var == "true"
+    records = event["Records"]
 
-    if localstack_active:
-        logger.info("Localstack is active.")
+    logger.info(f"Records count: {len(records)}. Processing signatures..")
 
-    kinesis: KinesisProducer = KinesisProducer(
-        os.getenv("AWS_ACCESS_KEY_ID"),
-        os.getenv("AWS_SECRET_ACCESS_KEY"),
-        os.getenv("AWS_REGION"),
-        localstack_active,
-    )
+    signature_events: List[SignatureEvent] = []
+    for signature_data in kinesis_event_data(records):
+        try:
+            logger.info(f"Received record: {signature_data!r}")
+            signature_events.append(SignatureEvent.from_bytes(signature_data))
+        except (json.JSONDecodeError, ValueError, TypeError, KeyError) as error:
+            logger.error(error)
 
-    logger.info(
-        f"Initializing SolanaHTTPClient for endpoint: {settings.blockchain.solana.http.endpoint}."
+    transactions = async_loop.run_until_complete(
+        fetch_transactions(solana_client(), ethereum_client(), signature_events)
     )
 
-    solana_client: SolanaHTTPClient = SolanaHTTPClient(
-        endpoint=settings.blockchain.solana.http.endpoint,
-        timeout=settings.blockchain.solana.http.timeout,
-        username=os.getenv("SOLANA_RPC_HTTP_USERNAME"),
-        password=os.getenv("SOLANA_RPC_HTTP_PASSWORD"),
-    )
+    sme_batch: List[SecondaryMarketEvent] = []
+    for signature_event, transaction in zip(signature_events, transactions):
+        if transaction is None:
+            continue
 
-    logger.info(
-        f"Initializing AlchemyHTTPClient for endpoint: {settings.blockchain.ethereum.http.endpoint}."
-    )
+        try:
+            secondary_market_event = parsing.parse(
+                transaction, signature_event.market_account
+            )
+            sme_batch.append(secondary_market_event)
+        except TransactionParserNotFoundException as error:
+            logger.warning(error)
+        except (ValueError, TypeError, KeyError) as error:
+            # Transactions are decoded lazily, while they are parsed.
+            logger.error(
+                f"Decoding transaction {signature_event.signature} has failed."
+            )
+            logger.error(error)
+        except (
+            TransactionInstructionMissingException,
+            UnknownTransactionException,
+            SecondaryMarketDataMissingException,
+        ) as error:
+            logger.error(error)
+            if isinstance(transaction, SolanaTransaction):
+                raise RuntimeError from error
 
-    alchemy_api_key = os.getenv("ALCHEMY_API_KEY")
-    alchemy_http_url = f"{settings.blockchain.ethereum.http.endpoint}/{alchemy_api_key}"
-    http_provider = Web3.HTTPProvider(alchemy_http_url)
-    alchemy_client = Web3(http_provider)
+    logger.info("Sending secondary event batch.")
+    if len(sme_batch) > 0:
+        async_loop.run_until_complete(
+            kinesis.produce_records(
+                settings.kinesis.stream_name,
+                sme_batch,
+                partitioner=partitioner(),
+            )
+        )
 
-    parsing_service: TransactionParsing = TransactionParsing()
+        return {"message": "Successfully processed signature batch."}
 
-    records = event["Records"]
+    return {"message": "Resulting batch is empty."}
 
-    logger.info(f"Records count: {len(records)}. Processing signatures..")
 
-    sme_batch: List[SecondaryMarketEvent] = []
-
-    async_loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(async_loop)
+async def fetch_transactions(
+    solana_client: SolanaHTTPClient,
+    ethereum_client: EthereumHTTPClient,
+    signature_events: List[SignatureEvent],
+) -> List[Optional[Union[SolanaTransaction, EthereumTransaction]]]:
+    """Fetch transactions of all signature events with JSON-RPC batch requests
+    of `BATCH_SIZE` signatures, with at most `CONCURRENCY` requests in flight
+    per blockchain. Ethereum transactions are fetched together with their
+    receipts and block timestamps.
+
+    Args:
+        solana_client (SolanaHTTPClient): Solana RPC client.
+        ethereum_client (EthereumHTTPClient): Ethereum RPC client.
+        signature_events (List[SignatureEvent]): Decoded signature records.
+
+    Returns:
+        List[Optional[Union[SolanaTransaction, EthereumTransaction]]]:
+            Transaction of every signature event, in the same order. None if
+            transaction doesn't exist or can't be decoded.
+
+    Raises:
+        Exception: Transport and RPC failures are not handled, so that the
+            invocation fails and Kinesis retries the batch.
+
+    """
+    solana_id = int(settings.blockchain.address.solana, 0)
+    ethereum_id = int(settings.blockchain.address.ethereum, 0)
+
+    async def fetch_solana() -> Dict[str, Optional[Dict[str, Any]]]:
+        solana_signatures = [
+            signature_event.signature
+            for signature_event in signature_events
+            if signature_event.blockchain_id == solana_id
+        ]
+        if not solana_signatures:
+            return {}
+
+        return await get_transactions(solana_client, solana_signatures)
+
+    async def fetch_ethereum() -> Dict[str, Dict[str, Any]]:
+        ethereum_signatures = [
+            signature_event.signature
+            for signature_event in signature_events
+            if signature_event.blockchain_id == ethereum_id
+        ]
+        if not ethereum_signatures:
+            return {}
+
+        return await get_transactions_ethereum(ethereum_client, ethereum_signatures)
+
+    solana_transactions, ethereum_transactions = await asyncio.gather(
+        fetch_solana(), fetch_ethereum()
+    )
 
-    for record in records:
+    def build(
+        signature_event: SignatureEvent,
+    ) -> Optional[Union[SolanaTransaction, EthereumTransaction]]:
         try:
-            logger.info(f"Received record: {record}")
-            signature_data = base64.b64decode(record["kinesis"]["data"]).decode("utf-8")
-            signature_record = json.loads(signature_data)
-            signature_event: SignatureEvent = SignatureEvent.from_dict(signature_record)
-
-            if signature_event.blockchain_id == int(
-                settings.blockchain.address.solana, 0
-            ):
-
-                transaction_dict = async_loop.run_until_complete(
-                    get_transaction(solana_client, signature_event)
-                )
+            if signature_event.blockchain_id == solana_id:
+                transaction_dict = solana_transactions.get(signature_event.signature)
 
                 if not transaction_dict:
                     logger.warning(
                         f"Could not fetch transaction details for transaction {signature_event.signature}."
                     )
-                    continue
+                    return None
 
-                transaction = SolanaTransaction.from_dict(transaction_dict)
+                return SolanaTransaction.from_dict(transaction_dict)
 
-                try:
-                    secondary_market_event = parsing_service.parse(
-                        transaction, signature_event.market_account
-                    )
-                    sme_batch.append(secondary_market_event)
-                except TransactionParserNotFoundException as error:
-                    logger.warning(error)
-                    continue
-                except (
-                    TransactionInstructionMissingException,
-                    UnknownTransactionException,
-                    SecondaryMarketDataMissingException,
-                ) as error:
-                    logger.error(error)
-                    raise RuntimeError from error
-            elif signature_event.blockchain_id == int(
-                settings.blockchain.address.ethereum, 0
-            ):
-
-                (
-                    transaction_details,
-                    transaction_receipt_event_logs,
-                ) = async_loop.run_until_complete(
-                    get_transaction_ethereum(alchemy_client, signature_event)
-                )
+            if signature_event.blockchain_id == ethereum_id:
+                transaction_data = ethereum_transactions.get(signature_event.signature)
 
-                if not transaction_details:
+                if not transaction_data:
                     logger.warning(
                         f"Could not fetch transaction details for transaction {signature_event.signature}."
                     )
-                    continue
+                    return None
 
-                if not transaction_receipt_event_logs:
-                    logger.warning(
-                        f"Could not fetch transaction receipt event logs for transaction {signature_event.signature}."
-                    )
-                    continue
-
-                transaction = EthereumTransaction.from_dict(
-                    transaction_details, transaction_receipt_event_logs
+                return EthereumTransaction.from_rpc(
+                    transaction_data["transaction"],
+                    transaction_data["receipt"],
+                    transaction_data["block_timestamp"],
                 )
 
-                try:
-                    secondary_market_event = parsing_service.parse(
-                        transaction, signature_event.market_account
-                    )
-                    sme_batch.append(secondary_market_event)
-                except (
-                    TransactionInstructionMissingException,
-                    UnknownTransactionException,
-                    SecondaryMarketDataMissingException,
-                    TransactionParserNotFoundException,
-                ) as error:
-                    logger.error(error)
-                    continue
-
-            else:
-                logger.error(
-                    f"Unknown blockchain name: {signature_event.blockchain_id}"
-                )
-        except (json.JSONDecodeError, ValueError, TypeError, KeyError) as error:
+            logger.error(f"Unknown blockchain name: {signature_event.blockchain_id}")
+        except (ValueError, TypeError, KeyError) as error:
+            logger.error(
+                f"Decoding transaction {signature_event.signature} has failed."
+            )
             logger.error(error)
 
-    logger.info("Sending secondary event batch.")
-    if len(sme_batch) > 0:
-        kinesis.produce_records(
-            settings.kinesis.stream_name,
-            sme_batch,
-        )
+        return None
 
-        return {"message": "Successfully processed signature batch."}
+    return [build(signature_event) for signature_event in signature_events]
 
-    return {"message": "Resulting batch is empty."}
 
+async def get_transactions(
+    client: SolanaHTTPClient, signatures: List[str]
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    logger.info(f"Fetching transactions for {len(signatures)} signatures.")
+    responses = await client.get_transactions_batch(
+        signatures,
+        batch_size=settings.blockchain.solana.http.batch_size,
+        concurrency=settings.blockchain.solana.http.concurrency,
+    )
 
-async def get_transaction(
-    client: SolanaHTTPClient, event: SignatureEvent
-) -> Dict[str, Any]:
-    logger.info(f"Fetching transaction for signature: {event.signature}.")
-    response = await client.get_confirmed_transaction(event.signature)
-    logger.info(f"Fetched transaction data: {response}")
+    transactions: Dict[str, Optional[Dict[str, Any]]] = {}
+    for signature, response in responses.items():
+        logger.info(f"Fetched transaction data: {response}")
+        # Result is None if the transaction is unknown to the node, failed
+        # calls have already raised.
+        transactions[signature] = response["result"]
 
-    transaction_dict = None
+    return transactions
 
-    if "error" in response:
-        logger.error(
-            f"Error occurred while fetching transaction data: {response['error']}"
-        )
-    elif "result" in response:
-        transaction_dict = response["result"]
-
-    return transaction_dict
-
-
-async def get_transaction_ethereum(
-    client: Web3,
-    event: SignatureEvent,
-) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    logger.info(f"Fetching transaction for signature: {event.signature}.")
-    transaction_details = client.eth.get_transaction(event.signature)
-    transaction_receipt_event_logs = client.eth.getTransactionReceipt(event.signature)
-    logger.info(f"Fetched transaction details data: {transaction_details}")
-    logger.info(
-        f"Fetched transaction receipt event logs data: {transaction_receipt_event_logs}"
+
+async def get_transactions_ethereum(
+    client: EthereumHTTPClient, signatures: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    logger.info(f"Fetching Ethereum transactions for {len(signatures)} signatures.")
+    transactions = await client.get_transactions_batch(
+        signatures,
+        batch_size=settings.blockchain.ethereum.http.batch_size,
+        concurrency=settings.blockchain.ethereum.http.concurrency,
     )
+    logger.info(f"Fetched Ethereum transaction data: {transactions}")
 
-    return transaction_details, transaction_receipt_event_logs
+    return transactions
@@ -1,10 +1,17 @@
-from typing import Any, Dict, Optional, Union
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Union
 
 import httpx
 from solana.blockhash import BlockhashCache
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Commitment
 from solana.rpc.providers.async_http import AsyncHTTPProvider
+from src.exception import RPCRequestFailedException
+
+logger = logging.getLogger(__name__)
 
 
 class AsynchronousHTTPProvider(AsyncHTTPProvider):
@@ -44,5 +51,310 @@ class SolanaHTTPClient(AsyncClient):
 
         self._provider = AsynchronousHTTPProvider(endpoint, timeout, username, password)
 
+    async def get_transactions_batch(
+        self,
+        signatures: List[str],
+        batch_size: int = 50,
+        concurrency: int = 4,
+        encoding: str = "json",
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch transactions with JSON-RPC batch requests.
+
+        One HTTP request is sent per `batch_size` signatures, with at most
+        `concurrency` requests in flight. Responses are mapped back to
+        signatures by request id. Signatures whose response is an error or
+        missing, or whose whole batch request has failed, are fetched again
+        with single calls, which count towards the same `concurrency`.
+
+        Args:
+            signatures (List[str]): Transaction signatures.
+            batch_size (int): Signatures per batch request.
+            concurrency (int): Requests in flight.
+            encoding (str): Encoding of returned transactions.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: RPC response of every signature.
+
+        Raises:
+            SolanaRpcException: If a single call of a failed signature fails
+                as well.
+            RPCRequestFailedException: If a single call of a failed signature
+                returns an error.
+
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_single(signature: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_confirmed_transaction(signature, encoding)
+
+        async def fetch_batch(batch: List[str]) -> Dict[str, Dict[str, Any]]:
+            async with semaphore:
+                responses = await self._post_batch(batch, encoding)
+
+            failed = [
+                signature
+                for signature in batch
+                if "result" not in responses.get(signature, {})
+            ]
+            if failed:
+                logger.warning(
+                    f"Batch request has failed for {len(failed)} of {len(batch)} "
+                    "signatures, fetching them one by one."
+                )
+                retried = await asyncio.gather(
+                    *(fetch_single(signature) for signature in failed),
+                    return_exceptions=True,
+                )
+                for signature, response in zip(failed, retried):
+                    if isinstance(response, Exception):
+                        raise response
+                    if "result" not in response:
+                        raise RPCRequestFailedException(
+                            f"Fetching transaction {signature} has failed: "
+                            f"{response.get('error', 'missing response')}"
+                        )
+                    responses[signature] = response
+
+            return responses
+
+        responses: Dict[str, Dict[str, Any]] = {}
+        for batch_responses in await asyncio.gather(
+            *(
+                fetch_batch(signatures[start : start + batch_size])
+                for start in range(0, len(signatures), batch_size)
+            ),
+            return_exceptions=True,
+        ):
+            if isinstance(batch_responses, Exception):
+                raise batch_responses
+            responses.update(batch_responses)
+
+        return responses
+
+    async def _post_batch(
+        self, signatures: List[str], encoding: str
+    ) -> Dict[str, Dict[str, Any]]:
+        request = [
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "getConfirmedTransaction",
+                "params": [signature, encoding],
+            }
+            for request_id, signature in enumerate(signatures)
+        ]
+        try:
+            response = await self._provider.session.post(
+                self._provider.endpoint_uri,
+                content=json.dumps(request),
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+            results = response.json()
+        except (httpx.HTTPError, ValueError) as error:
+            # Signatures of the batch are retried with single calls.
+            logger.error(error)
+            return {}
+
+        if not isinstance(results, list):
+            # Provider doesn't support batches, error is returned for the request.
+            return {}
+
+        return {
+            signatures[result["id"]]: result
+            for result in results
+            if isinstance(result.get("id"), int) and 0 <= result["id"] < len(signatures)
+        }
+
+
+class EthereumHTTPClient:
+    """Async Ethereum JSON-RPC client fetching transactions with batch requests.
+
+    Timestamps of fetched blocks are kept in a small LRU cache keyed by block
+    number, since many market events share a block.
+    """
+
+    def __init__(
+        self, endpoint: str, timeout: float = 10, block_cache_size: int = 1024
+    ) -> None:
+        self.endpoint = endpoint
+        self.session = httpx.AsyncClient(timeout=httpx.Timeout(timeout))
+        self.block_cache_size = block_cache_size
+        self._block_timestamps: "OrderedDict[int, int]" = OrderedDict()
+
+    def block_timestamp(self, block_number: int) -> Optional[int]:
+        timestamp = self._block_timestamps.get(block_number)
+        if timestamp is not None:
+            self._block_timestamps.move_to_end(block_number)
+        return timestamp
+
+    async def get_transactions_batch(
+        self,
+        transaction_hashes: List[str],
+        batch_size: int = 50,
+        concurrency: int = 4,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch transactions, their receipts and block timestamps with
+        JSON-RPC batch requests.
+
+        Transaction and receipt of every hash are requested in the same batch,
+        one HTTP request is sent per `batch_size` hashes, with at most
+        `concurrency` requests in flight. Headers of blocks missing from the
+        cache are then requested in a second batch.
+
+        Args:
+            transaction_hashes (List[str]): Transaction hashes.
+            batch_size (int): Hashes per batch request.
+            concurrency (int): Batch requests in flight.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Raw `transaction`, `receipt` and
+                `block_timestamp` of every hash whose transaction and receipt
+                exist. Block timestamp is None if the block header couldn't
+                be fetched.
+
+        Raises:
+            RPCRequestFailedException: If a batch request, or the transaction
+                or receipt call of any hash, fails.
+
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def post(requests: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+            async with semaphore:
+                return await self._post_batch(requests)
+
+        transaction_batches = [
+            transaction_hashes[start : start + batch_size]
+            for start in range(0, len(transaction_hashes), batch_size)
+        ]
+        transaction_responses = await self._gather(
+            post(
+                [
+                    self._request(index, method, [transaction_hash])
+                    for position, transaction_hash in enumerate(batch)
+                    for index, method in (
+                        (2 * position, "eth_getTransactionByHash"),
+                        (2 * position + 1, "eth_getTransactionReceipt"),
+                    )
+                ]
+            )
+            for batch in transaction_batches
+        )
+
+        transactions: Dict[str, Dict[str, Any]] = {}
+        for batch, responses in zip(transaction_batches, transaction_responses):
+            for position, transaction_hash in enumerate(batch):
+                transaction = responses.get(2 * position, {})
+                receipt = responses.get(2 * position + 1, {})
+                for response in (transaction, receipt):
+                    if "result" not in response:
+                        raise RPCRequestFailedException(
+                            f"Fetching transaction {transaction_hash} has failed: "
+                            f"{response.get('error', 'missing response')}"
+                        )
+
+                if not transaction["result"] or not receipt["result"]:
+                    # Transaction is unknown to the node, e.g. it was dropped.
+                    logger.warning(f"Transaction {transaction_hash} doesn't exist.")
+                    continue
+
+                transactions[transaction_hash] = {
+                    "transaction": transaction["result"],
+                    "receipt": receipt["result"],
+                }
+
+        block_numbers = sorted(
+            {
+                int(transaction["receipt"]["blockNumber"], 16)
+                for transaction in transactions.values()
+            }
+        )
+        missing_blocks = [
+            block_number
+            for block_number in block_numbers
+            if self.block_timestamp(block_number) is None
+        ]
+        if missing_blocks:
+            # Timestamps of blocks whose header calls return an error are fetched by
+            # the parser.
+            for responses in await self._gather(
+                (
+                    post(
+                        [
+                            self._request(
+                                block_number,
+                                "eth_getBlockByNumber",
+                                [hex(block_number), False],
+                            )
+                            for block_number in missing_blocks[
+                                start : start + batch_size
+                            ]
+                        ]
+                    )
+                    for start in range(0, len(missing_blocks), batch_size)
+                )
+            ):
+                for block_number, response in responses.items():
+                    block = response.get("result")
+                    if block:
+                        self._cache_block_timestamp(
+                            block_number, int(block["timestamp"], 16)
+                        )
+
+        for transaction in transactions.values():
+            transaction["block_timestamp"] = self.block_timestamp(
+                int(transaction["receipt"]["blockNumber"], 16)
+            )
+
+        return transactions
+
+    def _cache_block_timestamp(self, block_number: int, timestamp: int) -> None:
+        self._block_timestamps[block_number] = timestamp
+        self._block_timestamps.move_to_end(block_number)
+        while len(self._block_timestamps) > self.block_cache_size:
+            self._block_timestamps.popitem(last=False)
+
+    @staticmethod
+    async def _gather(coroutines: Iterable[Awaitable[Any]]) -> List[Any]:
+        """Wait for all coroutines, then raise the first error if any failed."""
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    @staticmethod
+    def _request(request_id: int, method: str, params: List[Any]) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+
+    async def _post_batch(
+        self, requests: List[Dict[str, Any]]
+    ) -> Dict[int, Dict[str, Any]]:
+        try:
+            response = await self.session.post(
+                self.endpoint,
+                content=json.dumps(requests),
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+            results = response.json()
+        except (httpx.HTTPError, ValueError) as error:
+            logger.error(error)
+            raise RPCRequestFailedException(
+                f"Batch request has failed: {error!r}"
+            ) from error
+
+        if not isinstance(results, list):
+            # Provider doesn't support batches, error is returned for the request.
+            raise RPCRequestFailedException(f"Batch request has failed: {results}")
+
+        return {
+            result["id"]: result
+            for result in results
+            if isinstance(result, dict) and isinstance(result.get("id"), int)
+        }
+
 
-__all__ = ["SolanaHTTPClient"]
+__all__ = ["EthereumHTTPClient", "SolanaHTTPClient"]
@@ -0,0 +1,111 @@
+"""Clients shared by warm invocations of the lambda.
+
+Clients are created on first use and kept for the lifetime of the execution
+environment, so warm invocations reuse their connection pools instead of
+opening new connections and repeating TLS handshakes. Async clients are bound
+to the event loop they were first used on, so a single event loop is kept as
+well.
+"""
+import asyncio
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+from shared.kinesis import KinesisProducer
+from shared.partition import Partitioner
+from src.async_client import EthereumHTTPClient, SolanaHTTPClient
+from src.config import settings
+from src.parsing import TransactionParsing
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def event_loop() -> asyncio.AbstractEventLoop:
+    """Return event loop of the execution environment, set as current one."""
+    global _event_loop  # pylint: disable=global-statement
+
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+        # Sessions of the previous loop can't be used on the new one.
+        solana_client.cache_clear()
+        ethereum_client.cache_clear()
+
+    asyncio.set_event_loop(_event_loop)
+    return _event_loop
+
+
+@lru_cache(maxsize=None)
+def kinesis_producer() -> KinesisProducer:
+    logger.info("Connecting to Kinesis service...")
+
+    localstack_active_var = str(settings.localstack.active).lower()
+    localstack_active = localstack_active_var == "true"
+
+    if localstack_active:
+        logger.info("Localstack is active.")
+
+    return KinesisProducer(
+        os.getenv("AWS_ACCESS_KEY_ID"),
+        os.getenv("AWS_SECRET_ACCESS_KEY"),
+        os.getenv("AWS_REGION"),
+        localstack_active,
+        aggregate=settings.kinesis.aggregate,
+    )
+
+
+@lru_cache(maxsize=None)
+def solana_client() -> SolanaHTTPClient:
+    logger.info(
+        f"Initializing SolanaHTTPClient for endpoint: {settings.blockchain.solana.http.endpoint}."
+    )
+
+    return SolanaHTTPClient(
+        endpoint=settings.blockchain.solana.http.endpoint,
+        timeout=settings.blockchain.solana.http.timeout,
+        username=os.getenv("SOLANA_RPC_HTTP_USERNAME"),
+        password=os.getenv("SOLANA_RPC_HTTP_PASSWORD"),
+    )
+
+
+@lru_cache(maxsize=None)
+def ethereum_client() -> EthereumHTTPClient:
+    logger.info(
+        f"Initializing EthereumHTTPClient for endpoint: {settings.blockchain.ethereum.http.endpoint}."
+    )
+
+    alchemy_api_key = os.getenv("ALCHEMY_API_KEY")
+    return EthereumHTTPClient(
+        endpoint=f"{settings.blockchain.ethereum.http.endpoint}/{alchemy_api_key}",
+        timeout=settings.blockchain.ethereum.http.timeout,
+        block_cache_size=settings.blockchain.ethereum.http.block_cache_size,
+    )
+
+
+@lru_cache(maxsize=None)
+def alchemy_client() -> Web3:
+    logger.info(
+        f"Initializing AlchemyHTTPClient for endpoint: {settings.blockchain.ethereum.http.endpoint}."
+    )
+
+    alchemy_api_key = os.getenv("ALCHEMY_API_KEY")
+    alchemy_http_url = f"{settings.blockchain.ethereum.http.endpoint}/{alchemy_api_key}"
+    return Web3(Web3.HTTPProvider(alchemy_http_url))
+
+
+@lru_cache(maxsize=None)
+def parsing_service() -> TransactionParsing:
+    return TransactionParsing(alchemy_client())
+
+
+@lru_cache(maxsize=None)
+def partitioner() -> Partitioner:
+    # Kept across invocations, so explicit hash keys keep cycling through the
+    # shards instead of restarting with every batch.
+    return Partitioner(
+        settings.kinesis.partition.strategy,
+        settings.kinesis.partition.key,
+    )
@@ -2,14 +2,6 @@ class SintraException(Exception):
     """Base exception class for Sintra module."""
 
 
-class ProduceRecordFailedException(SintraException):
-    """Raised when client fails to produce record."""
-
-
-class EnvironmentVariableMissingException(SintraException):
-    """Raised when environment variable doesn't exist."""
-
-
 class DecodingException(SintraException):
     """Raised when input record fails decoding process."""
 
@@ -28,3 +20,7 @@ class UnknownTransactionException(SintraException):
 
 class SecondaryMarketDataMissingException(SintraException):
     """Raised when there is not sufficient data to create SME."""
+
+
+class RPCRequestFailedException(SintraException):
+    """Raised when JSON-RPC request or any of its batched calls fails."""
@@ -1,14 +1,48 @@
 from __future__ import annotations
 
+import struct
 from dataclasses import dataclass
-from functools import cached_property
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import base58
 import orjson
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
 from pydantic import BaseModel
 from src.config import settings
 
+# Version byte leading binary encoded signature records, JSON encoded records
+# start with "{" instead.
+SIGNATURE_FORMAT_VERSION = 1
+
+# Version, blockchain ID, market address and timestamp in nanoseconds.
+_SIGNATURE_HEADER = struct.Struct(">BIIQ")
+
+# Encodings of text fields in binary encoded signature records.
+_TEXT_UTF8 = 0
+_TEXT_BASE58 = 1
+_TEXT_HEX = 2
+
+
+def _unpack_text(data: bytes, offset: int) -> Tuple[str, int]:
+    kind, length = struct.unpack_from(">BB", data, offset)
+    offset += 2
+    raw = data[offset : offset + length]
+    if len(raw) != length:
+        raise ValueError("Signature record is truncated.")
+
+    if kind == _TEXT_BASE58:
+        value = base58.b58encode(raw).decode()
+    elif kind == _TEXT_HEX:
+        value = "0x" + raw.hex()
+    elif kind == _TEXT_UTF8:
+        value = raw.decode()
+    else:
+        raise ValueError(f"Unknown text encoding in signature record: {kind}.")
+
+    return value, offset + length
+
 
 def orjson_dumps(v, *, default):
     # orjson.dumps returns bytes, to match standard json.dumps we need to decode
@@ -37,6 +71,50 @@ class SignatureEvent:
             timestamp=signature_dict["timestamp"],
         )
 
+    @classmethod
+    def from_bytes(cls, data: bytes) -> SignatureEvent:
+        """Decode signature record in either binary or JSON encoding.
+
+        Args:
+            data (bytes): Record data as produced to the signature stream.
+
+        Raises:
+            ValueError: If binary format version is unknown or data is
+                malformed.
+
+        Returns:
+            SignatureEvent: Decoded signature event.
+
+        """
+        if data[:1] == b"{":
+            return cls.from_dict(orjson.loads(data))
+
+        if data[:1] != bytes([SIGNATURE_FORMAT_VERSION]):
+            raise ValueError(f"Unknown signature record format: {data[:1]!r}.")
+
+        try:
+            (
+                _,
+                blockchain_id,
+                market_address,
+                timestamp,
+            ) = _SIGNATURE_HEADER.unpack_from(data)
+            signature, offset = _unpack_text(data, _SIGNATURE_HEADER.size)
+            market_account, offset = _unpack_text(data, offset)
+            (market_length,) = struct.unpack_from(">B", data, offset)
+            market = data[offset + 1 : offset + 1 + market_length].decode()
+        except struct.error as error:
+            raise ValueError("Signature record is truncated.") from error
+
+        return cls(
+            blockchain_id=blockchain_id,
+            market=market,
+            market_address=market_address,
+            market_account=market_account,
+            signature=signature,
+            timestamp=timestamp,
+        )
+
 
 class DataClassBase(BaseModel):
     class Config:
@@ -78,32 +156,57 @@ class SecondaryMarketEvent(DataClassBase):
         }
 
 
+@lru_cache(maxsize=None)
+def _program_id(name: str) -> str:
+    # Settings lookups are slow compared to parsing a single instruction.
+    return settings.blockchain.solana.metaplex[name]
+
+
 class Instruction:
-    def __init__(self, accounts, data, program, index=None):
-        self.accounts = accounts
-        self.data = data
-        self.program = program
+    """View of a raw transaction instruction. Instruction data is decoded and
+    account indexes are resolved only once they are accessed."""
+
+    __slots__ = ("index", "_instruction_dict", "_account_keys", "_data", "_accounts")
+
+    def __init__(self, instruction_dict, account_keys, index=None):
         self.index = index
+        self._instruction_dict = instruction_dict
+        self._account_keys = account_keys
+        self._data = None
+        self._accounts = None
 
     @classmethod
     def from_dict(
-        cls, instruction_dict: Dict[str, Any], accounts: List[int], index=None
+        cls, instruction_dict: Dict[str, Any], accounts: List[str], index=None
     ) -> Instruction:
-        account_indexes = instruction_dict["accounts"]
-        data = base58.b58decode(instruction_dict["data"])
-        program_index = instruction_dict["programIdIndex"]
-        instruction_accounts = [accounts[index] for index in account_indexes]
-        program_hash = accounts[program_index]
+        return cls(instruction_dict, accounts, index)
+
+    @property
+    def data(self) -> bytes:
+        if self._data is None:
+            self._data = base58.b58decode(self._instruction_dict["data"])
+        return self._data
+
+    @property
+    def accounts(self) -> List[str]:
+        if self._accounts is None:
+            self._accounts = [
+                self._account_keys[index]
+                for index in self._instruction_dict["accounts"]
+            ]
+        return self._accounts
 
-        return cls(instruction_accounts, data, program_hash, index)
+    @property
+    def program(self) -> str:
+        return self._account_keys[self._instruction_dict["programIdIndex"]]
 
-    @cached_property
+    @property
     def is_system_program_instruction(self) -> bool:
-        return self.program == settings.blockchain.solana.metaplex.system_program_id
+        return self.program == _program_id("system_program_id")
 
-    @cached_property
+    @property
     def is_token_program_instruction(self) -> bool:
-        return self.program == settings.blockchain.solana.metaplex.token_program_id
+        return self.program == _program_id("token_program_id")
 
     def get_function_offset(self, unknown_width=1) -> int:
         """
@@ -157,19 +260,35 @@ class Instruction:
 
 
 class InnerInstructionsGroup:
-    def __init__(self, index, instructions):
+    """View of a raw group of inner instructions, instruction views are
+    created on first access."""
+
+    __slots__ = ("index", "_instructions_dict", "_account_keys", "_instructions")
+
+    def __init__(self, index, instructions_dict, account_keys):
         self.index = index
-        self.instructions = instructions
+        self._instructions_dict = instructions_dict
+        self._account_keys = account_keys
+        self._instructions = None
 
     @classmethod
     def from_dict(
-        cls, accounts: List[int], inner_instructions_dict: Dict[str, Any]
+        cls, accounts: List[str], inner_instructions_dict: Dict[str, Any]
     ) -> InnerInstructionsGroup:
-        inner_instructions = [
-            Instruction.from_dict(instruction, accounts)
-            for instruction in inner_instructions_dict["instructions"]
-        ]
-        return cls(inner_instructions_dict["index"], inner_instructions)
+        return cls(
+            inner_instructions_dict["index"],
+            inner_instructions_dict["instructions"],
+            accounts,
+        )
+
+    @property
+    def instructions(self) -> List[Instruction]:
+        if self._instructions is None:
+            self._instructions = [
+                Instruction(instruction, self._account_keys)
+                for instruction in self._instructions_dict
+            ]
+        return self._instructions
 
     def __eq__(self, other: InnerInstructionsGroup):
         if not isinstance(self, other.__class__):
@@ -178,211 +297,81 @@ class InnerInstructionsGroup:
         return self.index == other.index and self.instructions == other.instructions
 
 
-class Transaction:
-    def __init__(
-        self,
-        slot,
-        meta,
-        fee,
-        block_time,
-        instructions,
-        inner_instructions_groups,
-        account_keys,
-        post_token_balances,
-        signature,
-    ):
-        self.slot = slot
-        self.meta = meta
-        self.fee = fee
-        self.block_time = block_time
-        self.inner_instructions_groups = inner_instructions_groups
-        self.instructions = instructions
-        self.account_keys = account_keys
-        self.post_token_balances = post_token_balances
-        self.signature = signature
-
-    @classmethod
-    def from_dict(cls, transaction_dict) -> Transaction:
-        slot = transaction_dict["slot"]
-        meta = transaction_dict["meta"]
-        block_time = transaction_dict["blockTime"]
-
-        account_keys = None
-        instructions_part = None
-        signature = None
-        transaction_part = transaction_dict["transaction"]
-        if transaction_part:
-            signature = transaction_part["signatures"][0]
-            message_part = transaction_part["message"]
-            if message_part:
-                account_keys = message_part["accountKeys"]
-                instructions_part = message_part["instructions"]
-        instructions = [
-            Instruction.from_dict(instruction_json, account_keys, index)
-            for index, instruction_json in enumerate(instructions_part)
-        ]
-
-        if meta:
-            fee = meta["fee"]
-            post_token_balances = meta["postTokenBalances"]
-            inner_instructions = [
-                InnerInstructionsGroup.from_dict(account_keys, inner_instructions_group)
-                for inner_instructions_group in meta["innerInstructions"]
-            ]
-        else:
-            fee = None
-            post_token_balances = None
-            inner_instructions = None
-
-        return cls(
-            slot,
-            meta,
-            fee,
-            block_time,
-            instructions,
-            inner_instructions,
-            account_keys,
-            post_token_balances,
-            signature,
-        )
-
-    def get_instruction_by_index(self, index: int) -> Optional[Instruction]:
-        if index < 0 or len(self.instructions) > index:
-            return None
-        return self.instructions[index]
-
-    def find_instruction(
-        self, account_key: str, offset: int = None, width: int = 1
-    ) -> Optional[Instruction]:
-        for instruction in self.instructions:
-            instruction_offset = instruction.get_function_offset(width)
-            if instruction.program == account_key:
-                if offset is None or offset == instruction_offset:
-                    return instruction
-        return None
-
-    def find_inner_instructions(
-        self, instruction: Instruction
-    ) -> Optional[InnerInstructionsGroup]:
-        for inner_instructions_group in self.inner_instructions_groups:
-            if inner_instructions_group.index == instruction.index:
-                return inner_instructions_group
-
-        return None
-
-    def find_token_address_and_owner(self, token_account_to_match: Optional[str]):
-        """
-        Method to figure out the actual token address regardless of the
-        market. This is inferred from the "token account", usually the 2nd param
-        from the Token transfer program, that for any post balances if its index
-        matches the token account index, we know this balance is for the "receiver".
-
-        This works for events with token transfer happened.
-
-        Args:
-            token_account_to_match:
-
-        Returns:
-
-        """
-
-        for balance in self.post_token_balances:
-            account_index = balance["accountIndex"]
-            matched = (
-                token_account_to_match is None
-                or self.account_keys[account_index] == token_account_to_match
-                or balance["owner"] == token_account_to_match
-            )
+class SolanaTransaction:
+    """View of a raw Solana transaction as returned by the RPC node.
 
-            if matched and balance["uiTokenAmount"]["amount"] == "1":
-                return balance["mint"], balance["owner"] if "owner" in balance else None
+    The raw dictionary is kept as is, instructions and inner instruction
+    groups are created on first access and their data is decoded only once
+    it is read, since parsers usually look at a single instruction.
+    """
 
-        return None, None
+    __slots__ = ("_transaction_dict", "_instructions", "_inner_instructions_groups")
 
-    def __eq__(self, other: Transaction):
-        if not isinstance(self, other.__class__):
-            return False
-
-        return (
-            self.instructions == other.instructions
-            and self.slot == other.slot
-            and self.meta == other.meta
-            and self.fee == other.fee
-            and self.block_time == other.block_time
-            and self.inner_instructions_groups == other.inner_instructions_groups
-            and self.account_keys == other.account_keys
-            and self.post_token_balances == other.post_token_balances
-            and self.signature == other.signature
-        )
-
-
-class SolanaTransaction:
-    def __init__(
-        self,
-        slot,
-        meta,
-        fee,
-        block_time,
-        instructions,
-        inner_instructions_groups,
-        account_keys,
-        post_token_balances,
-        signature,
-    ):
-        self.slot = slot
-        self.meta = meta
-        self.fee = fee
-        self.block_time = block_time
-        self.inner_instructions_groups = inner_instructions_groups
-        self.instructions = instructions
-        self.account_keys = account_keys
-        self.post_token_balances = post_token_balances
-        self.signature = signature
+    def __init__(self, transaction_dict: Dict[str, Any]):
+        self._transaction_dict = transaction_dict
+        self._instructions = None
+        self._inner_instructions_groups = None
 
     @classmethod
     def from_dict(cls, transaction_dict) -> SolanaTransaction:
-        slot = transaction_dict["slot"]
-        meta = transaction_dict["meta"]
-        block_time = transaction_dict["blockTime"]
-
-        account_keys = None
-        instructions_part = None
-        signature = None
-        transaction_part = transaction_dict["transaction"]
-        if transaction_part:
-            signature = transaction_part["signatures"][0]
-            message_part = transaction_part["message"]
-            if message_part:
-                account_keys = message_part["accountKeys"]
-                instructions_part = message_part["instructions"]
-        instructions = [
-            Instruction.from_dict(instruction_json, account_keys, index)
-            for index, instruction_json in enumerate(instructions_part)
-        ]
+        return cls(transaction_dict)
+
+    @property
+    def slot(self):
+        return self._transaction_dict["slot"]
+
+    @property
+    def meta(self):
+        return self._transaction_dict["meta"]
+
+    @property
+    def fee(self):
+        return self.meta["fee"] if self.meta else None
+
+    @property
+    def block_time(self):
+        return self._transaction_dict["blockTime"]
+
+    @property
+    def signature(self):
+        transaction_part = self._transaction_dict["transaction"]
+        return transaction_part["signatures"][0] if transaction_part else None
+
+    @property
+    def account_keys(self):
+        message_part = self._message
+        return message_part["accountKeys"] if message_part else None
+
+    @property
+    def post_token_balances(self):
+        return self.meta["postTokenBalances"] if self.meta else None
+
+    @property
+    def instructions(self) -> List[Instruction]:
+        if self._instructions is None:
+            message_part = self._message
+            instructions_part = message_part["instructions"] if message_part else []
+            account_keys = self.account_keys
+            self._instructions = [
+                Instruction(instruction_json, account_keys, index)
+                for index, instruction_json in enumerate(instructions_part)
+            ]
+        return self._instructions
 
-        if meta:
-            fee = meta["fee"]
-            post_token_balances = meta["postTokenBalances"]
-            inner_instructions = [
+    @property
+    def inner_instructions_groups(self) -> Optional[List[InnerInstructionsGroup]]:
+        if self._inner_instructions_groups is None and self.meta:
+            account_keys = self.account_keys
+            self._inner_instructions_groups = [
                 InnerInstructionsGroup.from_dict(account_keys, inner_instructions_group)
-                for inner_instructions_group in meta["innerInstructions"]
+                for inner_instructions_group in self.meta["innerInstructions"]
             ]
-        else:
-            fee = None
-            post_token_balances = None
-            inner_instructions = None
+        return self._inner_instructions_groups
 
-        return cls(
-            slot,
-            meta,
-            fee,
-            block_time,
-            instructions,
-            inner_instructions,
-            account_keys,
-            post_token_balances,
-            signature,
-        )
+    @property
+    def _message(self) -> Optional[Dict[str, Any]]:
+        transaction_part = self._transaction_dict["transaction"]
+        return transaction_part["message"] if transaction_part else None
 
     def get_instruction_by_index(self, index: int) -> Optional[Instruction]:
         if index < 0 or len(self.instructions) > index:
@@ -393,9 +382,9 @@ class SolanaTransaction:
         self, account_key: str, offset: int = None, width: int = 1
     ) -> Optional[Instruction]:
         for instruction in self.instructions:
-            instruction_offset = instruction.get_function_offset(width)
+            # Only data of instructions of the program is decoded.
             if instruction.program == account_key:
-                if offset is None or offset == instruction_offset:
+                if offset is None or offset == instruction.get_function_offset(width):
                     return instruction
         return None
 
@@ -424,11 +413,12 @@ class SolanaTransaction:
 
         """
 
+        account_keys = self.account_keys
         for balance in self.post_token_balances:
             account_index = balance["accountIndex"]
             matched = (
                 token_account_to_match is None
-                or self.account_keys[account_index] == token_account_to_match
+                or account_keys[account_index] == token_account_to_match
                 or balance["owner"] == token_account_to_match
             )
 
@@ -456,7 +446,14 @@ class SolanaTransaction:
 
 class EthereumTransaction:
     def __init__(
-        self, signature, block_number, logs, offset_input, value, receipt_from
+        self,
+        signature,
+        block_number,
+        logs,
+        offset_input,
+        value,
+        receipt_from,
+        block_time=None,
     ):
         self.signature = signature
         self.block_number = block_number
@@ -464,6 +461,7 @@ class EthereumTransaction:
         self.offset_input = offset_input
         self.value = value
         self.receipt_from = receipt_from
+        self.block_time = block_time
 
     @classmethod
     def from_dict(
@@ -480,6 +478,34 @@ class EthereumTransaction:
 
         return cls(signature, block_number, logs, offset_input, value, receipt_from)
 
+    @classmethod
+    def from_rpc(
+        cls,
+        transaction: Dict[str, Any],
+        receipt: Dict[str, Any],
+        block_time: Optional[int] = None,
+    ) -> EthereumTransaction:
+        """Create transaction from raw JSON-RPC results, formatted the same
+        way as results of the Web3 client."""
+        logs = [
+            dict(
+                log,
+                address=to_checksum_address(log["address"]),
+                topics=[HexBytes(topic) for topic in log["topics"]],
+            )
+            for log in receipt["logs"]
+        ]
+
+        return cls(
+            HexBytes(receipt["transactionHash"]),
+            int(receipt["blockNumber"], 16),
+            logs,
+            transaction["input"],
+            int(transaction["value"], 16),
+            to_checksum_address(receipt["from"]),
+            block_time,
+        )
+
     def __eq__(self, other: EthereumTransaction):
         if not isinstance(self, other.__class__):
             return False
@@ -491,4 +517,5 @@ class EthereumTransaction:
             and self.offset_input == other.offset_input
             and self.value == other.value
             and self.receipt_from == other.receipt_from
+            and self.block_time == other.block_time
         )
@@ -21,19 +21,24 @@ class EthereumOpenSeaParser(SignatureParser):
     # Sale transaction MethodID: 0xab834bab (Function: atomicMatch)
     sale = 0xAB834BAB
 
-    def __init__(self):
-        api_key = os.getenv("ALCHEMY_API_KEY")
-        self.http_provider = Web3.HTTPProvider(
-            f"{settings.blockchain.ethereum.http.endpoint}/{api_key}"
-        )
-        self.w3 = Web3(self.http_provider)
+    def __init__(self, w3: Optional[Web3] = None):
+        if w3 is None:
+            api_key = os.getenv("ALCHEMY_API_KEY")
+            w3 = Web3(
+                Web3.HTTPProvider(
+                    f"{settings.blockchain.ethereum.http.endpoint}/{api_key}"
+                )
+            )
+        self.w3 = w3
         self.program_account = None
 
     def parse(self, transaction: EthereumTransaction) -> Optional[SecondaryMarketEvent]:
         buyer, owner = "", ""
         transaction_hash = transaction.signature.hex()
         block_number = transaction.block_number
-        block_time = self.w3.eth.get_block(block_number)["timestamp"]
+        block_time = transaction.block_time
+        if block_time is None:
+            block_time = self.w3.eth.get_block(block_number)["timestamp"]
         contract_address = transaction.logs[0]["address"]
         token_id = int(transaction.logs[0]["topics"][-1].hex(), 16)
         offset = transaction.offset_input[:10]
@@ -78,16 +83,16 @@ class EthereumOpenSeaParser(SignatureParser):
 
 
 class EthereumOpenSeaParserV1(EthereumOpenSeaParser):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, w3: Optional[Web3] = None):
+        super().__init__(w3)
         self.program_account = (
             settings.blockchain.ethereum.market.open_sea.program_account_v1
         )
 
 
 class EthereumOpenSeaParserV2(EthereumOpenSeaParser):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, w3: Optional[Web3] = None):
+        super().__init__(w3)
         self.program_account = (
             settings.blockchain.ethereum.market.open_sea.program_account_v2
         )
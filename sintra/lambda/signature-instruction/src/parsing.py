@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from src.exception import TransactionParserNotFoundException
 from src.model import EthereumTransaction, SecondaryMarketEvent, SolanaTransaction
@@ -26,12 +26,13 @@ from src.parser.monkey_business import (
 from src.parser.open_sea import OpenSeaParser, OpenSeaParserAuction
 from src.parser.solanart import SolanartParser
 from src.parser.solsea import SolseaParser
+from web3 import Web3
 
 
 class TransactionParsing:
-    def __init__(self):
+    def __init__(self, w3: Optional[Web3] = None):
         self.parsers = {}
-        for parser in self._create_parsers():
+        for parser in self._create_parsers(w3):
             self.parsers[parser.program_account] = parser
 
     def parse(
@@ -47,7 +48,7 @@ class TransactionParsing:
             f"Transaction parser doesn't exist for market account: {market_account}."
         )
 
-    def _create_parsers(self):
+    def _create_parsers(self, w3: Optional[Web3]):
         return [
             SolseaParser(),
             MagicEdenParserV1(),
@@ -65,6 +66,6 @@ class TransactionParsing:
             MonkeyBusinessParserV3(),
             OpenSeaParser(),
             OpenSeaParserAuction(),
-            EthereumOpenSeaParserV1(),
-            EthereumOpenSeaParserV2(),
+            EthereumOpenSeaParserV1(w3),
+            EthereumOpenSeaParserV2(w3),
         ]
@@ -1,6 +1,7 @@
 import base64
 import json
 import os
+import sys
 from pathlib import Path
 from typing import Any, Dict, Generator
 
@@ -25,6 +26,9 @@ from src.parser.open_sea import OpenSeaParser, OpenSeaParserAuction
 from src.parser.solanart import SolanartParser
 from src.parser.solsea import SolseaParser
 
+# Modules shared between lambdas are copied next to `src` in the image.
+sys.path.append(str(Path(__file__).absolute().parents[2]))
+
 
 @pytest.fixture(scope="session")
 def data_path() -> Path:
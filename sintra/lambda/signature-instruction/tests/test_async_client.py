@@ -0,0 +1,196 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+from solana.exceptions import SolanaRpcException
+from src.async_client import EthereumHTTPClient, SolanaHTTPClient
+from src.exception import RPCRequestFailedException
+
+
+def solana_client(handler) -> SolanaHTTPClient:
+    client = SolanaHTTPClient(endpoint="http://solana.local")
+    client._provider.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def ethereum_client(handler, block_cache_size: int = 1024) -> EthereumHTTPClient:
+    client = EthereumHTTPClient(
+        endpoint="http://ethereum.local", block_cache_size=block_cache_size
+    )
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def ethereum_handler(requests: List[Any]):
+    """Answer batches with transactions of block 0x10 + last hash digit."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(request.content)
+        requests.append([item["method"] for item in batch])
+        results: List[Dict[str, Any]] = []
+        for item in batch:
+            if item["method"] == "eth_getBlockByNumber":
+                result: Any = {"timestamp": hex(int(item["params"][0], 16) * 100)}
+            elif item["params"][0] == "0xmissing":
+                result = None
+            else:
+                result = {
+                    "transactionHash": item["params"][0],
+                    "blockNumber": hex(0x10 + int(item["params"][0][-1])),
+                }
+            results.append({"jsonrpc": "2.0", "id": item["id"], "result": result})
+        return httpx.Response(200, json=results)
+
+    return handler
+
+
+class TestEthereumHTTPClient:
+    def test_get_transactions_batch(self) -> None:
+        requests: List[Any] = []
+        hashes = ["0xa1", "0xb1", "0xc2", "0xmissing"]
+
+        transactions = asyncio.run(
+            ethereum_client(ethereum_handler(requests)).get_transactions_batch(
+                hashes, batch_size=3
+            )
+        )
+
+        assert requests == [
+            ["eth_getTransactionByHash", "eth_getTransactionReceipt"] * 3,
+            ["eth_getTransactionByHash", "eth_getTransactionReceipt"],
+            ["eth_getBlockByNumber"] * 2,
+        ]
+        assert {
+            transaction_hash: transaction["block_timestamp"]
+            for transaction_hash, transaction in transactions.items()
+        } == {"0xa1": 0x11 * 100, "0xb1": 0x11 * 100, "0xc2": 0x12 * 100}
+
+    def test_get_transactions_batch_caches_block_timestamps(self) -> None:
+        requests: List[Any] = []
+        client = ethereum_client(ethereum_handler(requests), block_cache_size=1)
+
+        asyncio.run(client.get_transactions_batch(["0xa1"]))
+        asyncio.run(client.get_transactions_batch(["0xb1"]))
+        asyncio.run(client.get_transactions_batch(["0xc2"]))
+
+        assert [methods[0] for methods in requests].count("eth_getBlockByNumber") == 2
+        assert client.block_timestamp(0x11) is None
+        assert client.block_timestamp(0x12) == 0x12 * 100
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            httpx.Response(503, text="Service Unavailable"),
+            httpx.Response(200, json={"jsonrpc": "2.0", "id": None, "error": {}}),
+            httpx.Response(
+                200,
+                json=[
+                    {"jsonrpc": "2.0", "id": 0, "result": {}},
+                    {"jsonrpc": "2.0", "id": 1, "error": {"code": 429}},
+                ],
+            ),
+        ],
+    )
+    def test_get_transactions_batch_when_request_fails(
+        self, response: httpx.Response
+    ) -> None:
+        client = ethereum_client(lambda request: response)
+
+        with pytest.raises(RPCRequestFailedException):
+            asyncio.run(client.get_transactions_batch(["0xa1"]))
+
+
+class TestSolanaHTTPClient:
+    def test_get_transactions_batch(self) -> None:
+        requests: List[Any] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            batch = json.loads(request.content)
+            requests.append(batch)
+            # Responses of a batch may come in any order.
+            return httpx.Response(
+                200,
+                json=[
+                    {"jsonrpc": "2.0", "id": item["id"], "result": item["params"][0]}
+                    for item in reversed(batch)
+                ],
+            )
+
+        signatures = [f"signature-{index}" for index in range(5)]
+        responses = asyncio.run(
+            solana_client(handler).get_transactions_batch(signatures, batch_size=2)
+        )
+
+        assert len(requests) == 3
+        assert {
+            signature: response["result"] for signature, response in responses.items()
+        } == {signature: signature for signature in signatures}
+
+    def test_get_transactions_batch_when_errors(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            if isinstance(body, dict):
+                return httpx.Response(
+                    200,
+                    json={"jsonrpc": "2.0", "id": body["id"], "result": "retried"},
+                )
+
+            results: List[Dict[str, Any]] = []
+            for item in body:
+                if item["params"][0] == "failing":
+                    results.append(
+                        {"jsonrpc": "2.0", "id": item["id"], "error": {"code": -32005}}
+                    )
+                elif item["params"][0] != "missing":
+                    results.append({"jsonrpc": "2.0", "id": item["id"], "result": "ok"})
+            return httpx.Response(200, json=results)
+
+        responses = asyncio.run(
+            solana_client(handler).get_transactions_batch(
+                ["signature", "failing", "missing"]
+            )
+        )
+
+        assert {
+            signature: response["result"] for signature, response in responses.items()
+        } == {"signature": "ok", "failing": "retried", "missing": "retried"}
+
+    def test_get_transactions_batch_when_single_call_errors(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            if isinstance(body, dict):
+                return httpx.Response(
+                    200,
+                    json={
+                        "jsonrpc": "2.0",
+                        "id": body["id"],
+                        "error": {"code": -32005},
+                    },
+                )
+            return httpx.Response(200, json=[])
+
+        with pytest.raises(RPCRequestFailedException):
+            asyncio.run(solana_client(handler).get_transactions_batch(["signature"]))
+
+    def test_get_transactions_batch_when_endpoint_fails(self) -> None:
+        in_flight: List[int] = [0, 0]
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            raise httpx.ConnectError("Connection refused.", request=request)
+
+        signatures = [f"signature-{index}" for index in range(20)]
+        with pytest.raises(SolanaRpcException):
+            asyncio.run(
+                solana_client(handler).get_transactions_batch(
+                    signatures, batch_size=5, concurrency=2
+                )
+            )
+
+        # Single calls of failed batches are limited by the same concurrency.
+        assert in_flight[1] == 2
@@ -2,8 +2,12 @@ from typing import Any, Dict, Generator
 from unittest.mock import patch
 
 import boto3
+import httpx
+import pytest
 from src.app import lambda_handler
 
+SIGNATURE = "3CUHXfnkBW96F7Ae8jSsntDZ2NX8XCgrMHfFq8XnmE2nVBotP2DxycbtCFeZk3tQPk5tw87ZufJGS3gRDr9QE1QQ"
+
 
 def transaction_example() -> Dict[str, Any]:
     return {
@@ -204,27 +208,67 @@ def invalid_transaction_example() -> Dict[str, Any]:
 
 
 class TestLambdaFunction:
-    @patch("src.app.get_transaction")
+    @patch("src.app.get_transactions")
     def test_lambda_handler(
         self,
-        get_transaction_fn,
+        get_transactions_fn,
         kinesis_secondary_market_stream,
         kinesis_input_event: Dict[str, Any],
     ) -> None:
-        get_transaction_fn.return_value = transaction_example()
+        get_transactions_fn.return_value = {SIGNATURE: transaction_example()}
         response = lambda_handler(event=kinesis_input_event, context={})
 
-        get_transaction_fn.assert_called_once()
+        get_transactions_fn.assert_called_once()
         assert response["message"] == "Successfully processed signature batch."
 
-    @patch("src.app.get_transaction")
+    @patch("src.app.get_transactions")
     def test_lambda_handler_when_missing_parser(
         self,
-        get_transaction_fn,
+        get_transactions_fn,
         kinesis_secondary_market_stream: Generator[boto3.client, None, None],
         kinesis_invalid_input_event: Dict[str, Any],
     ) -> None:
-        get_transaction_fn.return_value = transaction_example()
+        get_transactions_fn.return_value = {SIGNATURE: transaction_example()}
         response = lambda_handler(event=kinesis_invalid_input_event, context={})
 
         assert response["message"] == "Resulting batch is empty."
+
+    @patch("src.app.get_transactions")
+    def test_lambda_handler_when_fetch_fails(
+        self,
+        get_transactions_fn,
+        kinesis_secondary_market_stream: Generator[boto3.client, None, None],
+        kinesis_input_event: Dict[str, Any],
+    ) -> None:
+        get_transactions_fn.side_effect = httpx.ConnectError("Connection refused.")
+
+        # Invocation fails, so that Kinesis retries the batch.
+        with pytest.raises(httpx.ConnectError):
+            lambda_handler(event=kinesis_input_event, context={})
+
+    @patch("src.app.get_transactions")
+    def test_lambda_handler_when_transaction_malformed(
+        self,
+        get_transactions_fn,
+        kinesis_secondary_market_stream: Generator[boto3.client, None, None],
+        kinesis_input_event: Dict[str, Any],
+    ) -> None:
+        get_transactions_fn.return_value = {SIGNATURE: {"meta": None}}
+        response = lambda_handler(event=kinesis_input_event, context={})
+
+        assert response["message"] == "Resulting batch is empty."
+
+    @patch("src.app.get_transactions")
+    def test_lambda_handler_reuses_clients(
+        self,
+        get_transactions_fn,
+        kinesis_secondary_market_stream: Generator[boto3.client, None, None],
+        kinesis_input_event: Dict[str, Any],
+    ) -> None:
+        get_transactions_fn.return_value = {SIGNATURE: transaction_example()}
+
+        lambda_handler(event=kinesis_input_event, context={})
+        lambda_handler(event=kinesis_input_event, context={})
+
+        first, second = get_transactions_fn.call_args_list
+        assert first.args[0] is second.args[0]
@@ -0,0 +1,183 @@
+import json
+import struct
+
+import base58
+import pytest
+from hexbytes import HexBytes
+from src.model import EthereumTransaction, SignatureEvent, SolanaTransaction
+
+SOLANA_SIGNATURE = "2ofP3EPaGxCuizB4yFfssHHFjnFCoGzQoF3sKQotWVnsZZi24dpbDE8AVuAhjux2cYYKGBrEfnMStYqGNpTtffET"
+SOLANA_ACCOUNT = "MEisE1HzehtrDpAAT8PnLHjpSSkRYakotTuJRPjTpo8"
+ETHEREUM_HASH = "0x2a6b8a0cb7a2ab4b9b5b1e7d7f0c4d4e2f8d64d4f6a7df8ab83bb25e5ad1b1c7"
+ETHEREUM_ACCOUNT = "0x7Be8076f4EA4A4AD08075C2508e481d6C946D12b"
+
+
+def binary_record(
+    blockchain_id: int,
+    market_address: int,
+    timestamp: int,
+    signature: bytes,
+    market_account: bytes,
+    market: bytes,
+    version: int = 1,
+) -> bytes:
+    return (
+        struct.pack(">BIIQ", version, blockchain_id, market_address, timestamp)
+        + signature
+        + market_account
+        + struct.pack(">B", len(market))
+        + market
+    )
+
+
+class TestSignatureEvent:
+    def test_from_bytes_when_json(self) -> None:
+        signature_dict = {
+            "blockchain_id": 65536,
+            "market": "MagicEden",
+            "market_address": 65793,
+            "market_account": SOLANA_ACCOUNT,
+            "signature": SOLANA_SIGNATURE,
+            "timestamp": 1645939150000000000,
+        }
+
+        signature_event = SignatureEvent.from_bytes(json.dumps(signature_dict).encode())
+
+        assert signature_event == SignatureEvent.from_dict(signature_dict)
+
+    def test_from_bytes_when_binary_solana(self) -> None:
+        signature = base58.b58decode(SOLANA_SIGNATURE)
+        market_account = base58.b58decode(SOLANA_ACCOUNT)
+        data = binary_record(
+            65536,
+            65793,
+            1645939150000000000,
+            bytes([1, len(signature)]) + signature,
+            bytes([1, len(market_account)]) + market_account,
+            b"MagicEden",
+        )
+
+        signature_event = SignatureEvent.from_bytes(data)
+
+        assert len(signature) == 64
+        assert signature_event == SignatureEvent(
+            blockchain_id=65536,
+            market="MagicEden",
+            market_address=65793,
+            market_account=SOLANA_ACCOUNT,
+            signature=SOLANA_SIGNATURE,
+            timestamp=1645939150000000000,
+        )
+
+    def test_from_bytes_when_binary_ethereum(self) -> None:
+        signature = bytes.fromhex(ETHEREUM_HASH[2:])
+        data = binary_record(
+            196608,
+            196865,
+            1645939150000000000,
+            bytes([2, len(signature)]) + signature,
+            bytes([0, len(ETHEREUM_ACCOUNT)]) + ETHEREUM_ACCOUNT.encode(),
+            b"OpenSea",
+        )
+
+        signature_event = SignatureEvent.from_bytes(data)
+
+        assert signature_event.signature == ETHEREUM_HASH
+        assert signature_event.market_account == ETHEREUM_ACCOUNT
+        assert signature_event.market == "OpenSea"
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            binary_record(65536, 65793, 0, b"\x00\x00", b"\x00\x00", b"", version=9),
+            binary_record(65536, 65793, 0, b"\x01\x40abc", b"", b""),
+            b"\x01\x00",
+        ],
+    )
+    def test_from_bytes_when_malformed(self, data: bytes) -> None:
+        with pytest.raises(ValueError):
+            SignatureEvent.from_bytes(data)
+
+
+class TestSolanaTransaction:
+    def test_from_dict_decodes_instructions_lazily(self) -> None:
+        transaction = SolanaTransaction.from_dict(
+            {
+                "slot": 122667014,
+                "blockTime": 1645939150,
+                "meta": {
+                    "fee": 5000,
+                    "postTokenBalances": [],
+                    "innerInstructions": [
+                        {
+                            "index": 1,
+                            "instructions": [
+                                {"accounts": [0], "data": "Ldp", "programIdIndex": 2}
+                            ],
+                        }
+                    ],
+                },
+                "transaction": {
+                    "signatures": [SOLANA_SIGNATURE],
+                    "message": {
+                        "accountKeys": ["owner", "token", "program", SOLANA_ACCOUNT],
+                        "instructions": [
+                            # Not valid base58, never decoded.
+                            {"accounts": [0], "data": "0OIl", "programIdIndex": 2},
+                            {"accounts": [0, 1], "data": "Ldp", "programIdIndex": 3},
+                        ],
+                    },
+                },
+            }
+        )
+
+        instruction = transaction.find_instruction(SOLANA_ACCOUNT, offset=0x01)
+
+        assert transaction.signature == SOLANA_SIGNATURE
+        assert transaction.fee == 5000
+        assert instruction.index == 1
+        assert instruction.accounts == ["owner", "token"]
+        assert instruction.get_int(1) == 0x0302
+        assert transaction.find_inner_instructions(instruction).instructions[
+            0
+        ].accounts == ["owner"]
+
+
+class TestEthereumTransaction:
+    def test_from_rpc(self) -> None:
+        transaction = {
+            "hash": ETHEREUM_HASH,
+            "blockNumber": "0xb94475",
+            "input": "0x75c1631d000000000000000000000000000000000000000000000000000000000000000f",
+            "value": "0x5a34a38fc00a0000",
+        }
+        receipt = {
+            "transactionHash": ETHEREUM_HASH,
+            "blockNumber": "0xb94475",
+            "from": "0x9a3e204bd2f012122b228fa68bf97539da965d3b",
+            "logs": [
+                {
+                    "address": ETHEREUM_ACCOUNT.lower(),
+                    "data": "0x5a34a38fc00a0000",
+                    "topics": [
+                        "0x000000000000000000000000000000000000000000000000000000000000000f"
+                    ],
+                }
+            ],
+        }
+
+        ethereum_transaction = EthereumTransaction.from_rpc(
+            transaction, receipt, 1617122248
+        )
+
+        assert ethereum_transaction.signature.hex() == ETHEREUM_HASH
+        assert ethereum_transaction.block_number == 12141685
+        assert ethereum_transaction.block_time == 1617122248
+        assert ethereum_transaction.value == 6500000000000000000
+        assert (
+            ethereum_transaction.receipt_from
+            == "0x9A3e204bd2f012122B228FA68Bf97539dA965D3b"
+        )
+        assert ethereum_transaction.logs[0]["address"] == ETHEREUM_ACCOUNT
+        assert isinstance(ethereum_transaction.logs[0]["topics"][-1], HexBytes)
+        assert int(ethereum_transaction.logs[0]["topics"][-1].hex(), 16) == 15
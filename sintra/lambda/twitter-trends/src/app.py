@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import os
@@ -7,9 +8,10 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List
 
 import requests
+from shared.kinesis import KinesisProducer
+from shared.partition import Partitioner
 from src.config import settings
 from src.model import Project, TwitterTrend
-from src.producer import KinesisProducer
 from src.utils import count_endpoint, followers_endpoint, headers, projects_endpoint
 
 logger = logging.getLogger(__name__)
@@ -21,6 +23,13 @@ if len(logging.getLogger().handlers) > 0:
 else:
     logging.basicConfig(level=logging.INFO)
 
+# Created once per execution environment, so explicit hash keys keep cycling
+# through the shards across invocations instead of restarting with every batch.
+partitioner = Partitioner(
+    settings.kinesis.partition.strategy,
+    settings.kinesis.partition.key,
+)
+
 
 def lambda_handler(event, context):
     logger.info(
@@ -86,7 +95,13 @@ def lambda_handler(event, context):
     )
 
     if len(trend_list) > 0:
-        kinesis.produce_records(settings.kinesis.stream_name, trend_list)
+        asyncio.run(
+            kinesis.produce_records(
+                settings.kinesis.stream_name,
+                trend_list,
+                partitioner=partitioner,
+            )
+        )
         return {
             "message": f"Successfully processed twitter data for batch of projects: {len(twitter_trends)}."
         }
@@ -0,0 +1,284 @@
+"""Throughput benchmark of the ingestion worker against replayed RPC traffic.
+
+Recorded (or synthetic) subscription frames are replayed by a local websocket
+stand-in running in a separate process, the worker publishes signatures to
+an in-process moto Kinesis stream or to localstack. Reported are sustained
+signatures per second, receive to publish latency and peak memory of the
+worker process. With `--min-rate` or `--max-p99` the command exits with
+status 1 if the worker falls short, so it can gate ingest changes.
+
+Usage:
+    python -m sintra.loadtest.benchmark solana --rate 2000 --duration 30
+    python -m sintra.loadtest.benchmark ethereum --frames frames.jsonl \
+        --burst-rate 10000 --burst-seconds 1 --burst-every 10
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+from dataclasses import dataclass
+from time import monotonic, time_ns
+from typing import Any, Dict, List, Optional
+
+import boto3
+
+from sintra.blockchain.utils import (
+    BlockchainName,
+    get_blockchain_id,
+    market_name_map,
+    market_program_id_map,
+)
+from sintra.config import settings
+from sintra.loadtest.replay import (
+    ReplayRate,
+    ReplayServer,
+    read_frames,
+    synthetic_frames,
+)
+from sintra.worker import (
+    EthereumTransactionWorker,
+    SolanaTransactionWorker,
+    TransactionWorker,
+)
+
+logger = logging.getLogger(__name__)
+
+# Unused HTTP endpoint, backfill is never triggered without checkpoints.
+_HTTP_ENDPOINT = "http://127.0.0.1:9"
+
+
+@dataclass
+class BenchmarkResult:
+    sent: int
+    published: int
+    seconds: float
+    latencies: List[float]
+    peak_memory: float
+
+    @property
+    def rate(self) -> float:
+        return self.published / self.seconds if self.seconds else 0
+
+    def latency(self, quantile: float) -> float:
+        """Receive to publish latency quantile in milliseconds."""
+        if not self.latencies:
+            return 0
+        latencies = sorted(self.latencies)
+        return latencies[int(quantile * (len(latencies) - 1))]
+
+    def report(self) -> str:
+        return "\n".join(
+            [
+                f"Frames replayed: {self.sent}",
+                f"Signatures published: {self.published}",
+                f"Sustained rate: {self.rate:.0f} signatures/s",
+                f"Latency p50: {self.latency(0.5):.1f} ms",
+                f"Latency p99: {self.latency(0.99):.1f} ms",
+                f"Peak memory: {self.peak_memory:.1f} MiB",
+            ]
+        )
+
+
+def _serve_replay(
+    chain: str,
+    frames_path: Optional[str],
+    accounts: List[str],
+    rate: ReplayRate,
+    channel: Any,
+) -> None:
+    """Run replay server until terminated, reporting its port and then the
+    number of replayed frames over the channel."""
+
+    async def serve() -> None:
+        if frames_path is not None:
+            frames = read_frames(frames_path)
+        else:
+            frames = synthetic_frames(chain, accounts, 10000)
+
+        server = ReplayServer(chain, frames, rate)
+        websocket_server = await server.serve()
+        channel.send(websocket_server.port)
+        await server.finished.wait()
+        channel.send(server.sent)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def _build_worker(chain: str, ws_endpoint: str, stream_name: str) -> TransactionWorker:
+    if chain == BlockchainName.ETHEREUM:
+        return EthereumTransactionWorker(
+            [_HTTP_ENDPOINT],
+            settings.blockchain.ethereum.http.timeout,
+            [ws_endpoint],
+            settings.blockchain.ethereum.ws.timeout,
+            stream_name,
+        )
+    return SolanaTransactionWorker(
+        [_HTTP_ENDPOINT],
+        settings.blockchain.solana.http.timeout,
+        [ws_endpoint],
+        settings.blockchain.solana.ws.timeout,
+        stream_name,
+    )
+
+
+def _create_stream(stream_name: str, shards: int) -> None:
+    client = boto3.client(
+        "kinesis",
+        region_name=settings.localstack.region,
+        endpoint_url=settings.localstack.endpoint,
+    )
+    try:
+        client.create_stream(StreamName=stream_name, ShardCount=shards)
+    except client.exceptions.ResourceInUseException:
+        return
+    client.get_waiter("stream_exists").wait(StreamName=stream_name)
+
+
+async def run_benchmark(
+    chain: str,
+    frames_path: Optional[str],
+    rate: ReplayRate,
+    stream_name: str,
+    drain_timeout: float,
+) -> BenchmarkResult:
+    """Replay frames to a worker and measure what it publishes.
+
+    Args:
+        chain (str): "solana" or "ethereum".
+        frames_path (Optional[str]): JSON lines file of recorded frames,
+            synthetic frames are replayed if not given.
+        rate (ReplayRate): Replay rate.
+        stream_name (str): Kinesis stream to publish to.
+        drain_timeout (float): Seconds to wait for the worker to publish
+            the rest of the signatures after the replay has finished.
+
+    Returns:
+        BenchmarkResult: Measured throughput, latency and memory.
+
+    """
+    loop = asyncio.get_event_loop()
+    account_address_map: Dict[str, int] = market_program_id_map(chain)
+    channel, server_channel = multiprocessing.Pipe()
+    server = multiprocessing.get_context("spawn").Process(
+        target=_serve_replay,
+        args=(chain, frames_path, list(account_address_map), rate, server_channel),
+        daemon=True,
+    )
+    server.start()
+
+    latencies: List[float] = []
+    published: List[float] = []
+    try:
+        port = await loop.run_in_executor(None, channel.recv)
+        worker = _build_worker(chain, f"ws://127.0.0.1:{port}", stream_name)
+        produce_records = worker.kinesis.produce_records
+
+        def timed_produce_records(
+            stream: str, records: List[Any], *args: Any, **kwargs: Any
+        ) -> None:
+            produce_records(stream, records, *args, **kwargs)
+            now = time_ns()
+            latencies.extend((now - record.timestamp) / 1e6 for record in records)
+            published.extend([monotonic()] * len(records))
+
+        worker.kinesis.produce_records = timed_produce_records
+        listener = asyncio.ensure_future(
+            worker.listen_for_transactions(
+                get_blockchain_id(chain), account_address_map, market_name_map(chain)
+            )
+        )
+
+        sent = await loop.run_in_executor(None, channel.recv)
+        deadline = monotonic() + drain_timeout
+        while len(published) < sent and monotonic() < deadline and not listener.done():
+            await asyncio.sleep(0.1)
+
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+    finally:
+        server.terminate()
+
+    return BenchmarkResult(
+        sent=sent,
+        published=len(published),
+        seconds=published[-1] - published[0] if len(published) > 1 else 0,
+        latencies=latencies,
+        peak_memory=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "chain", choices=[BlockchainName.SOLANA, BlockchainName.ETHEREUM]
+    )
+    parser.add_argument("--frames", help="JSON lines file of recorded frames.")
+    parser.add_argument("--rate", type=float, default=1000, help="Frames per second.")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds.")
+    parser.add_argument("--burst-rate", type=float, default=0)
+    parser.add_argument("--burst-seconds", type=float, default=1)
+    parser.add_argument("--burst-every", type=float, default=10)
+    parser.add_argument("--sink", choices=["moto", "localstack"], default="moto")
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--drain-timeout", type=float, default=30)
+    parser.add_argument("--min-rate", type=float, help="Fail below signatures/s.")
+    parser.add_argument("--max-p99", type=float, help="Fail above p99 latency (ms).")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(args.log_level)
+    settings.set("WORKER.METRICS.ENABLED", False)
+    settings.set("KINESIS.SPILL.PATH", tempfile.mkdtemp(prefix="sintra-spill-"))
+    # Credentials are resolved from AWS secrets manager if not set.
+    for env_name in (
+        SolanaTransactionWorker.env_variables + EthereumTransactionWorker.env_variables
+    ):
+        os.environ.setdefault(env_name, "")
+
+    mock = None
+    if args.sink == "moto":
+        from moto import mock_kinesis  # pylint: disable=import-outside-toplevel
+
+        for env_name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+            os.environ.setdefault(env_name, "testing")
+        settings.set("LOCALSTACK.ACTIVE", "true")
+        settings.set("LOCALSTACK.ENDPOINT", None)
+        mock = mock_kinesis()
+        mock.start()
+
+    try:
+        _create_stream(settings.kinesis.stream_name, args.shards)
+        result = asyncio.run(
+            run_benchmark(
+                args.chain,
+                args.frames,
+                ReplayRate(
+                    args.rate,
+                    args.duration,
+                    args.burst_rate,
+                    args.burst_seconds,
+                    args.burst_every,
+                ),
+                settings.kinesis.stream_name,
+                args.drain_timeout,
+            )
+        )
+    finally:
+        if mock is not None:
+            mock.stop()
+
+    print(result.report())
+    failed = (args.min_rate is not None and result.rate < args.min_rate) or (
+        args.max_p99 is not None and result.latency(0.99) > args.max_p99
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Local websocket stand-in for Solana and Ethereum RPC subscriptions.
+
+Recorded frames are JSON lines of `logsNotification` or `eth_subscription`
+messages exactly as received from a provider. They are replayed to every
+subscribed client at a configured rate, with subscription ids rewritten to
+the ones handed out by this server. Frames are replayed in a loop, with
+fresh signatures after the first pass, so that the worker doesn't drop
+them as duplicates.
+"""
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Dict, Iterator, List, Optional
+
+import websockets
+from based58 import b58encode
+from websockets.server import WebSocketServerProtocol
+
+logger = logging.getLogger(__name__)
+
+SOLANA_NOTIFICATION = "logsNotification"
+ETHEREUM_NOTIFICATION = "eth_subscription"
+
+# Frames are sent in ticks, rate is kept over the whole replay.
+_TICK = 0.01
+
+
+@dataclass
+class ReplayRate:
+    """Replay rate in frames per second, with optional periodic bursts.
+
+    Every `burst_every` seconds, frames are sent at `burst_rate` for
+    `burst_seconds` seconds instead of `rate`.
+    """
+
+    rate: float
+    duration: float
+    burst_rate: float = 0
+    burst_seconds: float = 0
+    burst_every: float = 0
+
+    def at(self, elapsed: float) -> float:
+        if self.burst_rate and self.burst_every:
+            if elapsed % self.burst_every < self.burst_seconds:
+                return self.burst_rate
+        return self.rate
+
+
+def read_frames(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as frames_file:
+        return [json.loads(line) for line in frames_file if line.strip()]
+
+
+def fresh_signature(chain: str) -> str:
+    if chain == "ethereum":
+        return "0x" + os.urandom(32).hex()
+    return b58encode(os.urandom(64)).decode()
+
+
+def synthetic_frames(
+    chain: str, accounts: List[str], size: int
+) -> List[Dict[str, Any]]:
+    """Generate notification frames mentioning the accounts in turn.
+
+    Args:
+        chain (str): "solana" or "ethereum".
+        accounts (List[str]): Market accounts the worker subscribes to.
+        size (int): Number of frames.
+
+    Returns:
+        List[Dict[str, Any]]: Notification frames.
+
+    """
+    frames: List[Dict[str, Any]] = []
+    for index in range(size):
+        if chain == "ethereum":
+            result: Dict[str, Any] = {
+                "address": accounts[index % len(accounts)],
+                "topics": [],
+                "data": "0x",
+                "blockNumber": hex(15_000_000 + index // 100),
+                "transactionHash": fresh_signature(chain),
+                "transactionIndex": hex(index % 100),
+                "blockHash": "0x" + os.urandom(32).hex(),
+                "logIndex": "0x0",
+                "removed": False,
+            }
+            frames.append(
+                {
+                    "jsonrpc": "2.0",
+                    "method": ETHEREUM_NOTIFICATION,
+                    "params": {"subscription": "0x0", "result": result},
+                }
+            )
+        else:
+            frames.append(
+                {
+                    "jsonrpc": "2.0",
+                    "method": SOLANA_NOTIFICATION,
+                    "params": {
+                        "result": {
+                            "context": {"slot": 150_000_000 + index // 100},
+                            "value": {
+                                "signature": fresh_signature(chain),
+                                "err": None,
+                                "logs": [],
+                            },
+                        },
+                        # Recorded subscriptions are mapped onto live ones.
+                        "subscription": index % len(accounts),
+                    },
+                }
+            )
+    return frames
+
+
+class ReplayServer:
+    """Websocket server answering `logsSubscribe` and `eth_subscribe`
+    requests and replaying frames to subscribed clients.
+
+    Attributes:
+        sent (int): Frames sent to the first client.
+        finished (asyncio.Event): Set once the first client got all frames
+            of the replay.
+    """
+
+    def __init__(
+        self, chain: str, frames: List[Dict[str, Any]], rate: ReplayRate
+    ) -> None:
+        if not frames:
+            raise ValueError("There are no frames to replay.")
+
+        self.chain = chain
+        self.frames = frames
+        self.rate = rate
+        self.sent = 0
+        self.finished = asyncio.Event()
+        self._subscription_ids = count(1)
+        self._replaying = False
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0) -> Any:
+        """Start server, port 0 picks a free port.
+
+        Returns:
+            Any: Websocket server, its `port` attribute is the bound port.
+
+        """
+        server = await websockets.serve(self._handle, host, port, max_size=None)
+        server.port = server.sockets[0].getsockname()[1]
+        logger.info(f"Replaying {len(self.frames)} frames on port {server.port}.")
+        return server
+
+    async def _handle(self, websocket: WebSocketServerProtocol, *_: Any) -> None:
+        subscriptions: List[Any] = []
+        replay: Optional[asyncio.Task] = None
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                requests = request if isinstance(request, list) else [request]
+                for request in requests:
+                    method = request.get("method", "")
+                    if method in ("logsSubscribe", "eth_subscribe"):
+                        subscription_id: Any = next(self._subscription_ids)
+                        if method == "eth_subscribe":
+                            subscription_id = hex(subscription_id)
+                        subscriptions.append(subscription_id)
+                        result: Any = subscription_id
+                    else:
+                        result = True
+
+                    await websocket.send(
+                        json.dumps(
+                            {"jsonrpc": "2.0", "result": result, "id": request["id"]}
+                        )
+                    )
+
+                if subscriptions and replay is None:
+                    replay = asyncio.ensure_future(
+                        self._replay(websocket, subscriptions)
+                    )
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            if replay is not None:
+                replay.cancel()
+
+    async def _replay(
+        self, websocket: WebSocketServerProtocol, subscriptions: List[Any]
+    ) -> None:
+        first_client = not self._replaying
+        self._replaying = True
+        loop = asyncio.get_event_loop()
+        started_at = loop.time()
+        previous, credit = 0.0, 0.0
+        frames = self._frames()
+
+        while True:
+            elapsed = loop.time() - started_at
+            if elapsed >= self.rate.duration:
+                break
+
+            credit += self.rate.at(elapsed) * (elapsed - previous)
+            previous = elapsed
+            for _ in range(int(credit)):
+                await websocket.send(
+                    json.dumps(self._live_frame(next(frames), subscriptions))
+                )
+                if first_client:
+                    self.sent += 1
+            credit -= int(credit)
+
+            # Frames owed for a late tick are caught up on the next one.
+            await asyncio.sleep(max(started_at + elapsed + _TICK - loop.time(), 0))
+
+        if first_client:
+            logger.info(f"Replayed {self.sent} frames in {self.rate.duration} seconds.")
+            self.finished.set()
+
+    def _frames(self) -> Iterator[Dict[str, Any]]:
+        yield from self.frames
+        while True:
+            for frame in self.frames:
+                result = dict(frame["params"]["result"])
+                if frame["method"] == ETHEREUM_NOTIFICATION:
+                    result["transactionHash"] = fresh_signature(self.chain)
+                else:
+                    result["value"] = dict(
+                        result["value"], signature=fresh_signature(self.chain)
+                    )
+                yield dict(frame, params=dict(frame["params"], result=result))
+
+    def _live_frame(
+        self, frame: Dict[str, Any], subscriptions: List[Any]
+    ) -> Dict[str, Any]:
+        """Return frame with recorded subscription id mapped onto a live one."""
+        recorded = frame["params"]["subscription"]
+        if isinstance(recorded, str):
+            recorded = int(recorded, 16) if recorded.startswith("0x") else 0
+        subscription = subscriptions[recorded % len(subscriptions)]
+        return dict(frame, params=dict(frame["params"], subscription=subscription))
@@ -0,0 +1,9 @@
+#!/bin/bash
+# Executed by localstack once it is ready. Creates the DynamoDB table the
+# worker keeps its checkpoints in (CHECKPOINT.TABLE_NAME).
+awslocal dynamodb create-table \
+    --table-name worker-checkpoints \
+    --attribute-definitions AttributeName=market_account,AttributeType=S \
+    --key-schema AttributeName=market_account,KeyType=HASH \
+    --billing-mode PAY_PER_REQUEST \
+    --region eu-central-1
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from bisect import bisect_left
+from time import time_ns
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sintra.kinesis.record import KinesisRecord
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of receive to acknowledgement latency buckets, in seconds.
+ACK_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        bounds = [str(bucket) for bucket in self.buckets] + ["+Inf"]
+        cumulative, total = [], 0
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+
+class WorkerMetrics:
+    """Ingest metrics of a worker, exposed in Prometheus text format.
+
+    Per-market series are created upfront from the market name map, so
+    recording on the hot path is a dictionary lookup and an increment.
+    Registered metrics are read only when metrics are scraped.
+    """
+
+    def __init__(self, address_name_map: Dict[int, str]) -> None:
+        self.market_names = address_name_map
+        self.signatures: Dict[int, int] = dict.fromkeys(address_name_map, 0)
+        self.duplicates: Dict[int, int] = dict.fromkeys(address_name_map, 0)
+        self.ack_latency: Dict[int, Histogram] = {
+            market_address: Histogram(ACK_LATENCY_BUCKETS)
+            for market_address in address_name_map
+        }
+        self.collected: Dict[str, Tuple[str, str, Callable[[], float]]] = {}
+
+    def register(
+        self,
+        name: str,
+        description: str,
+        value: Callable[[], float],
+        metric_type: str = "gauge",
+    ) -> None:
+        """Register metric whose value is read when metrics are scraped."""
+        self.collected[name] = (description, metric_type, value)
+
+    def observe_acknowledged(self, records: List[KinesisRecord]) -> None:
+        """Count signatures published to Kinesis and record delay between
+        receiving them and Kinesis acknowledging them.
+
+        Args:
+            records (List[KinesisRecord]): Records acknowledged by Kinesis.
+
+        """
+        now = time_ns()
+        for record in records:
+            self.signatures[record.market_address] += 1
+            self.ack_latency[record.market_address].observe(
+                (now - record.timestamp) / 1e9
+            )
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def counter(name: str, description: str, values: Dict[int, int]) -> None:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            for market_address, value in values.items():
+                lines.append(
+                    f'{name}{{market="{self.market_names[market_address]}"}} {value}'
+                )
+
+        counter(
+            "sintra_worker_signatures_total",
+            "Transaction signatures published to Kinesis.",
+            self.signatures,
+        )
+        counter(
+            "sintra_worker_duplicates_dropped_total",
+            "Duplicate transaction signatures dropped.",
+            self.duplicates,
+        )
+
+        name = "sintra_worker_ack_latency_seconds"
+        lines.append(f"# HELP {name} Delay from receiving a signature to Kinesis ack.")
+        lines.append(f"# TYPE {name} histogram")
+        for market_address, histogram in self.ack_latency.items():
+            market = self.market_names[market_address]
+            for bound, count in histogram.cumulative_counts():
+                lines.append(f'{name}_bucket{{market="{market}",le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{market="{market}"}} {histogram.sum}')
+            lines.append(f'{name}_count{{market="{market}"}} {histogram.count}')
+
+        for name, (description, metric_type, value) in self.collected.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {value()}")
+
+        return "\n".join(lines) + "\n"
+
+    async def serve(self, port: int) -> Optional[asyncio.AbstractServer]:
+        """Serve metrics over HTTP on every path of the port.
+
+        Args:
+            port (int): Port to listen on.
+
+        Returns:
+            Optional[asyncio.AbstractServer]: Metrics server, None if it
+                couldn't be started.
+
+        """
+        try:
+            server = await asyncio.start_server(self._handle, port=port)
+        except OSError as error:
+            logger.error(f"Can't start metrics server on port {port}.")
+            logger.error(error)
+            return None
+
+        logger.info(f"Serving metrics on port {port}.")
+        return server
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            # Request is not inspected, only read until the end of headers.
+            await reader.readuntil(b"\r\n\r\n")
+            body = self.render().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4\r\n"
+                + f"Content-Length: {len(body)}\r\n".encode()
+                + b"Connection: close\r\n\r\n"
+                + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+            pass
+        finally:
+            writer.close()
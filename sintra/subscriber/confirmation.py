@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from time import monotonic
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import httpx
+from solana.rpc.commitment import COMMITMENT_RANKS, Commitment
+
+from sintra.exception import ClientRPCConnectionException
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of signatures accepted by `getSignatureStatuses`.
+MAX_SIGNATURE_STATUSES = 256
+
+
+class SignatureConfirmation:
+    """Holds streamed transactions back until their signatures reach the
+    target commitment, so that they can be fetched right away downstream.
+
+    Transactions are released as soon as they are confirmed, in arrival
+    order among those confirmed by the same poll, so a transaction that
+    isn't confirmed yet doesn't hold back later ones. A transaction that
+    doesn't reach the commitment within `timeout` seconds (e.g. it landed on
+    an abandoned fork) is dropped. Checkpoints only advance over signatures
+    that were released or dropped, so a restart resumes before the oldest
+    pending one.
+    """
+
+    def __init__(
+        self,
+        get_signature_statuses: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+        commitment: Commitment,
+        poll_interval: float = 0.4,
+        timeout: float = 30,
+    ) -> None:
+        self.get_signature_statuses = get_signature_statuses
+        self.commitment = commitment
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    async def confirm(
+        self,
+        transactions: AsyncGenerator[Tuple[str, str, int], None],
+        checkpoints: Optional[Dict[str, str]] = None,
+    ) -> AsyncGenerator[Tuple[str, str, int], None]:
+        """Yield transactions once they are confirmed.
+
+        Args:
+            transactions (AsyncGenerator[Tuple[str, str, int], None]): Market
+                account, transaction signature and receive timestamp.
+            checkpoints (Optional[Dict[str, str]]): Set to the newest signature
+                of each account up to which every received signature has been
+                released or dropped.
+
+        Yields:
+            Tuple[str, str, int]: Confirmed transactions.
+
+        """
+        if checkpoints is None:
+            checkpoints = {}
+        pending: "OrderedDict[str, Tuple[Tuple[str, str, int], float]]" = OrderedDict()
+        # Signatures of every account in arrival order, flagged once resolved.
+        arrivals: Dict[str, "OrderedDict[str, bool]"] = {}
+
+        async def receive() -> None:
+            async for transaction in transactions:
+                account, signature, _ = transaction
+                if signature not in pending:
+                    pending[signature] = (transaction, monotonic())
+                    arrivals.setdefault(account, OrderedDict())[signature] = False
+
+        receiver = asyncio.ensure_future(receive())
+        try:
+            while True:
+                await asyncio.sleep(self.poll_interval)
+                if receiver.done():
+                    # Propagate connection failure, held transactions are
+                    # recovered by backfill on reconnect.
+                    receiver.result()
+                    return
+
+                if not pending:
+                    continue
+
+                try:
+                    confirmed = await self._confirmed(list(pending))
+                except (ClientRPCConnectionException, httpx.HTTPError) as error:
+                    logger.error("Fetching signature statuses has failed.")
+                    logger.error(error)
+                    continue
+
+                now = monotonic()
+                for signature, (transaction, received_at) in list(pending.items()):
+                    if signature in confirmed:
+                        del pending[signature]
+                        yield transaction
+                    elif now - received_at > self.timeout:
+                        del pending[signature]
+                        logger.warning(
+                            f"Signature {signature} not {self.commitment} "
+                            f"after {self.timeout}s, dropping."
+                        )
+                    else:
+                        continue
+
+                    account = transaction[0]
+                    arrivals[account][signature] = True
+                    self._advance_checkpoint(account, arrivals[account], checkpoints)
+        finally:
+            receiver.cancel()
+            await asyncio.gather(receiver, return_exceptions=True)
+            await transactions.aclose()
+
+    @staticmethod
+    def _advance_checkpoint(
+        account: str, signatures: "OrderedDict[str, bool]", checkpoints: Dict[str, str]
+    ) -> None:
+        # Move past the resolved signatures received before the oldest pending one.
+        while signatures:
+            signature, resolved = next(iter(signatures.items()))
+            if not resolved:
+                break
+            signatures.popitem(last=False)
+            checkpoints[account] = signature
+
+    async def _confirmed(self, signatures: List[str]) -> Set[str]:
+        target_rank = COMMITMENT_RANKS[self.commitment]
+        confirmed: Set[str] = set()
+        for offset in range(0, len(signatures), MAX_SIGNATURE_STATUSES):
+            chunk = signatures[offset : offset + MAX_SIGNATURE_STATUSES]
+            rpc_response = await self.get_signature_statuses(chunk)
+            for signature, status in zip(chunk, rpc_response["result"]["value"]):
+                if status is None or status.get("confirmationStatus") is None:
+                    continue
+                if COMMITMENT_RANKS[status["confirmationStatus"]] >= target_rank:
+                    confirmed.add(signature)
+
+        return confirmed
@@ -0,0 +1,125 @@
+import logging
+from dataclasses import dataclass
+from time import monotonic
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EndpointStats:
+    url: str
+    latency: Optional[float] = None
+    requests: int = 0
+    errors: int = 0
+    unhealthy_until: float = 0
+    arrivals: int = 0
+    first_arrivals: int = 0
+    arrival_lag: float = 0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0
+
+    @property
+    def host(self) -> str:
+        url = urlparse(self.url)
+        return f"{url.hostname}:{url.port}" if url.port else url.hostname or ""
+
+    def is_healthy(self, now: float) -> bool:
+        return self.unhealthy_until <= now
+
+
+class EndpointPool:
+    """RPC endpoints of a single kind (HTTP or websocket) ranked by health
+    and latency.
+
+    A failing endpoint is skipped for `cooldown` seconds. Healthy endpoints
+    are ordered by exponentially smoothed latency, endpoints without any
+    measurement first so that every endpoint gets measured.
+    """
+
+    def __init__(
+        self, urls: List[str], cooldown: float = 30, smoothing: float = 0.2
+    ) -> None:
+        if not urls:
+            raise ValueError("At least one endpoint has to be specified.")
+
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self.endpoints: Dict[str, EndpointStats] = {
+            url: EndpointStats(url) for url in urls
+        }
+
+    def ranked(self) -> List[str]:
+        """Return endpoints in the order they should be tried in.
+
+        Returns:
+            List[str]: Healthy endpoints from fastest to slowest, followed by
+                unhealthy endpoints from the one recovering soonest.
+
+        """
+        now = monotonic()
+        healthy = [stats for stats in self.endpoints.values() if stats.is_healthy(now)]
+        unhealthy = [
+            stats for stats in self.endpoints.values() if not stats.is_healthy(now)
+        ]
+        healthy.sort(key=lambda stats: stats.latency or 0)
+        unhealthy.sort(key=lambda stats: stats.unhealthy_until)
+        return [stats.url for stats in healthy + unhealthy]
+
+    def select(self) -> str:
+        return self.ranked()[0]
+
+    def record_success(self, url: str, latency: float) -> None:
+        stats = self.endpoints[url]
+        stats.requests += 1
+        stats.unhealthy_until = 0
+        if stats.latency is None:
+            stats.latency = latency
+        else:
+            stats.latency += self.smoothing * (latency - stats.latency)
+
+    def record_arrival(self, url: str, lag: float) -> None:
+        """Record transaction arrival on a websocket endpoint.
+
+        Args:
+            url (str): Endpoint the transaction arrived on.
+            lag (float): Seconds elapsed since the transaction arrived on the
+                fastest endpoint, 0 if this endpoint was the fastest one.
+
+        """
+        stats = self.endpoints[url]
+        stats.arrivals += 1
+        if lag == 0:
+            stats.first_arrivals += 1
+        stats.arrival_lag += self.smoothing * (lag - stats.arrival_lag)
+
+    def arrival_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return arrival statistics of endpoints transactions arrived on.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Share of first arrivals and smoothed
+                arrival lag in seconds mapped by endpoint host.
+
+        """
+        return {
+            stats.host: {
+                "first_arrival_ratio": stats.first_arrivals / stats.arrivals,
+                "arrival_lag": stats.arrival_lag,
+            }
+            for stats in self.endpoints.values()
+            if stats.arrivals
+        }
+
+    def record_failure(self, url: str) -> None:
+        stats = self.endpoints[url]
+        stats.requests += 1
+        stats.errors += 1
+        stats.unhealthy_until = monotonic() + self.cooldown
+
+        logger.warning(
+            f"Endpoint {stats.host} marked unhealthy for {self.cooldown}s. "
+            f"Error rate: {stats.error_rate:.2%}."
+        )
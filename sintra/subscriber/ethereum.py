@@ -1,91 +1,457 @@
 import asyncio
 import json
 import logging
-from time import time_ns
-from typing import AsyncGenerator, List, Optional, Tuple
+from time import monotonic, time_ns
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple
 
+import httpx
+from strenum import StrEnum
 from websockets import connect
 from websockets.client import WebSocketClientProtocol
+from websockets.exceptions import ConnectionClosed
 
+from sintra.exception import (
+    ClientRPCConnectionClosedException,
+    ClientRPCConnectionException,
+)
+from sintra.subscriber.endpoint import EndpointPool
+from sintra.subscriber.redundancy import RedundantSubscription, listen_on_endpoint
 from sintra.utils import get_env_variable
 
 logger = logging.getLogger(__name__)
 
 
+class SubscriptionMode(StrEnum):
+    LOGS = "logs"
+    BLOCKS = "blocks"
+
+
 class EthereumRPCClient:
     def __init__(
         self,
-        http_endpoint: str,
+        http_endpoints: List[str],
         http_timeout: float,
-        ws_endpoint: str,
+        ws_endpoints: List[str],
         ws_timeout: int,
+        backfill_block_range: int = 2000,
+        endpoint_cooldown: float = 30,
+        redundancy: int = 1,
+        mode: str = SubscriptionMode.LOGS,
+        account_topics: Optional[Dict[str, List[str]]] = None,
     ) -> None:
+        if mode not in list(SubscriptionMode):
+            raise ValueError(f"Unknown subscription mode: {mode}.")
 
         self.http_username = get_env_variable("ETHEREUM_RPC_HTTP_USERNAME")
         self.http_password = get_env_variable("ETHEREUM_RPC_HTTP_PASSWORD")
-        self.http_endpoint = http_endpoint
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.http_pool = EndpointPool(http_endpoints, endpoint_cooldown)
         self.http_timeout = http_timeout
 
-        self.ws_client: Optional[WebSocketClientProtocol] = None
+        self.ws_clients: Dict[str, WebSocketClientProtocol] = {}
         self.ws_timeout = ws_timeout
-        self.ws_endpoint = self._auth_ws_endpoint(ws_endpoint)
-        self.last_signature_recv: Optional[str] = None
-        self.subscription_id: Optional[int] = None
+        self.ws_pool = EndpointPool(
+            [self._auth_ws_endpoint(ws_endpoint) for ws_endpoint in ws_endpoints],
+            endpoint_cooldown,
+        )
+        self.redundant_subscription = RedundantSubscription(self.ws_pool, redundancy)
+        self.redundancy = redundancy
+        self.mode = mode
+        self.account_topics = account_topics or {}
+        self.last_block_recv: Dict[str, int] = {}
+        self.subscription_ids: Dict[str, str] = {}
+
+        self.backfill_block_range = backfill_block_range
+
+    async def connect_http_client(self) -> None:
+        kwargs: Dict[str, Any] = {"timeout": httpx.Timeout(self.http_timeout)}
+        if self.http_username and self.http_password:
+            kwargs["auth"] = (self.http_username, self.http_password)
+
+        self.http_client = httpx.AsyncClient(**kwargs)
+        logger.info("HTTP client connected.")
+
+    async def request(self, method: str, params: List[Any]) -> Any:
+        """Call RPC method on the fastest healthy HTTP endpoint, failing over
+        to the next one if the endpoint can't be reached.
+
+        Args:
+            method (str): RPC method name.
+            params (List[Any]): RPC method parameters.
+
+        Returns:
+            Any: Result of RPC call.
+
+        """
+        if self.http_client is None:
+            raise ClientRPCConnectionException("HTTP Client not connected.")
+
+        for http_endpoint in self.http_pool.ranked():
+            started_at = monotonic()
+            try:
+                response = await self.http_client.post(
+                    http_endpoint,
+                    json={
+                        "jsonrpc": "2.0",
+                        "id": 1,
+                        "method": method,
+                        "params": params,
+                    },
+                )
+                response.raise_for_status()
+            except httpx.HTTPError as error:
+                logger.error(f"HTTP request {method} has failed.")
+                logger.error(error)
+                self.http_pool.record_failure(http_endpoint)
+                continue
+
+            self.http_pool.record_success(http_endpoint, monotonic() - started_at)
+            rpc_response = response.json()
+            if "error" in rpc_response:
+                raise ClientRPCConnectionException(rpc_response["error"])
+            return rpc_response["result"]
+
+        raise ClientRPCConnectionException(f"All HTTP endpoints failed on {method}.")
+
+    async def get_logs_until_head(
+        self, accounts: List[str], from_block: int
+    ) -> List[Dict[str, Any]]:
+        """Fetch logs emitted by the accounts from `from_block` up to the
+        latest block.
+
+        Args:
+            accounts (List[str]): Market contract addresses.
+            from_block (int): First block to fetch logs from.
+
+        Returns:
+            List[Dict[str, Any]]: Logs in chain order.
+
+        """
+        head_block = int(await self.request("eth_blockNumber", []), 16)
+        return await self.get_logs(accounts, from_block, head_block)
+
+    async def get_logs(
+        self, accounts: List[str], from_block: int, to_block: int
+    ) -> List[Dict[str, Any]]:
+        """Fetch logs emitted by the accounts within a block range, in chunks
+        of `backfill_block_range` blocks.
+
+        Args:
+            accounts (List[str]): Market contract addresses.
+            from_block (int): First block to fetch logs from.
+            to_block (int): Last block to fetch logs from.
+
+        Returns:
+            List[Dict[str, Any]]: Logs in chain order.
+
+        """
+        logs: List[Dict[str, Any]] = []
+        while from_block <= to_block:
+            chunk_to_block = min(from_block + self.backfill_block_range - 1, to_block)
+            logs.extend(
+                await self.request(
+                    "eth_getLogs",
+                    [
+                        {
+                            "address": accounts,
+                            "topics": self.topics(accounts),
+                            "fromBlock": hex(from_block),
+                            "toBlock": hex(chunk_to_block),
+                        }
+                    ],
+                )
+            )
+            from_block = chunk_to_block + 1
+
+        return logs
+
+    def topics(self, accounts: List[str]) -> List[Any]:
+        """Build topics filter matching logs of any event of interest.
+
+        Topic filters apply to all addresses of a filter, so logs are
+        filtered only if every account has its events configured.
+
+        Args:
+            accounts (List[str]): Market contract addresses.
+
+        Returns:
+            List[Any]: Topics filter, empty if logs aren't filtered.
+
+        """
+        if not all(self.account_topics.get(account) for account in accounts):
+            return []
+
+        event_topics = {
+            topic for account in accounts for topic in self.account_topics[account]
+        }
+        return [sorted(event_topics)]
 
     async def listen_for_transactions(
         self, accounts: List[str]
-    ) -> AsyncGenerator[Tuple[str, int], None]:
-        account: str = accounts[0]
-        async with connect(
-            uri=self.ws_endpoint, ping_timeout=self.ws_timeout
-        ) as websocket:
-            self.ws_client = websocket
-            if self.ws_client is None:
+    ) -> AsyncGenerator[Tuple[str, str, int], None]:
+        """Subscribe to logs emitted by any of the accounts with a single subscription.
+
+        In `logs` mode every matching log is pushed over the websocket. In
+        `blocks` mode only new block headers are pushed, and logs of each new
+        block are pulled with a single `eth_getLogs` call, so every
+        transaction is yielded once, no matter how many logs it emitted.
+
+        The fastest healthy websocket endpoint is used; a failed endpoint is
+        skipped on the next connection, which resumes from the last received
+        blocks. With `redundancy` above 1, the subscription is held on that
+        many providers at once and each transaction is yielded on its first
+        arrival.
+
+        Args:
+            accounts (List[str]): Market contract addresses to subscribe to.
+
+        Yields:
+            Tuple[str, str, int]: Market account, transaction hash and
+                receive timestamp in nanoseconds.
+
+        """
+        if self.redundancy > 1:
+            transactions = self.redundant_subscription.listen(
+                lambda ws_endpoint: self._listen(ws_endpoint, accounts),
+                key=lambda item: item[1],
+            )
+        else:
+            transactions = self._listen_on_best_endpoint(accounts)
+
+        try:
+            async for account, signature, timestamp, block_number in transactions:
+                self.last_block_recv[account] = max(
+                    block_number, self.last_block_recv.get(account, block_number)
+                )
+                yield account, signature, timestamp
+        finally:
+            await transactions.aclose()
+
+    async def _listen_on_best_endpoint(
+        self, accounts: List[str]
+    ) -> AsyncGenerator[Tuple[str, str, int, int], None]:
+        async for _, item in listen_on_endpoint(
+            self.ws_pool,
+            self.ws_pool.select(),
+            lambda ws_endpoint: self._listen(ws_endpoint, accounts),
+        ):
+            yield item
+
+    async def _listen(
+        self, ws_endpoint: str, accounts: List[str]
+    ) -> AsyncGenerator[Tuple[str, str, int, int], None]:
+        account_map: Dict[str, str] = {account.lower(): account for account in accounts}
+        connected_at = monotonic()
+        async with connect(uri=ws_endpoint, ping_timeout=self.ws_timeout) as websocket:
+            if websocket is None:
                 logger.info("Websocket client hasn't been initialized.")
                 return
-            await self.ws_client.send(
-                json.dumps(
-                    {
-                        "id": 1,
-                        "method": "eth_subscribe",
-                        "params": ["logs", {"address": accounts, "topics": []}],
-                    }
+
+            self.ws_clients[ws_endpoint] = websocket
+            # First block whose logs haven't been pulled yet in blocks mode.
+            next_block: Optional[int] = None
+            try:
+                if self.mode == SubscriptionMode.BLOCKS:
+                    params: List[Any] = ["newHeads"]
+                    if self.http_client is None:
+                        await self.connect_http_client()
+                else:
+                    params = [
+                        "logs",
+                        {"address": accounts, "topics": self.topics(accounts)},
+                    ]
+
+                await websocket.send(
+                    json.dumps({"id": 1, "method": "eth_subscribe", "params": params})
                 )
+                logger.info(f"Websocket client subscribed with accounts: {accounts}.")
+                while True:
+                    try:
+                        message = json.loads(
+                            await asyncio.wait_for(
+                                websocket.recv(), timeout=self.ws_timeout
+                            )
+                        )
+                        if "params" not in message:
+                            subscription_id = message["result"]
+                            self.subscription_ids[ws_endpoint] = subscription_id
+                            self.ws_pool.record_success(
+                                ws_endpoint, monotonic() - connected_at
+                            )
+                            logger.info(
+                                f"Subscribe to Ethereum blockchain. Subscription id: {subscription_id}."
+                            )
+                            if self.mode == SubscriptionMode.LOGS:
+                                # Catch up on everything missed while disconnected.
+                                async for item in self._backfill(account_map):
+                                    yield item
+                            continue
+
+                        result = message["params"]["result"]
+                        if self.mode == SubscriptionMode.BLOCKS:
+                            block_number = int(result["number"], 16)
+                            from_block = self._pull_from_block(
+                                account_map, next_block, block_number
+                            )
+                            transactions = await self._pull_blocks(
+                                account_map, from_block, block_number
+                            )
+                            if transactions is None:
+                                # Blocks are pulled again with the next head.
+                                next_block = from_block
+                                continue
+
+                            for item in transactions:
+                                yield item
+                            next_block = block_number + 1
+                            continue
+
+                        account: str = account_map[result["address"].lower()]
+                        signature: str = result["transactionHash"]
+                        timestamp: int = time_ns()
+                        block_number = int(result["blockNumber"], 16)
+                        yield account, signature, timestamp, block_number
+                    except json.JSONDecodeError as error:
+                        logger.error("Decoding Ethereum subscription JSON has failed")
+                        logger.error(error)
+                    except KeyError as error:
+                        logger.error(
+                            "There is no Ethereum transaction hash in received data."
+                        )
+                        logger.error(error)
+                    except asyncio.TimeoutError:
+                        # No logs within the timeout; liveness is checked by pings.
+                        logger.debug("No Ethereum logs received before timeout.")
+                    except ConnectionClosed as error:
+                        logger.error("Websocket client connection closed.")
+                        logger.error(error)
+                        raise ClientRPCConnectionClosedException(error) from error
+            finally:
+                self.ws_clients.pop(ws_endpoint, None)
+                self.subscription_ids.pop(ws_endpoint, None)
+
+    async def _backfill(
+        self, account_map: Dict[str, str]
+    ) -> AsyncGenerator[Tuple[str, str, int, int], None]:
+        from_blocks: Dict[str, int] = {
+            account: self.last_block_recv[account]
+            for account in account_map.values()
+            if account in self.last_block_recv
+        }
+        if not from_blocks:
+            return
+
+        # Last received block is fetched again, since it may have been
+        # only partially processed.
+        from_block = min(from_blocks.values())
+        try:
+            if self.http_client is None:
+                await self.connect_http_client()
+            logs = await self.get_logs_until_head(list(from_blocks), from_block)
+        except (ClientRPCConnectionException, httpx.HTTPError) as error:
+            logger.error("Ethereum backfill has failed.")
+            logger.error(error)
+            return
+
+        transactions = self._group_by_transaction(account_map, logs, from_blocks)
+        logger.info(f"Backfilled {len(transactions)} Ethereum transactions.")
+        for item in transactions:
+            yield item
+
+    def _pull_from_block(
+        self,
+        account_map: Dict[str, str],
+        next_block: Optional[int],
+        block_number: int,
+    ) -> int:
+        """Return first block to pull for the new head.
+
+        Blocks not pulled yet are pulled. On the first head of a connection,
+        pulling starts from the earliest account position so that everything
+        missed while disconnected is caught up; a head that isn't past the
+        previous one (chain reorganization) is pulled again.
+        """
+        if next_block is not None:
+            return min(next_block, block_number)
+
+        from_blocks = [
+            self.last_block_recv[account]
+            for account in account_map.values()
+            if account in self.last_block_recv
+        ]
+        return min(from_blocks) if from_blocks else block_number
+
+    async def _pull_blocks(
+        self,
+        account_map: Dict[str, str],
+        from_block: int,
+        block_number: int,
+    ) -> Optional[List[Tuple[str, str, int, int]]]:
+        """Pull transactions of blocks from `from_block` up to the new head.
+
+        Returns:
+            Optional[List[Tuple[str, str, int, int]]]: Transactions in chain
+                order, None if logs couldn't be pulled.
+
+        """
+        from_blocks: Dict[str, int] = {
+            account: self.last_block_recv[account]
+            for account in account_map.values()
+            if account in self.last_block_recv
+        }
+
+        try:
+            logs = await self.get_logs(
+                list(account_map.values()), from_block, block_number
             )
-            logger.info(f"Websocket client subscribed with account: {account}.")
-            while True:
-                try:
-                    message = await asyncio.wait_for(
-                        self.ws_client.recv(), timeout=self.ws_timeout
-                    )
-                    signature: str = json.loads(message)["params"]["result"][
-                        "transactionHash"
-                    ]
-                    timestamp: int = time_ns()
-                    yield signature, timestamp
-                except json.JSONDecodeError as error:
-                    logger.error("Decoding Ethereum subscription JSON has failed")
-                    logger.error(error)
-                except KeyError as error:
-                    logger.error(
-                        "There is no Ethereum transaction hash in received data."
-                    )
-                    logger.error(error)
-                except asyncio.TimeoutException as error:
-                    logger.error("Ethereum websocket timeout.")
-                    logger.error(error)
+        except (ClientRPCConnectionException, httpx.HTTPError) as error:
+            logger.error(
+                f"Pulling Ethereum logs up to block {block_number} has failed."
+            )
+            logger.error(error)
+            return None
+
+        return self._group_by_transaction(account_map, logs, from_blocks)
+
+    def _group_by_transaction(
+        self,
+        account_map: Dict[str, str],
+        logs: List[Dict[str, Any]],
+        from_blocks: Dict[str, int],
+    ) -> List[Tuple[str, str, int, int]]:
+        """Return each transaction of logs once, in chain order, skipping
+        logs older than their account position and logs removed by chain
+        reorganization."""
+        transaction_hashes: Set[str] = set()
+        transactions: List[Tuple[str, str, int, int]] = []
+        for log in logs:
+            if log.get("removed"):
+                continue
+
+            account = account_map[log["address"].lower()]
+            block_number = int(log["blockNumber"], 16)
+            if block_number < from_blocks.get(account, block_number):
+                continue
+
+            if log["transactionHash"] not in transaction_hashes:
+                transaction_hashes.add(log["transactionHash"])
+                transactions.append(
+                    (account, log["transactionHash"], time_ns(), block_number)
+                )
+
+        return transactions
 
     async def unsubscribe(self) -> None:
-        if self.subscription_id is None:
+        if not self.subscription_ids:
             logger.info("Client is not subscribed to transaction logs.")
             return
 
-        if self.ws_client is not None:
-            await self.ws_client.close()
-            logger.info("Websocket client is unsubscribed.")
+        for websocket in list(self.ws_clients.values()):
+            await websocket.close()
+        logger.info("Websocket client is unsubscribed.")
 
     def ws_client_connected(self) -> bool:
-        return self.ws_client is not None
+        return bool(self.ws_clients)
 
     def _auth_ws_endpoint(self, ws_endpoint: str) -> str:
         ws_username = get_env_variable("ETHEREUM_RPC_WS_USERNAME")
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, AsyncGenerator, Callable, Dict, Set, Tuple, TypeVar
+
+from sintra.subscriber.endpoint import EndpointPool
+from sintra.subscriber.supervisor import RECONNECT_EXCEPTIONS, ConnectionSupervisor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def merge(*streams: AsyncGenerator[T, None]) -> AsyncGenerator[T, None]:
+    """Interleave items of async generators in the order they arrive.
+
+    Args:
+        streams (AsyncGenerator[T, None]): Streams to merge.
+
+    Yields:
+        T: Item of any of the streams.
+
+    """
+    pending: Dict["asyncio.Future[T]", AsyncGenerator[T, None]] = {
+        asyncio.ensure_future(stream.__anext__()): stream for stream in streams
+    }
+    try:
+        while pending:
+            done, _ = await asyncio.wait(
+                pending.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                stream = pending.pop(future)
+                try:
+                    item = future.result()
+                except StopAsyncIteration:
+                    continue
+
+                pending[asyncio.ensure_future(stream.__anext__())] = stream
+                yield item
+    finally:
+        for future in pending:
+            future.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for stream in streams:
+            await stream.aclose()
+
+
+async def listen_on_endpoint(
+    pool: EndpointPool,
+    ws_endpoint: str,
+    listen: Callable[[str], AsyncGenerator[T, None]],
+) -> AsyncGenerator[Tuple[str, T], None]:
+    """Yield items of a websocket stream tagged with its endpoint, marking the
+    endpoint unhealthy if the connection fails."""
+    try:
+        async for item in listen(ws_endpoint):
+            yield ws_endpoint, item
+    except RECONNECT_EXCEPTIONS:
+        pool.record_failure(ws_endpoint)
+        raise
+
+
+class RedundantSubscription:
+    """Holds the same subscription open on several websocket providers at
+    once and emits every transaction the first time it arrives.
+
+    Each provider connection is supervised on its own, so a failing provider
+    is replaced by the next best one without interrupting the others.
+    Arrival lag of every provider behind the fastest one is recorded in the
+    endpoint pool.
+    """
+
+    def __init__(
+        self,
+        pool: EndpointPool,
+        redundancy: int,
+        max_tracked: int = 10000,
+        stats_interval: int = 1000,
+    ) -> None:
+        self.pool = pool
+        self.redundancy = redundancy
+        self.max_tracked = max_tracked
+        self.stats_interval = stats_interval
+        self.transactions = 0
+        self._arrivals: "OrderedDict[str, float]" = OrderedDict()
+        self._in_use: Set[str] = set()
+
+    async def listen(
+        self,
+        listen: Callable[[str], AsyncGenerator[Tuple[Any, ...], None]],
+        key: Callable[[Tuple[Any, ...]], str],
+    ) -> AsyncGenerator[Tuple[Any, ...], None]:
+        """Merge streams of `redundancy` providers.
+
+        Args:
+            listen (Callable[[str], AsyncGenerator[Tuple[Any, ...], None]]):
+                Opens a stream on websocket endpoint.
+            key (Callable[[Tuple[Any, ...]], str]): Returns transaction
+                identifier of stream item.
+
+        Yields:
+            Tuple[Any, ...]: Stream item on its first arrival.
+
+        """
+        streams = [
+            ConnectionSupervisor(f"Provider {slot}").run(
+                lambda: self._listen_on_free_endpoint(listen)
+            )
+            for slot in range(self.redundancy)
+        ]
+        async for ws_endpoint, item in merge(*streams):
+            if self._arrive(ws_endpoint, key(item)):
+                yield item
+
+    async def _listen_on_free_endpoint(
+        self, listen: Callable[[str], AsyncGenerator[T, None]]
+    ) -> AsyncGenerator[Tuple[str, T], None]:
+        ranked = self.pool.ranked()
+        ws_endpoint = next(
+            (endpoint for endpoint in ranked if endpoint not in self._in_use),
+            ranked[0],
+        )
+        self._in_use.add(ws_endpoint)
+        try:
+            async for item in listen_on_endpoint(self.pool, ws_endpoint, listen):
+                yield item
+        finally:
+            self._in_use.discard(ws_endpoint)
+
+    def _arrive(self, ws_endpoint: str, key: str) -> bool:
+        now = monotonic()
+        first_arrival = self._arrivals.get(key)
+        if first_arrival is not None:
+            self.pool.record_arrival(ws_endpoint, now - first_arrival)
+            return False
+
+        self.pool.record_arrival(ws_endpoint, 0)
+        self._arrivals[key] = now
+        if len(self._arrivals) > self.max_tracked:
+            self._arrivals.popitem(last=False)
+
+        self.transactions += 1
+        if self.transactions % self.stats_interval == 0:
+            logger.info(f"Provider arrival stats: {self.pool.arrival_stats()}")
+        return True
@@ -1,9 +1,12 @@
 import logging
-from time import time_ns
-from typing import AsyncGenerator, List, Optional, Tuple
+from time import monotonic, time_ns
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
+import httpx
 from apischema.validation.errors import ValidationError
-from solana.rpc.websocket_api import Error, connect
+from jsonrpcclient import Ok
+from solana.rpc.commitment import Commitment, Confirmed, Finalized, Processed
+from solana.rpc.websocket_api import SubscriptionError, connect
 from websockets.client import WebSocketClientProtocol
 from websockets.exceptions import ConnectionClosedError
 
@@ -12,6 +15,9 @@ from sintra.exception import (
     ClientRPCConnectionException,
 )
 from sintra.subscriber.client import AsynchronousClient
+from sintra.subscriber.confirmation import SignatureConfirmation
+from sintra.subscriber.endpoint import EndpointPool
+from sintra.subscriber.redundancy import RedundantSubscription, listen_on_endpoint
 from sintra.utils import get_env_variable
 
 logger = logging.getLogger(__name__)
@@ -20,100 +26,316 @@ logger = logging.getLogger(__name__)
 class SolanaRPCClient:
     def __init__(
         self,
-        http_endpoint: str,
+        http_endpoints: List[str],
         http_timeout: float,
-        ws_endpoint: str,
+        ws_endpoints: List[str],
         ws_timeout: int,
+        backfill_page_size: int = 1000,
+        backfill_max_signatures: int = 10000,
+        backfill_on_notification: bool = False,
+        endpoint_cooldown: float = 30,
+        redundancy: int = 1,
+        commitment: Commitment = Finalized,
+        confirmation_commitment: Optional[Commitment] = None,
+        confirmation_poll_interval: float = 0.4,
+        confirmation_timeout: float = 30,
     ) -> None:
 
         self.http_username = get_env_variable("SOLANA_RPC_HTTP_USERNAME")
         self.http_password = get_env_variable("SOLANA_RPC_HTTP_PASSWORD")
-        self.http_client: Optional[AsynchronousClient] = None
-        self.http_endpoint = http_endpoint
+        self.http_clients: Dict[str, AsynchronousClient] = {}
+        self.http_pool = EndpointPool(http_endpoints, endpoint_cooldown)
         self.http_timeout = http_timeout
 
-        self.ws_client: Optional[WebSocketClientProtocol] = None
+        self.ws_clients: Dict[str, WebSocketClientProtocol] = {}
         self.ws_timeout = ws_timeout
-        self.ws_endpoint = self._auth_ws_endpoint(ws_endpoint)
-        self.last_signature_recv: Optional[str] = None
-        self.subscription_id: Optional[int] = None
+        self.ws_pool = EndpointPool(
+            [self._auth_ws_endpoint(ws_endpoint) for ws_endpoint in ws_endpoints],
+            endpoint_cooldown,
+        )
+        self.redundant_subscription = RedundantSubscription(self.ws_pool, redundancy)
+        self.redundancy = redundancy
+        self.last_signature_recv: Dict[str, str] = {}
+        self.subscriptions: Dict[str, Dict[int, str]] = {}
+
+        self.backfill_page_size = backfill_page_size
+        self.backfill_max_signatures = backfill_max_signatures
+        self.backfill_on_notification = backfill_on_notification
+
+        self.commitment = commitment
+        # Signatures for address can't be queried at processed commitment.
+        self.http_commitment = Confirmed if commitment == Processed else commitment
+        self.confirmation: Optional[SignatureConfirmation] = None
+        if confirmation_commitment is not None:
+            self.confirmation = SignatureConfirmation(
+                lambda signatures: self.request("get_signature_statuses", signatures),
+                confirmation_commitment,
+                confirmation_poll_interval,
+                confirmation_timeout,
+            )
 
     async def connect_http_client(self) -> None:
-        self.http_client = AsynchronousClient(
-            endpoint=self.http_endpoint,
-            timeout=self.http_timeout,
-            username=self.http_username,
-            password=self.http_password,
-        )
-        logger.info(f"HTTP client connected: {await self.http_client.is_connected()}")
+        for http_endpoint in self.http_pool.endpoints:
+            self.http_clients[http_endpoint] = AsynchronousClient(
+                endpoint=http_endpoint,
+                commitment=self.http_commitment,
+                timeout=self.http_timeout,
+                username=self.http_username,
+                password=self.http_password,
+            )
+        logger.info(f"HTTP clients connected: {len(self.http_clients)}.")
+
+    async def request(self, method: str, *args: Any) -> Dict[str, Any]:
+        """Call RPC method on the fastest healthy HTTP endpoint, failing over
+        to the next one if the endpoint can't be reached.
+
+        Args:
+            method (str): Name of `AsynchronousClient` method.
+            args (Any): Method arguments.
+
+        Returns:
+            Dict[str, Any]: RPC response.
+
+        """
+        if not self.http_clients:
+            raise ClientRPCConnectionException("HTTP Client not connected.")
+
+        for http_endpoint in self.http_pool.ranked():
+            started_at = monotonic()
+            try:
+                rpc_response = await getattr(self.http_clients[http_endpoint], method)(
+                    *args
+                )
+            except httpx.HTTPError as error:
+                logger.error(f"HTTP request {method} has failed.")
+                logger.error(error)
+                self.http_pool.record_failure(http_endpoint)
+                continue
+
+            self.http_pool.record_success(http_endpoint, monotonic() - started_at)
+            if "error" in rpc_response:
+                raise ClientRPCConnectionException(rpc_response["error"])
+            return rpc_response
 
-    async def get_signatures_before(
-        self, signature: str, account: str
+        raise ClientRPCConnectionException(f"All HTTP endpoints failed on {method}.")
+
+    async def get_signatures_until(
+        self, account: str, until: str, before: Optional[str] = None
     ) -> List[Tuple[str, int]]:
-        if self.http_client is not None and await self.http_client.is_connected():
-            rpc_response = await self.http_client.get_signatures_for_address(
-                account, signature, self.last_signature_recv, 15
+        """Page backwards through account signatures, starting from `before`
+        (or chain head) until `until` signature is reached.
+
+        Args:
+            account (str): Account whose signatures are fetched.
+            until (str): Last seen signature, excluded from result.
+            before (Optional[str]): Signature to start searching backwards from.
+
+        Returns:
+            List[Tuple[str, int]]: Signatures and fetch timestamps, oldest first.
+
+        """
+        signatures: List[str] = []
+        while len(signatures) < self.backfill_max_signatures:
+            rpc_response = await self.request(
+                "get_signatures_for_address",
+                account,
+                before,
+                until,
+                self.backfill_page_size,
             )
-            signatures_leftover = [
-                (result["signature"], time_ns()) for result in rpc_response["result"]
-            ]
-            logger.debug(f"Signature leftover: {len(signatures_leftover)}.")
-            return signatures_leftover
+            page = [result["signature"] for result in rpc_response["result"]]
+            signatures.extend(page)
 
-        raise ClientRPCConnectionException("HTTP Client not connected.")
+            if len(page) < self.backfill_page_size:
+                break
+            before = page[-1]
+        else:
+            logger.warning(
+                f"Backfill for account {account} stopped after {len(signatures)} signatures."
+            )
+
+        logger.debug(f"Signature leftover: {len(signatures)}.")
+        return [(signature, time_ns()) for signature in reversed(signatures)]
 
     async def listen_for_transactions(
         self, accounts: List[str]
-    ) -> AsyncGenerator[Tuple[str, int], None]:
-        account: str = accounts[0]
-        async with connect(
-            uri=self.ws_endpoint, ping_timeout=self.ws_timeout
-        ) as websocket:
-            self.ws_client = websocket
-
-            if self.ws_client is None:
-                logger.info("Websocket client hasn't been initialized.")
-                return
+    ) -> AsyncGenerator[Tuple[str, str, int], None]:
+        """Subscribe to logs of every account over a single websocket connection.
 
-            await self.ws_client.logs_subscribe({"mentions": accounts})
-            message = await self.ws_client.recv()
-            if isinstance(message, Error):
-                logger.error(
-                    f"Can't connect to Websocket client on address: {self.solana_ws_endpoint}."
-                )
-                raise ClientRPCConnectionException(message.message)
+        Solana accepts only one account per `logsSubscribe` filter, so one
+        subscription is created per account and notifications are routed back
+        to their account through the subscription id. The fastest healthy
+        websocket endpoint is used; a failed endpoint is skipped on the next
+        connection, which resumes from the last received signatures. With
+        `redundancy` above 1, the subscriptions are held on that many
+        providers at once and each signature is yielded on its first arrival.
 
-            self.subscription_id = message.result
-            logger.info(
-                f"Subscribe to Solana blockchain. Subscription id: {self.subscription_id}."
+        Logs are streamed at `commitment`. If `confirmation_commitment` is set,
+        signatures are held back until they reach it, which allows streaming at
+        processed commitment while downstream fetches only confirmed ones.
+
+        Args:
+            accounts (List[str]): Market accounts to subscribe to.
+
+        Yields:
+            Tuple[str, str, int]: Market account, transaction signature and
+                receive timestamp in nanoseconds.
+
+        """
+        if self.redundancy > 1:
+            transactions = self.redundant_subscription.listen(
+                lambda ws_endpoint: self._listen(ws_endpoint, accounts),
+                key=lambda item: item[1],
+            )
+        else:
+            transactions = self._listen_on_best_endpoint(accounts)
+
+        if self.confirmation is not None:
+            # Released out of arrival order, so the last received signatures
+            # only advance up to the oldest one still awaiting confirmation.
+            transactions = self.confirmation.confirm(
+                transactions, self.last_signature_recv
             )
-            logger.info(f"Websocket client subscribed with account: {account}.")
+
+        try:
+            async for account, signature, timestamp in transactions:
+                if self.confirmation is None:
+                    self.last_signature_recv[account] = signature
+                yield account, signature, timestamp
+        finally:
+            await transactions.aclose()
+
+    async def _listen_on_best_endpoint(
+        self, accounts: List[str]
+    ) -> AsyncGenerator[Tuple[str, str, int], None]:
+        async for _, item in listen_on_endpoint(
+            self.ws_pool,
+            self.ws_pool.select(),
+            lambda ws_endpoint: self._listen(ws_endpoint, accounts),
+        ):
+            yield item
+
+    async def _listen(
+        self, ws_endpoint: str, accounts: List[str]
+    ) -> AsyncGenerator[Tuple[str, str, int], None]:
+        connected_at = monotonic()
+        async with connect(uri=ws_endpoint, ping_timeout=self.ws_timeout) as websocket:
+            if websocket is None:
+                logger.info("Websocket client hasn't been initialized.")
+                return
+
+            self.ws_clients[ws_endpoint] = websocket
+            subscriptions = self.subscriptions[ws_endpoint] = {}
             try:
-                async for transaction in self.ws_client:
-                    signature: str = transaction.result.value.signature
-                    timestamp: int = time_ns()
+                if not self.http_clients:
+                    await self.connect_http_client()
 
-                    yield signature, timestamp
+                for account in accounts:
+                    await websocket.logs_subscribe(
+                        {"mentions": [account]}, commitment=self.commitment
+                    )
+
+                async for messages in websocket:
+                    if not isinstance(messages, list):
+                        messages = [messages]
+
+                    for message in messages:
+                        if isinstance(message, Ok):
+                            if not subscriptions:
+                                self.ws_pool.record_success(
+                                    ws_endpoint, monotonic() - connected_at
+                                )
+                            account = self._register_subscription(
+                                websocket, subscriptions, message
+                            )
+                            # Catch up on everything missed while disconnected.
+                            async for item in self._backfill(account):
+                                yield item
+                            continue
+
+                        account = subscriptions.get(message.subscription)
+                        if account is None:
+                            logger.warning(
+                                f"Notification for unknown subscription: {message.subscription}."
+                            )
+                            continue
+
+                        signature: str = message.result.value.signature
+                        timestamp: int = time_ns()
+
+                        if self.backfill_on_notification:
+                            async for item in self._backfill(account, signature):
+                                yield item
+
+                        yield account, signature, timestamp
+            except SubscriptionError as error:
+                logger.error(
+                    f"Can't subscribe to Websocket client on address: {ws_endpoint}."
+                )
+                raise ClientRPCConnectionException(error.msg) from error
             except ConnectionClosedError as error:
                 logger.error("Websocket client connection unexpectedly closed.")
                 logger.error(error)
-
-                self.ws_client = None
                 raise ClientRPCConnectionClosedException(error) from error
             except ValidationError:
                 logger.error("Error deserializing transaction hash.")
+            finally:
+                self.ws_clients.pop(ws_endpoint, None)
+                self.subscriptions.pop(ws_endpoint, None)
+
+    def _register_subscription(
+        self,
+        websocket: WebSocketClientProtocol,
+        subscriptions: Dict[int, str],
+        message: Ok,
+    ) -> str:
+        request = websocket.sent_subscriptions[message.id]
+        account = request["params"][0]["mentions"][0]
+        subscriptions[message.result] = account
+
+        logger.info(
+            f"Subscribe to Solana blockchain. Subscription id: {message.result}."
+        )
+        logger.info(f"Websocket client subscribed with account: {account}.")
+        return account
+
+    async def _backfill(
+        self, account: str, before: Optional[str] = None
+    ) -> AsyncGenerator[Tuple[str, str, int], None]:
+        last_signature = self.last_signature_recv.get(account)
+        if last_signature is None:
+            return
+
+        try:
+            signatures = await self.get_signatures_until(
+                account, last_signature, before
+            )
+        except (ClientRPCConnectionException, httpx.HTTPError) as error:
+            logger.error(f"Backfill for account {account} has failed.")
+            logger.error(error)
+            return
+
+        if signatures:
+            logger.info(
+                f"Backfilled {len(signatures)} signatures for account: {account}."
+            )
+
+        for signature, timestamp in signatures:
+            yield account, signature, timestamp
 
     async def unsubscribe(self) -> None:
-        if self.subscription_id is None:
+        if not self.subscriptions:
             logger.info("Client is not subscribed to transaction logs.")
             return
 
-        if self.ws_client is not None:
-            await self.ws_client.logs_unsubscribe(self.subscription_id)
-            logger.info("Websocket client is unsubscribed from logs.")
+        for ws_endpoint, websocket in list(self.ws_clients.items()):
+            for subscription_id in list(self.subscriptions.get(ws_endpoint, {})):
+                await websocket.logs_unsubscribe(subscription_id)
+        self.subscriptions = {}
+        logger.info("Websocket client is unsubscribed from logs.")
 
     def ws_client_connected(self) -> bool:
-        return self.ws_client is not None
+        return bool(self.ws_clients)
 
     def _auth_ws_endpoint(self, ws_endpoint: str) -> str:
         ws_username = get_env_variable("SOLANA_RPC_WS_USERNAME")
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import random
+from time import monotonic
+from typing import AsyncGenerator, Callable, TypeVar
+
+from strenum import StrEnum
+from websockets.exceptions import WebSocketException
+
+from sintra.exception import (
+    ClientRPCConnectionClosedException,
+    ClientRPCConnectionException,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors after which a new connection attempt is worth making.
+RECONNECT_EXCEPTIONS = (
+    ClientRPCConnectionClosedException,
+    ClientRPCConnectionException,
+    WebSocketException,
+    asyncio.TimeoutError,
+    OSError,
+)
+
+
+class ConnectionState(StrEnum):
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    BACKOFF = "backoff"
+
+
+class ConnectionSupervisor:
+    """Keeps a subscriber stream alive, reconnecting after connection
+    failures with capped exponential backoff and jitter.
+
+    Backoff is reset once a connection delivered data or stayed open
+    longer than `max_backoff`, so recovery after an outage is immediate
+    while a provider that keeps failing isn't hammered.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30,
+        multiplier: float = 2,
+        jitter: float = 0.5,
+    ) -> None:
+        self.name = name
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+        self.state = ConnectionState.CONNECTING
+        self.reconnects = 0
+        self.consecutive_failures = 0
+
+    def backoff_delay(self) -> float:
+        """Return delay before the next connection attempt.
+
+        Returns:
+            float: Delay in seconds.
+
+        """
+        delay = min(
+            self.max_backoff,
+            self.initial_backoff * self.multiplier ** (self.consecutive_failures - 1),
+        )
+        return delay * random.uniform(1 - self.jitter, 1)
+
+    async def run(
+        self, connect: Callable[[], AsyncGenerator[T, None]]
+    ) -> AsyncGenerator[T, None]:
+        """Yield items from streams created by `connect`, opening a new
+        stream whenever the previous one fails or ends.
+
+        Args:
+            connect (Callable[[], AsyncGenerator[T, None]]): Opens a stream.
+
+        Yields:
+            T: Items of the current stream.
+
+        """
+        while True:
+            self.state = ConnectionState.CONNECTING
+            connected_at = monotonic()
+            try:
+                async for item in connect():
+                    if self.state != ConnectionState.CONNECTED:
+                        self.state = ConnectionState.CONNECTED
+                        self.consecutive_failures = 0
+                        logger.info(f"{self.name} connection is healthy.")
+                    yield item
+                logger.warning(f"{self.name} stream has ended.")
+            except RECONNECT_EXCEPTIONS as error:
+                logger.error(f"{self.name} connection has failed.")
+                logger.error(error)
+
+            if monotonic() - connected_at > self.max_backoff:
+                self.consecutive_failures = 0
+            self.consecutive_failures += 1
+            self.reconnects += 1
+            self.state = ConnectionState.BACKOFF
+
+            delay = self.backoff_delay()
+            logger.info(
+                f"Reconnecting {self.name} in {delay:.2f}s "
+                f"(attempt {self.consecutive_failures}, {self.reconnects} reconnects in total)."
+            )
+            await asyncio.sleep(delay)
@@ -1,13 +1,47 @@
+import asyncio
 import logging
+import threading
 from os import getenv
-from typing import Any
+from typing import Any, Iterable
 
 import boto3
+from cachetools import TTLCache
 
 from sintra.config import settings
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+# Secrets are cached process-wide, including the ones that don't exist,
+# so each secret is requested from AWS secret manager at most once per TTL.
+_secret_cache: TTLCache = TTLCache(
+    maxsize=settings.secrets.cache_size, ttl=settings.secrets.cache_ttl
+)
+_secret_lock = threading.Lock()
+_secrets_manager = None
+
+
+def _secrets_manager_client() -> Any:
+    global _secrets_manager  # pylint: disable=global-statement
+
+    with _secret_lock:
+        if _secrets_manager is None:
+            active_param = str(settings.localstack.active).lower()
+            active = active_param == "true"
+            if active:
+                _secrets_manager = boto3.client(
+                    "secretsmanager",
+                    region_name=settings.localstack.region,
+                    endpoint_url=settings.localstack.endpoint,
+                )
+            else:
+                _secrets_manager = boto3.client(
+                    "secretsmanager",
+                )
+
+    return _secrets_manager
+
 
 def get_env_variable(env_name: str) -> Any:
     """Return environment variable by trying to find it
@@ -25,23 +59,34 @@ def get_env_variable(env_name: str) -> Any:
     if env_variable is not None:
         return env_variable
 
-    active_param = str(settings.localstack.active).lower()
-    active = active_param == "true"
-    if active:
-        secrets_manager = boto3.client(
-            "secretsmanager",
-            region_name=settings.localstack.region,
-            endpoint_url=settings.localstack.endpoint,
-        )
-    else:
-        secrets_manager = boto3.client(
-            "secretsmanager",
-        )
+    with _secret_lock:
+        env_variable = _secret_cache.get(env_name, _MISSING)
+    if env_variable is not _MISSING:
+        return env_variable
 
+    secrets_manager = _secrets_manager_client()
     try:
         response = secrets_manager.get_secret_value(SecretId=env_name)
+        env_variable = response["SecretString"]
     except secrets_manager.exceptions.ResourceNotFoundException:
-        return None
+        env_variable = None
 
-    env_variable = response["SecretString"]
+    with _secret_lock:
+        _secret_cache[env_name] = env_variable
     return env_variable
+
+
+async def prefetch_env_variables(env_names: Iterable[str]) -> None:
+    """Resolve environment variables concurrently, warming up the secret cache.
+
+    Args:
+        env_names (Iterable[str]): Environment variable names.
+
+    """
+    loop = asyncio.get_event_loop()
+    await asyncio.gather(
+        *[
+            loop.run_in_executor(None, get_env_variable, env_name)
+            for env_name in env_names
+        ]
+    )
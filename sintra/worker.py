@@ -5,50 +5,252 @@ import asyncio
 import logging
 import sys
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, List, Type
+from typing import AsyncGenerator, Dict, List, Optional, Tuple, Type
 
+from solana.rpc.commitment import Commitment, Finalized
+
+from sintra.blockchain.ethereum.utils import ethereum_market_topics_map
 from sintra.blockchain.utils import (
     get_blockchain_id,
-    market_accounts,
     market_name_map,
     market_program_id_map,
 )
+from sintra.checkpoint.store import CheckpointStore, build_checkpoint_store
 from sintra.config import settings
+from sintra.deduplication import SignatureCache
 from sintra.exception import (
-    ClientRPCConnectionClosedException,
     EnvironmentVariableMissingException,
     ProduceRecordFailedException,
 )
-from sintra.kinesis.producer import KinesisProducer
+from sintra.kinesis.partition import Partitioner
+from sintra.kinesis.producer import BufferedKinesisProducer, KinesisProducer
 from sintra.kinesis.record import KinesisRecord
-from sintra.subscriber.ethereum import EthereumRPCClient
+from sintra.kinesis.spill import SpillBuffer
+from sintra.metrics import WorkerMetrics
+from sintra.subscriber.ethereum import EthereumRPCClient, SubscriptionMode
 from sintra.subscriber.solana import SolanaRPCClient
-from sintra.utils import get_env_variable
+from sintra.subscriber.supervisor import ConnectionState, ConnectionSupervisor
+from sintra.utils import get_env_variable, prefetch_env_variables
 
 logger = logging.getLogger(__name__)
 
 
 class TransactionWorker(ABC):
-    @abstractmethod
+    # Environment variables or secrets resolved while building the worker.
+    env_variables: List[str] = []
+
+    def __init__(
+        self,
+        stream_name: str,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        checkpoint_interval: float = 10,
+    ) -> None:
+        self.kinesis = KinesisProducer()
+        self.stream_name = stream_name
+        self.partitioner = Partitioner(
+            settings.kinesis.partition.strategy, settings.kinesis.partition.key
+        )
+        self.checkpoint_store = checkpoint_store
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints: Dict[str, str] = {}
+        # Shared across subscriptions, since a single transaction often
+        # mentions several market accounts of the same marketplace.
+        self.seen_signatures = SignatureCache(
+            settings.worker.deduplication.max_size,
+            settings.worker.deduplication.ttl,
+        )
+        self.supervisor = ConnectionSupervisor(
+            type(self).__name__,
+            settings.worker.reconnect.initial_backoff,
+            settings.worker.reconnect.max_backoff,
+            settings.worker.reconnect.multiplier,
+            settings.worker.reconnect.jitter,
+        )
+
     async def listen_for_transactions(
         self,
         blockchain_id: int,
-        market: str,
-        market_address: int,
-        market_accounts: List[str],
+        account_address_map: Dict[str, int],
+        address_name_map: Dict[int, str],
     ) -> None:
-        """Subscribe to RPC client, listen for transaction signatures
-        and send them to sink connector.
+        """Subscribe to RPC client for all market accounts at once, listen for
+        transaction signatures and send them to sink connector.
 
         Args:
             blockchain_id: (int): ID of blockchain.
-            market (str):  Name of secondary marketplace where transaction originates from.
-            market_address (int): Secondary marketplace address.
+            account_address_map (Dict[str, int]): Secondary marketplace accounts
+                mapped to secondary marketplace addresses.
+            address_name_map (Dict[int, str]): Secondary marketplace addresses
+                mapped to secondary marketplace names.
+
+        """
+        market_accounts: List[str] = list(account_address_map.keys())
+        if self.checkpoint_store is not None:
+            self.checkpoints = await self._load_checkpoints(market_accounts)
+            self.restore_checkpoints(self.checkpoints)
+            logger.info(f"Resuming from checkpoints: {self.checkpoints}")
+
+        metrics = WorkerMetrics(address_name_map)
+        spill: Optional[SpillBuffer] = None
+        if settings.kinesis.spill.enabled:
+            spill = SpillBuffer(
+                settings.kinesis.spill.path,
+                settings.kinesis.spill.segment_size,
+                settings.kinesis.spill.max_size,
+            )
+        producer = BufferedKinesisProducer(
+            self.kinesis,
+            self.stream_name,
+            max_queue_size=settings.kinesis.max_queue_size,
+            max_batch_size=settings.kinesis.max_batch_size,
+            linger=settings.kinesis.linger_ms / 1000,
+            max_retries=settings.kinesis.max_retries,
+            on_acknowledged=metrics.observe_acknowledged,
+            spill=spill,
+            replay_interval=settings.kinesis.spill.replay_interval,
+        )
+        producer.start()
+        checkpoint_task: Optional[asyncio.Future] = None
+        if self.checkpoint_store is not None:
+            checkpoint_task = asyncio.ensure_future(self._save_checkpoints(producer))
+            checkpoint_task.add_done_callback(self._checkpoint_task_done)
+        if settings.worker.metrics.enabled:
+            self._register_metrics(metrics, producer)
+            await metrics.serve(settings.worker.metrics.port)
+
+        try:
+            async for account, signature, timestamp in self.supervisor.run(
+                lambda: self.transactions(market_accounts)
+            ):
+                market_address = account_address_map[account]
+                if self.seen_signatures.add(signature):
+                    logger.info(
+                        f"Transaction signature: {signature} with timestamp: {timestamp} from account: {account}. "
+                        f"Producer queue depth: {producer.queue_depth}"
+                    )
+                    record = KinesisRecord(
+                        blockchain_id=blockchain_id,
+                        market=address_name_map[market_address],
+                        market_address=market_address,
+                        market_account=account,
+                        signature=signature,
+                        timestamp=timestamp,
+                    )
+                    partition_key, explicit_hash_key = self.partitioner.partition(
+                        record
+                    )
+                    await producer.produce_record(
+                        record, partition_key, explicit_hash_key
+                    )
+                else:
+                    metrics.duplicates[market_address] += 1
+                    logger.debug(
+                        f"Dropping duplicate signature: {signature} from account: {account}."
+                    )
+
+                checkpoint = self.get_checkpoint(account)
+                if checkpoint is not None:
+                    self.checkpoints[account] = checkpoint
+        except ProduceRecordFailedException:
+            logger.info("Can't send record to Kinesis. Closing...")
+            sys.exit(1)
+        finally:
+            if checkpoint_task is not None:
+                checkpoint_task.cancel()
+                await asyncio.gather(checkpoint_task, return_exceptions=True)
+
+    def _register_metrics(
+        self, metrics: WorkerMetrics, producer: BufferedKinesisProducer
+    ) -> None:
+        metrics.register(
+            "sintra_worker_producer_queue_depth",
+            "Records waiting to be sent to Kinesis.",
+            lambda: producer.queue_depth,
+        )
+        metrics.register(
+            "sintra_worker_producer_spill_depth",
+            "Records spilled to local disk, waiting to be replayed to Kinesis.",
+            lambda: producer.spill_depth,
+        )
+        metrics.register(
+            "sintra_worker_reconnects_total",
+            "Reconnects of the subscriber connection.",
+            lambda: self.supervisor.reconnects,
+            "counter",
+        )
+        metrics.register(
+            "sintra_worker_connected",
+            "Whether the subscriber connection is delivering transactions.",
+            lambda: int(self.supervisor.state == ConnectionState.CONNECTED),
+        )
+
+    async def _load_checkpoints(self, market_accounts: List[str]) -> Dict[str, str]:
+        loop = asyncio.get_event_loop()
+        try:
+            return await loop.run_in_executor(
+                None, self.checkpoint_store.load, market_accounts
+            )
+        except Exception as error:
+            logger.warning("Loading checkpoints has failed, starting from chain head.")
+            logger.warning(error)
+            return {}
+
+    async def _save_checkpoints(self, producer: BufferedKinesisProducer) -> None:
+        """Periodically persist checkpoints. A snapshot is persisted only once
+        every record enqueued before it has been acknowledged by Kinesis."""
+        loop = asyncio.get_event_loop()
+        saved: Dict[str, str] = dict(self.checkpoints)
+        pending: Optional[Tuple[int, Dict[str, str]]] = None
+
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+
+            if pending is not None and producer.sent_count >= pending[0]:
+                changed = {
+                    account: checkpoint
+                    for account, checkpoint in pending[1].items()
+                    if saved.get(account) != checkpoint
+                }
+                if changed:
+                    try:
+                        await loop.run_in_executor(
+                            None, self.checkpoint_store.save, changed
+                        )
+                        saved.update(changed)
+                    except Exception as error:
+                        logger.error("Saving checkpoints has failed.")
+                        logger.error(error)
+                pending = None
+
+            if pending is None:
+                pending = (producer.enqueued_count, dict(self.checkpoints))
+
+    @staticmethod
+    def _checkpoint_task_done(task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Saving checkpoints has stopped.")
+            logger.error(task.exception())
+
+    @abstractmethod
+    def transactions(
+        self, market_accounts: List[str]
+    ) -> AsyncGenerator[Tuple[str, str, int], None]:
+        """Stream transaction signatures of all market accounts
+        over a single RPC client connection.
+
+        Args:
             market_accounts (List(str)): List of secondary marketplace accounts.
 
         """
 
+    @abstractmethod
+    def get_checkpoint(self, market_account: str) -> Optional[str]:
+        """Return position of the last transaction received for market account."""
+
+    @abstractmethod
+    def restore_checkpoints(self, checkpoints: Dict[str, str]) -> None:
+        """Restore positions of market accounts to resume listening from."""
+
     @classmethod
     @abstractmethod
     def build_from_settings(cls) -> TransactionWorker:
@@ -56,124 +258,158 @@ class TransactionWorker(ABC):
 
 
 class SolanaTransactionWorker(TransactionWorker):
+    env_variables = [
+        "SOLANA_RPC_HTTP_USERNAME",
+        "SOLANA_RPC_HTTP_PASSWORD",
+        "SOLANA_RPC_WS_USERNAME",
+        "SOLANA_RPC_WS_PASSWORD",
+    ]
+
     def __init__(
         self,
-        http_endpoint: str,
+        http_endpoints: List[str],
         http_timeout: float,
-        ws_endpoint: str,
+        ws_endpoints: List[str],
         ws_timeout: float,
         stream_name: str,
+        backfill_page_size: int = 1000,
+        backfill_max_signatures: int = 10000,
+        backfill_on_notification: bool = False,
+        endpoint_cooldown: float = 30,
+        redundancy: int = 1,
+        commitment: Commitment = Finalized,
+        confirmation_commitment: Optional[Commitment] = None,
+        confirmation_poll_interval: float = 0.4,
+        confirmation_timeout: float = 30,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        checkpoint_interval: float = 10,
     ) -> None:
+        super().__init__(stream_name, checkpoint_store, checkpoint_interval)
         self.solana_rpc_client = SolanaRPCClient(
-            http_endpoint,
+            http_endpoints,
             http_timeout,
-            ws_endpoint,
+            ws_endpoints,
             ws_timeout,
+            backfill_page_size,
+            backfill_max_signatures,
+            backfill_on_notification,
+            endpoint_cooldown,
+            redundancy,
+            commitment,
+            confirmation_commitment,
+            confirmation_poll_interval,
+            confirmation_timeout,
         )
-        self.kinesis = KinesisProducer()
-        self.stream_name = stream_name
 
-    async def listen_for_transactions(
-        self,
-        blockchain_id: int,
-        market: str,
-        market_address: int,
-        market_accounts: List[str],
-    ) -> None:
-        while True:
-            try:
-                async for signature, timestamp in self.solana_rpc_client.listen_for_transactions(
-                    market_accounts
-                ):
-                    logger.info(
-                        f"Transaction signature: {signature} with timestamp: {timestamp} from worker: {id(self)}"
-                    )
-                    record = KinesisRecord(
-                        blockchain_id=blockchain_id,
-                        market=market,
-                        market_address=market_address,
-                        market_account=market_accounts[0],
-                        signature=signature,
-                        timestamp=timestamp,
-                    )
-                    self.kinesis.produce_record(self.stream_name, record, signature)
-            except ClientRPCConnectionClosedException as error:
-                logger.error(error)
-                logger.info("Reconnecting Websocket client...")
-            except ProduceRecordFailedException:
-                logger.info("Can't send record to Kinesis. Closing...")
-                sys.exit(1)
+    def transactions(
+        self, market_accounts: List[str]
+    ) -> AsyncGenerator[Tuple[str, str, int], None]:
+        return self.solana_rpc_client.listen_for_transactions(market_accounts)
+
+    def get_checkpoint(self, market_account: str) -> Optional[str]:
+        return self.solana_rpc_client.last_signature_recv.get(market_account)
+
+    def restore_checkpoints(self, checkpoints: Dict[str, str]) -> None:
+        self.solana_rpc_client.last_signature_recv.update(checkpoints)
 
     @classmethod
     def build_from_settings(cls) -> SolanaTransactionWorker:
+        confirmation_commitment = settings.blockchain.solana.confirmation.commitment
+
         return cls(
-            settings.blockchain.solana.http.endpoint,
+            settings.blockchain.solana.http.endpoints,
             settings.blockchain.solana.http.timeout,
-            settings.blockchain.solana.ws.endpoint,
+            settings.blockchain.solana.ws.endpoints,
             settings.blockchain.solana.ws.timeout,
             settings.kinesis.stream_name,
+            settings.blockchain.solana.backfill.page_size,
+            settings.blockchain.solana.backfill.max_signatures,
+            settings.blockchain.solana.backfill.on_notification,
+            settings.worker.endpoint.cooldown,
+            settings.worker.endpoint.redundancy,
+            Commitment(settings.blockchain.solana.ws.commitment),
+            Commitment(confirmation_commitment) if confirmation_commitment else None,
+            settings.blockchain.solana.confirmation.poll_interval_ms / 1000,
+            settings.blockchain.solana.confirmation.timeout,
+            build_checkpoint_store(settings.checkpoint.type),
+            settings.checkpoint.interval,
         )
 
 
 class EthereumTransactionWorker(TransactionWorker):
+    env_variables = [
+        "ALCHEMY_API_KEY",
+        "ETHEREUM_RPC_HTTP_USERNAME",
+        "ETHEREUM_RPC_HTTP_PASSWORD",
+        "ETHEREUM_RPC_WS_USERNAME",
+        "ETHEREUM_RPC_WS_PASSWORD",
+    ]
+
     def __init__(
         self,
-        http_endpoint: str,
+        http_endpoints: List[str],
         http_timeout: float,
-        ws_endpoint: str,
+        ws_endpoints: List[str],
         ws_timeout: float,
         stream_name: str,
+        backfill_block_range: int = 2000,
+        endpoint_cooldown: float = 30,
+        redundancy: int = 1,
+        subscription_mode: str = SubscriptionMode.LOGS,
+        account_topics: Optional[Dict[str, List[str]]] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        checkpoint_interval: float = 10,
     ) -> None:
+        super().__init__(stream_name, checkpoint_store, checkpoint_interval)
         self.ethereum_rpc_client = EthereumRPCClient(
-            http_endpoint,
+            http_endpoints,
             http_timeout,
-            ws_endpoint,
+            ws_endpoints,
             ws_timeout,
+            backfill_block_range,
+            endpoint_cooldown,
+            redundancy,
+            subscription_mode,
+            account_topics,
         )
-        self.kinesis = KinesisProducer()
-        self.stream_name = stream_name
 
-    async def listen_for_transactions(
-        self,
-        blockchain_id: int,
-        market: str,
-        market_address: int,
-        market_accounts: List[str],
-    ) -> None:
-        while True:
-            try:
-                async for signature, timestamp in self.ethereum_rpc_client.listen_for_transactions(
-                    market_accounts
-                ):
-                    logger.info(
-                        f"Transaction signature: {signature} with timestamp: {timestamp} from worker: {id(self)}"
-                    )
-                    record = KinesisRecord(
-                        blockchain_id=blockchain_id,
-                        market=market,
-                        market_address=market_address,
-                        market_account=market_accounts[0],
-                        signature=signature,
-                        timestamp=timestamp,
-                    )
-                    self.kinesis.produce_record(self.stream_name, record, signature)
-            except ClientRPCConnectionClosedException as error:
-                logger.error(error)
-                logger.info("Reconnecting Websocket client...")
-            except ProduceRecordFailedException:
-                logger.info("Can't send record to Kinesis. Closing...")
-                sys.exit(1)
+    def transactions(
+        self, market_accounts: List[str]
+    ) -> AsyncGenerator[Tuple[str, str, int], None]:
+        return self.ethereum_rpc_client.listen_for_transactions(market_accounts)
+
+    def get_checkpoint(self, market_account: str) -> Optional[str]:
+        block_number = self.ethereum_rpc_client.last_block_recv.get(market_account)
+        return None if block_number is None else str(block_number)
+
+    def restore_checkpoints(self, checkpoints: Dict[str, str]) -> None:
+        self.ethereum_rpc_client.last_block_recv.update(
+            {account: int(block) for account, block in checkpoints.items()}
+        )
 
     @classmethod
     def build_from_settings(cls) -> EthereumTransactionWorker:
         alchemy_api_key = get_env_variable("ALCHEMY_API_KEY")
 
         return cls(
-            f"{settings.blockchain.ethereum.http.endpoint}/{alchemy_api_key}",
+            [
+                f"{endpoint}/{alchemy_api_key}"
+                for endpoint in settings.blockchain.ethereum.http.endpoints
+            ],
             settings.blockchain.ethereum.http.timeout,
-            f"{settings.blockchain.ethereum.ws.endpoint}/{alchemy_api_key}",
+            [
+                f"{endpoint}/{alchemy_api_key}"
+                for endpoint in settings.blockchain.ethereum.ws.endpoints
+            ],
             settings.blockchain.ethereum.ws.timeout,
             settings.kinesis.stream_name,
+            settings.blockchain.ethereum.backfill.block_range,
+            settings.worker.endpoint.cooldown,
+            settings.worker.endpoint.redundancy,
+            settings.blockchain.ethereum.ws.mode,
+            ethereum_market_topics_map(),
+            build_checkpoint_store(settings.checkpoint.type),
+            settings.checkpoint.interval,
         )
 
 
@@ -187,33 +423,30 @@ def _build_worker(
     worker_type: str, default: Type[TransactionWorker] = SolanaTransactionWorker
 ) -> TransactionWorker:
     worker_class = _WORKER_CLASSES.get(worker_type, default)
+    asyncio.run(prefetch_env_variables(worker_class.env_variables))
     return worker_class.build_from_settings()
 
 
 def start_worker(
     worker: TransactionWorker,
     blockchain_id: int,
-    market: str,
-    market_address: int,
-    market_account: str,
+    account_address_map: Dict[str, int],
+    address_name_map: Dict[int, str],
 ) -> None:
-    try:
-        async_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(async_loop)
+    async_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(async_loop)
 
+    try:
         future = asyncio.ensure_future(
             asyncio.wait_for(
                 worker.listen_for_transactions(
-                    blockchain_id, market, market_address, [market_account]
+                    blockchain_id, account_address_map, address_name_map
                 ),
                 timeout=None,
             ),
             loop=async_loop,
         )
         async_loop.run_until_complete(future)
-    except EnvironmentVariableMissingException as env_missing_error:
-        logger.error(env_missing_error)
-        sys.exit(1)
     except asyncio.exceptions.TimeoutError as error:
         logger.error(error)
         if not future.cancelled():
@@ -226,31 +459,17 @@ def start_worker(
 
 if __name__ == "__main__":
     blockchain_id: int = get_blockchain_id(settings.worker.type)
-    accounts: List[str] = list(set(market_accounts(settings.worker.type)))
     account_address_map: Dict[str, int] = market_program_id_map(settings.worker.type)
     address_name_map: Dict[int, str] = market_name_map(settings.worker.type)
 
-    number_of_workers: int = len(accounts)
-    thread_executor = ThreadPoolExecutor(max_workers=number_of_workers)
-
     try:
-        for market_account in accounts:
-            market_address = account_address_map[market_account]
-            market_name = address_name_map[market_address]
-
-            worker: TransactionWorker = _build_worker(settings.worker.type)
-            logger.info(
-                f"Starting worker {id(worker)}  for market account {market_account}."
-            )
-            thread_executor.submit(
-                start_worker,
-                worker,
-                blockchain_id,
-                market_name,
-                market_address,
-                market_account,
-            )
+        worker: TransactionWorker = _build_worker(settings.worker.type)
+        logger.info(
+            f"Starting worker {id(worker)} for {len(account_address_map)} market accounts."
+        )
+        start_worker(worker, blockchain_id, account_address_map, address_name_map)
+    except EnvironmentVariableMissingException as env_missing_error:
+        logger.error(env_missing_error)
+        sys.exit(1)
     except KeyboardInterrupt:
         logger.info("Shuting down worker.")
-    finally:
-        thread_executor.shutdown()
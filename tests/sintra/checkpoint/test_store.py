@@ -0,0 +1,70 @@
+import os
+from pathlib import Path
+from typing import Iterator
+
+import boto3
+import pytest
+from moto import mock_dynamodb
+
+from sintra.checkpoint.store import DynamoDBCheckpointStore, FileCheckpointStore
+from sintra.config import settings
+
+
+@pytest.fixture
+def dynamodb_table() -> Iterator[str]:
+    endpoint = settings.localstack.endpoint
+    for env_name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        os.environ.setdefault(env_name, "testing")
+    # Moto intercepts requests to AWS endpoints only.
+    settings.set("LOCALSTACK.ENDPOINT", None)
+
+    with mock_dynamodb():
+        boto3.client("dynamodb", region_name=settings.localstack.region).create_table(
+            TableName="worker-checkpoints",
+            AttributeDefinitions=[
+                {"AttributeName": "market_account", "AttributeType": "S"}
+            ],
+            KeySchema=[{"AttributeName": "market_account", "KeyType": "HASH"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield "worker-checkpoints"
+
+    settings.set("LOCALSTACK.ENDPOINT", endpoint)
+
+
+class TestFileCheckpointStore:
+    def test_load_when_missing(self, tmp_path: Path) -> None:
+        store = FileCheckpointStore(str(tmp_path / "checkpoints" / "worker.json"))
+
+        assert store.load(["first"]) == {}
+
+    def test_save_merges_with_stored(self, tmp_path: Path) -> None:
+        store = FileCheckpointStore(str(tmp_path / "checkpoints" / "worker.json"))
+
+        store.save({"first": "signature-1", "second": "signature-2"})
+        store.save({"second": "signature-3"})
+
+        assert store.load(["first", "second", "third"]) == {
+            "first": "signature-1",
+            "second": "signature-3",
+        }
+        assert not (tmp_path / "checkpoints" / "worker.tmp").exists()
+
+    def test_load_only_requested_accounts(self, tmp_path: Path) -> None:
+        store = FileCheckpointStore(str(tmp_path / "worker.json"))
+        store.save({"first": "signature-1", "second": "signature-2"})
+
+        assert store.load(["second"]) == {"second": "signature-2"}
+
+
+class TestDynamoDBCheckpointStore:
+    def test_save_and_load(self, dynamodb_table: str) -> None:
+        store = DynamoDBCheckpointStore(dynamodb_table)
+
+        store.save({"first": "signature-1", "second": "15379814"})
+        store.save({"first": "signature-2"})
+
+        assert store.load(["first", "second", "third"]) == {
+            "first": "signature-2",
+            "second": "15379814",
+        }
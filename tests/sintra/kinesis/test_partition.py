@@ -0,0 +1,55 @@
+import importlib.util
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from sintra.kinesis import partition
+
+SHARED_PARTITION_PATH = (
+    Path(partition.__file__).parents[1] / "lambda" / "shared" / "partition.py"
+)
+
+
+@pytest.fixture(scope="module")
+def shared_partition() -> ModuleType:
+    # `lambda` is a keyword, so the shared package can't be imported by name.
+    spec = importlib.util.spec_from_file_location(
+        "shared_partition", SHARED_PARTITION_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestPartition:
+    def test_source_is_shared_with_lambdas(self) -> None:
+        assert (
+            Path(partition.__file__).read_text() == SHARED_PARTITION_PATH.read_text()
+        ), "Partitioners of the worker and the lambdas have diverged."
+
+    @pytest.mark.parametrize(
+        "key",
+        [
+            "5mJkcez9QgCMRVtFH9GqtrogLi3asMBWyQWjPc4uKBfBpeS6b2oJmJuW14L2LXWXdRF6VMHy2HzJyBPTYJddVWTq",
+            "0x67e68505498206d75c80c545e6832934082439290649ba59f6efde545c23c77a",
+            "",
+        ],
+    )
+    def test_hash_key_matches_lambdas(
+        self, shared_partition: ModuleType, key: str
+    ) -> None:
+        assert partition.hash_key(key) == shared_partition.hash_key(key)
+
+    @pytest.mark.parametrize("strategy", ["key", "explicit"])
+    def test_partition_matches_lambdas(
+        self, shared_partition: ModuleType, strategy: str
+    ) -> None:
+        worker = partition.Partitioner(strategy, "signature")
+        lambdas = shared_partition.Partitioner(strategy, "signature")
+        # Explicit hash keys start at a random offset.
+        lambdas._hash_key = worker._hash_key
+
+        for index in range(100):
+            record = SimpleNamespace(signature=f"signature-{index}")
+            assert worker.partition(record) == lambdas.partition(record)
@@ -0,0 +1,107 @@
+import asyncio
+from pathlib import Path
+from typing import Any, List
+
+from sintra.exception import ProduceRecordFailedException
+from sintra.kinesis.producer import BufferedKinesisProducer
+from sintra.kinesis.record import KinesisRecord
+from sintra.kinesis.spill import SpillBuffer
+
+
+class FlakyKinesisProducer:
+    """Stands in for `KinesisProducer`, failing while Kinesis is down."""
+
+    def __init__(self) -> None:
+        self.down = False
+        self.sent: List[str] = []
+
+    def produce_records(
+        self, stream_name: str, records: List[KinesisRecord], *args: Any, **kwargs: Any
+    ) -> None:
+        if self.down:
+            raise ProduceRecordFailedException("Kinesis is down.")
+        self.sent.extend(record.signature for record in records)
+
+
+def record(index: int) -> KinesisRecord:
+    return KinesisRecord(
+        65536, "Magic Eden", 65793, "account", f"signature-{index}", index
+    )
+
+
+async def wait_for(condition, timeout: float = 5) -> None:
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + timeout
+    while not condition() and loop.time() < deadline:
+        await asyncio.sleep(0.01)
+
+
+def buffered_producer(
+    kinesis: FlakyKinesisProducer, spill: SpillBuffer
+) -> BufferedKinesisProducer:
+    return BufferedKinesisProducer(
+        kinesis,
+        "signatures",
+        max_queue_size=100,
+        max_batch_size=7,
+        linger=0.001,
+        spill=spill,
+        replay_interval=0.05,
+    )
+
+
+class TestBufferedKinesisProducer:
+    def test_records_spilled_while_failing_are_replayed_once(
+        self, tmp_path: Path
+    ) -> None:
+        kinesis = FlakyKinesisProducer()
+        spill = SpillBuffer(str(tmp_path), segment_size=200)
+
+        async def produce() -> BufferedKinesisProducer:
+            producer = buffered_producer(kinesis, spill)
+            producer.start()
+
+            kinesis.down = True
+            for index in range(30):
+                await producer.produce_record(record(index), f"signature-{index}")
+            await wait_for(lambda: producer.spill_depth == 30)
+
+            kinesis.down = False
+            # Records enqueued while spilled ones wait are kept behind them.
+            for index in range(30, 40):
+                await producer.produce_record(record(index), f"signature-{index}")
+            await wait_for(lambda: producer.sent_count == 40)
+            await producer.close()
+            return producer
+
+        producer = asyncio.run(produce())
+
+        assert kinesis.sent == [f"signature-{index}" for index in range(40)]
+        assert producer.sent_count == producer.enqueued_count == 40
+        assert spill.empty
+        assert list(tmp_path.glob("*.spill")) == []
+
+    def test_records_spilled_by_previous_run_are_replayed_first(
+        self, tmp_path: Path
+    ) -> None:
+        kinesis = FlakyKinesisProducer()
+        previous = SpillBuffer(str(tmp_path), segment_size=200)
+        previous.append(
+            [(record(index), f"signature-{index}", None) for index in range(5)]
+        )
+
+        async def produce() -> BufferedKinesisProducer:
+            producer = buffered_producer(
+                kinesis, SpillBuffer(str(tmp_path), segment_size=200)
+            )
+            producer.start()
+            await producer.produce_record(record(5), "signature-5")
+            await wait_for(lambda: len(kinesis.sent) == 6)
+            await producer.close()
+            return producer
+
+        producer = asyncio.run(produce())
+
+        assert kinesis.sent == [f"signature-{index}" for index in range(6)]
+        # Recovered records were never enqueued by this run.
+        assert producer.sent_count == producer.enqueued_count == 1
@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from sintra.kinesis import record
+from sintra.kinesis.record import KinesisRecord
+
+SIGNATURE_INSTRUCTION_PATH = (
+    Path(record.__file__).parents[1] / "lambda" / "signature-instruction"
+)
+
+
+@pytest.fixture(scope="module")
+def signature_event() -> Iterator[Any]:
+    """`SignatureEvent` of the signature-instruction lambda, which decodes
+    records produced by the worker."""
+    # Decoder dependencies of the lambda, not of the worker.
+    pytest.importorskip("eth_utils")
+    pytest.importorskip("hexbytes")
+
+    sys.path.insert(0, str(SIGNATURE_INSTRUCTION_PATH))
+    try:
+        from src.model import SignatureEvent  # pylint: disable=import-outside-toplevel
+
+        yield SignatureEvent
+    finally:
+        sys.path.remove(str(SIGNATURE_INSTRUCTION_PATH))
+        for module_name in [
+            name for name in sys.modules if name.split(".")[0] == "src"
+        ]:
+            del sys.modules[module_name]
+
+
+class TestKinesisRecord:
+    @pytest.mark.parametrize(
+        "kinesis_record",
+        [
+            KinesisRecord(
+                65536,
+                "MagicEden",
+                65793,
+                "M2mx93ekt1fmXSVkTrUL9xVFHkmME8HTUi5Cyc5aF7K",
+                "5mJkcez9QgCMRVtFH9GqtrogLi3asMBWyQWjPc4uKBfBpeS6b2oJmJuW14L2LXWXdRF6VMHy2HzJyBPTYJddVWTq",
+                1645939150000000000,
+            ),
+            KinesisRecord(
+                196608,
+                "OpenSea",
+                196865,
+                "0x7f268357A8c2552623316e2562D90e642bB538E5",
+                "0x67e68505498206d75c80c545e6832934082439290649ba59f6efde545c23c77a",
+                1645939150000000000,
+            ),
+            # Neither base58 nor lowercase hex, kept as UTF-8.
+            KinesisRecord(65536, "Solanart", 65794, "account-0", "", 0),
+        ],
+    )
+    def test_to_bytes_decoded_by_lambda(
+        self, signature_event: Any, kinesis_record: KinesisRecord
+    ) -> None:
+        decoded = signature_event.from_bytes(kinesis_record.to_bytes())
+
+        assert decoded == signature_event.from_dict(kinesis_record.to_dikt())
+
+    def test_to_bytes_packs_base58_as_raw_bytes(self) -> None:
+        kinesis_record = KinesisRecord(
+            65536,
+            "MagicEden",
+            65793,
+            "M2mx93ekt1fmXSVkTrUL9xVFHkmME8HTUi5Cyc5aF7K",
+            "5mJkcez9QgCMRVtFH9GqtrogLi3asMBWyQWjPc4uKBfBpeS6b2oJmJuW14L2LXWXdRF6VMHy2HzJyBPTYJddVWTq",
+            1645939150000000000,
+        )
+
+        # Header, 64 byte signature, 32 byte account and market name.
+        assert len(kinesis_record.to_bytes()) == 17 + 2 + 64 + 2 + 32 + 1 + 9
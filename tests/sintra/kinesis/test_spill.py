@@ -0,0 +1,102 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from sintra.exception import ProduceRecordFailedException
+from sintra.kinesis.record import KinesisRecord
+from sintra.kinesis.spill import SpillBuffer, SpillEntry
+
+
+def entries(start: int, count: int) -> List[SpillEntry]:
+    return [
+        (
+            KinesisRecord(65536, "Magic Eden", 65793, "account", f"signature-{i}", i),
+            f"signature-{i}",
+            None,
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def signatures(spilled: List[SpillEntry]) -> List[str]:
+    return [record.signature for record, _, _ in spilled]
+
+
+class TestSpillBuffer:
+    def test_append_peek_and_commit(self, tmp_path: Path) -> None:
+        spill = SpillBuffer(str(tmp_path), segment_size=1 << 20)
+        spill.append(entries(0, 5))
+
+        assert len(spill) == 5
+        assert spill.peek(3) == entries(0, 3)
+        # Peeked records stay in the spill until they are committed.
+        assert signatures(spill.peek(3)) == signatures(entries(0, 3))
+
+        spill.commit()
+
+        assert len(spill) == 2
+        assert spill.peek(10) == entries(3, 2)
+
+        spill.commit()
+
+        assert spill.empty
+        assert spill.size == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_segment_rollover(self, tmp_path: Path) -> None:
+        spill = SpillBuffer(str(tmp_path), segment_size=1)
+        spill.append(entries(0, 2))
+        spill.append(entries(2, 2))
+
+        assert len(list(tmp_path.glob("*.spill"))) == 2
+        # Records are read from a single segment at a time.
+        assert spill.peek(10) == entries(0, 2)
+
+        spill.commit()
+
+        assert len(list(tmp_path.glob("*.spill"))) == 1
+        assert spill.peek(10) == entries(2, 2)
+
+    def test_recovery_after_restart(self, tmp_path: Path) -> None:
+        spill = SpillBuffer(str(tmp_path), segment_size=1)
+        spill.append(entries(0, 3))
+        spill.append(entries(3, 3))
+        spill.peek(2)
+        spill.commit()
+
+        recovered = SpillBuffer(str(tmp_path), segment_size=1)
+
+        # Partially replayed segment is replayed again from its start.
+        assert len(recovered) == 6
+        assert recovered.recovered_records == 6
+        assert recovered.peek(10) == entries(0, 3)
+
+        recovered.commit()
+
+        assert recovered.recovered_records == 3
+        assert recovered.peek(10) == entries(3, 3)
+
+    def test_recovery_when_write_torn(self, tmp_path: Path) -> None:
+        spill = SpillBuffer(str(tmp_path), segment_size=1 << 20)
+        spill.append(entries(0, 2))
+        segment = next(tmp_path.glob("*.spill"))
+        with open(segment, "ab") as segment_file:
+            segment_file.write(b'{"record": {"blockchain_id"')
+
+        recovered = SpillBuffer(str(tmp_path), segment_size=1 << 20)
+
+        assert len(recovered) == 2
+        assert recovered.peek(10) == entries(0, 2)
+
+        recovered.commit()
+
+        assert recovered.empty
+
+    def test_append_when_full(self, tmp_path: Path) -> None:
+        spill = SpillBuffer(str(tmp_path), segment_size=1 << 20, max_size=1)
+
+        with pytest.raises(ProduceRecordFailedException):
+            spill.append(entries(0, 1))
+
+        assert spill.empty
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any, AsyncGenerator, Dict, List, Set, Tuple
+
+from solana.rpc.commitment import Confirmed
+
+from sintra.subscriber.confirmation import SignatureConfirmation
+
+
+def signature_statuses(confirmed: Set[str]):
+    async def get_signature_statuses(signatures: List[str]) -> Dict[str, Any]:
+        return {
+            "result": {
+                "value": [
+                    {"confirmationStatus": "confirmed"}
+                    if signature in confirmed
+                    else None
+                    for signature in signatures
+                ]
+            }
+        }
+
+    return get_signature_statuses
+
+
+async def stream(
+    signatures: List[str],
+) -> AsyncGenerator[Tuple[str, str, int], None]:
+    for signature in signatures:
+        yield "account", signature, 0
+    await asyncio.Event().wait()
+
+
+async def released(
+    confirmation: SignatureConfirmation, signatures: List[str], count: int
+) -> List[str]:
+    result: List[str] = []
+    confirmed = confirmation.confirm(stream(signatures))
+    async for _, signature, _ in confirmed:
+        result.append(signature)
+        if len(result) == count:
+            break
+    await confirmed.aclose()
+    return result
+
+
+class TestSignatureConfirmation:
+    def test_confirmed_released_before_unconfirmed_ones(self) -> None:
+        confirmation = SignatureConfirmation(
+            signature_statuses({"second", "third"}),
+            Confirmed,
+            poll_interval=0.01,
+            timeout=30,
+        )
+
+        result = asyncio.run(
+            asyncio.wait_for(
+                released(confirmation, ["first", "second", "third"], 2), timeout=1
+            )
+        )
+
+        assert result == ["second", "third"]
+
+    def test_unconfirmed_dropped_after_timeout(self) -> None:
+        confirmed: Set[str] = set()
+        confirmation = SignatureConfirmation(
+            signature_statuses(confirmed), Confirmed, poll_interval=0.01, timeout=0.05
+        )
+
+        async def late_stream() -> AsyncGenerator[Tuple[str, str, int], None]:
+            yield "account", "dropped", 0
+            await asyncio.sleep(0.2)
+            # Confirmed only after it has timed out.
+            confirmed.update({"dropped", "late"})
+            yield "account", "late", 0
+            await asyncio.Event().wait()
+
+        async def first_released() -> str:
+            confirmed_transactions = confirmation.confirm(late_stream())
+            _, signature, _ = await confirmed_transactions.__anext__()
+            await confirmed_transactions.aclose()
+            return signature
+
+        assert asyncio.run(asyncio.wait_for(first_released(), timeout=1)) == "late"
+
+    def test_checkpoint_not_advanced_past_pending(self) -> None:
+        confirmed = {"second"}
+        confirmation = SignatureConfirmation(
+            signature_statuses(confirmed), Confirmed, poll_interval=0.01, timeout=30
+        )
+        checkpoints = {"account": "previous"}
+
+        async def checkpoints_on_release() -> List[Tuple[str, Dict[str, str]]]:
+            result: List[Tuple[str, Dict[str, str]]] = []
+            confirmed_transactions = confirmation.confirm(
+                stream(["first", "second", "third"]), checkpoints
+            )
+            async for _, signature, _ in confirmed_transactions:
+                result.append((signature, dict(checkpoints)))
+                if len(result) == 3:
+                    break
+                # The older one is confirmed only after the newer was released.
+                confirmed.update({"first", "third"})
+            await confirmed_transactions.aclose()
+            return result
+
+        result = asyncio.run(asyncio.wait_for(checkpoints_on_release(), timeout=1))
+
+        assert result == [
+            ("second", {"account": "previous"}),
+            ("first", {"account": "previous"}),
+            ("third", {"account": "second"}),
+        ]
@@ -0,0 +1,61 @@
+import pytest
+
+from sintra.subscriber import endpoint
+from sintra.subscriber.endpoint import EndpointPool
+
+ENDPOINTS = ["http://first:8899", "http://second:8899", "http://third:8899"]
+
+
+class TestEndpointPool:
+    def test_ranked_by_latency(self) -> None:
+        pool = EndpointPool(ENDPOINTS)
+
+        pool.record_success(ENDPOINTS[0], 0.3)
+        pool.record_success(ENDPOINTS[1], 0.1)
+
+        # Endpoints without measurement are tried first.
+        assert pool.ranked() == [ENDPOINTS[2], ENDPOINTS[1], ENDPOINTS[0]]
+
+    def test_latency_smoothed(self) -> None:
+        pool = EndpointPool(ENDPOINTS[:2], smoothing=0.5)
+
+        pool.record_success(ENDPOINTS[0], 0.1)
+        pool.record_success(ENDPOINTS[1], 0.2)
+        pool.record_success(ENDPOINTS[0], 0.5)
+
+        assert pool.endpoints[ENDPOINTS[0]].latency == pytest.approx(0.3)
+        assert pool.select() == ENDPOINTS[1]
+
+    def test_failover_until_cooldown_ends(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        now = [100.0]
+        monkeypatch.setattr(endpoint, "monotonic", lambda: now[0])
+        pool = EndpointPool(ENDPOINTS, cooldown=30)
+        for latency, url in enumerate(ENDPOINTS):
+            pool.record_success(url, latency)
+
+        pool.record_failure(ENDPOINTS[0])
+        now[0] = 110
+        pool.record_failure(ENDPOINTS[1])
+
+        # Unhealthy endpoints come last, the one recovering soonest first.
+        assert pool.ranked() == [ENDPOINTS[2], ENDPOINTS[0], ENDPOINTS[1]]
+        assert pool.endpoints[ENDPOINTS[0]].error_rate == 0.5
+
+        now[0] = 130
+        assert pool.select() == ENDPOINTS[0]
+
+    def test_recovered_after_success(self) -> None:
+        pool = EndpointPool(ENDPOINTS[:2])
+        pool.record_success(ENDPOINTS[0], 0.1)
+        pool.record_success(ENDPOINTS[1], 0.2)
+
+        pool.record_failure(ENDPOINTS[0])
+        pool.record_success(ENDPOINTS[0], 0.1)
+
+        assert pool.select() == ENDPOINTS[0]
+
+    def test_pool_when_empty(self) -> None:
+        with pytest.raises(ValueError):
+            EndpointPool([])
@@ -0,0 +1,187 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import pytest
+
+from sintra.exception import ClientRPCConnectionException
+from sintra.subscriber import ethereum
+from sintra.subscriber.ethereum import EthereumRPCClient, SubscriptionMode
+
+WS_ENDPOINT = "ws://localhost:8546"
+FIRST = "0x7Be8076f4EA4A4AD08075C2508e481d6C946D12b"
+SECOND = "0x7f268357A8c2552623316e2562D90e642bB538E5"
+
+
+def log(
+    address: str, transaction_hash: str, block_number: int, removed: bool = False
+) -> Dict[str, Any]:
+    return {
+        "address": address.lower(),
+        "transactionHash": transaction_hash,
+        "blockNumber": hex(block_number),
+        "removed": removed,
+    }
+
+
+def new_head(block_number: int) -> str:
+    return json.dumps(
+        {"params": {"subscription": "0x1", "result": {"number": hex(block_number)}}}
+    )
+
+
+class FakeWebSocket:
+    """Stands in for websocket connection, replaying `messages`."""
+
+    def __init__(self, messages: List[str]) -> None:
+        self.messages = messages
+        self.sent: List[Dict[str, Any]] = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+    async def recv(self) -> str:
+        if not self.messages:
+            await asyncio.Event().wait()
+        return self.messages.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch: pytest.MonkeyPatch) -> None:
+    for env_name in (
+        "ETHEREUM_RPC_HTTP_USERNAME",
+        "ETHEREUM_RPC_HTTP_PASSWORD",
+        "ETHEREUM_RPC_WS_USERNAME",
+        "ETHEREUM_RPC_WS_PASSWORD",
+    ):
+        monkeypatch.setenv(env_name, "")
+
+
+def rpc_client(**kwargs: Any) -> EthereumRPCClient:
+    return EthereumRPCClient(["http://localhost:8545"], 10, [WS_ENDPOINT], 10, **kwargs)
+
+
+class TestEthereumRPCClient:
+    def test_blocks_mode_head_advanced_after_pull(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        websocket = FakeWebSocket(
+            [json.dumps({"id": 1, "result": "0x1"})]
+            + [new_head(block_number) for block_number in (16, 17, 18)]
+        )
+
+        @asynccontextmanager
+        async def connect(uri: str, ping_timeout: int) -> AsyncIterator[FakeWebSocket]:
+            yield websocket
+
+        monkeypatch.setattr(ethereum, "connect", connect)
+        client = rpc_client(mode=SubscriptionMode.BLOCKS)
+        pulled: List[Tuple[int, int]] = []
+
+        async def request(method: str, params: List[Any]) -> Any:
+            from_block = int(params[0]["fromBlock"], 16)
+            to_block = int(params[0]["toBlock"], 16)
+            pulled.append((from_block, to_block))
+            if len(pulled) == 1:
+                raise ClientRPCConnectionException("Rate limited.")
+            return [
+                log(FIRST, f"0x{block:x}", block)
+                for block in range(from_block, to_block + 1)
+            ]
+
+        monkeypatch.setattr(client, "request", request)
+
+        async def received() -> List[Tuple[str, int]]:
+            transactions = client._listen(WS_ENDPOINT, [FIRST])
+            items = []
+            async for _, transaction_hash, _, block_number in transactions:
+                items.append((transaction_hash, block_number))
+                if len(items) == 3:
+                    break
+            await transactions.aclose()
+            return items
+
+        items = asyncio.run(asyncio.wait_for(received(), timeout=1))
+
+        assert websocket.sent[0]["params"] == ["newHeads"]
+        # Block 16 failed, so it is pulled again with the next head.
+        assert pulled == [(16, 16), (16, 17), (18, 18)]
+        assert items == [("0x10", 16), ("0x11", 17), ("0x12", 18)]
+
+    def test_pull_from_block(self) -> None:
+        client = rpc_client()
+        client.last_block_recv = {FIRST: 12, SECOND: 10}
+        account_map = {FIRST.lower(): FIRST, SECOND.lower(): SECOND}
+
+        # First head of a connection catches up from the earliest position.
+        assert client._pull_from_block(account_map, None, 20) == 10
+        assert client._pull_from_block({}, None, 20) == 20
+        assert client._pull_from_block(account_map, 21, 25) == 21
+        # Reorganized head isn't past the previous one.
+        assert client._pull_from_block(account_map, 21, 19) == 19
+
+    def test_group_by_transaction(self) -> None:
+        client = rpc_client()
+        account_map = {FIRST.lower(): FIRST, SECOND.lower(): SECOND}
+
+        transactions = client._group_by_transaction(
+            account_map,
+            [
+                log(FIRST, "0xold", 9),
+                log(FIRST, "0xa", 10),
+                log(SECOND, "0xa", 10),
+                log(SECOND, "0xremoved", 11, removed=True),
+                log(SECOND, "0xb", 11),
+            ],
+            {FIRST: 10},
+        )
+
+        assert [
+            (account, transaction_hash, block_number)
+            for account, transaction_hash, _, block_number in transactions
+        ] == [(FIRST, "0xa", 10), (SECOND, "0xb", 11)]
+
+    def test_pull_blocks_when_get_logs_fails(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        client = rpc_client()
+
+        async def request(method: str, params: List[Any]) -> Any:
+            raise ClientRPCConnectionException("Rate limited.")
+
+        monkeypatch.setattr(client, "request", request)
+
+        assert asyncio.run(client._pull_blocks({FIRST.lower(): FIRST}, 10, 12)) is None
+
+    @pytest.mark.parametrize(
+        "account_topics, expected",
+        [
+            ({FIRST: ["0xb"], SECOND: ["0xa", "0xb"]}, [["0xa", "0xb"]]),
+            # Topics would filter out every event of the account without them.
+            ({FIRST: ["0xa"]}, []),
+            ({FIRST: ["0xa"], SECOND: []}, []),
+        ],
+    )
+    def test_topics(
+        self, account_topics: Dict[str, List[str]], expected: List[Any]
+    ) -> None:
+        client = rpc_client(account_topics=account_topics)
+
+        assert client.topics([FIRST, SECOND]) == expected
+
+    def test_get_logs_filtered_by_topics(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        client = rpc_client(backfill_block_range=5, account_topics={FIRST: ["0xa"]})
+        filters: List[Dict[str, Any]] = []
+
+        async def request(method: str, params: List[Any]) -> Any:
+            filters.append(params[0])
+            return []
+
+        monkeypatch.setattr(client, "request", request)
+        asyncio.run(client.get_logs([FIRST], 10, 20))
+
+        assert [
+            (log_filter["fromBlock"], log_filter["toBlock"]) for log_filter in filters
+        ] == [("0xa", "0xe"), ("0xf", "0x13"), ("0x14", "0x14")]
+        assert all(log_filter["topics"] == [["0xa"]] for log_filter in filters)
@@ -0,0 +1,106 @@
+import asyncio
+from typing import AsyncGenerator, Dict, List, Tuple
+
+import pytest
+
+from sintra.exception import ClientRPCConnectionException
+from sintra.subscriber.endpoint import EndpointPool
+from sintra.subscriber.redundancy import RedundantSubscription, merge
+from sintra.subscriber.supervisor import ConnectionSupervisor
+
+FIRST = "ws://first:8900"
+SECOND = "ws://second:8900"
+
+
+async def timed(
+    items: List[Tuple[float, str]], closed: List[str]
+) -> AsyncGenerator[str, None]:
+    """Yield every item after its delay in seconds."""
+    try:
+        for delay, item in items:
+            await asyncio.sleep(delay)
+            yield item
+    finally:
+        closed.append(items[0][1])
+
+
+async def collect(stream: AsyncGenerator, count: int) -> List:
+    items = []
+    async for item in stream:
+        items.append(item)
+        if len(items) == count:
+            break
+    await stream.aclose()
+    return items
+
+
+class TestMerge:
+    def test_items_in_arrival_order(self) -> None:
+        closed: List[str] = []
+        merged = merge(
+            timed([(0, "a-1"), (0.1, "a-2")], closed),
+            timed([(0.05, "b-1"), (0.1, "b-2")], closed),
+        )
+
+        assert asyncio.run(collect(merged, 4)) == ["a-1", "b-1", "a-2", "b-2"]
+
+    def test_continues_after_stream_ends(self) -> None:
+        closed: List[str] = []
+        merged = merge(
+            timed([(0, "a-1")], closed),
+            timed([(0.05, "b-1"), (0.05, "b-2"), (0.05, "b-3")], closed),
+        )
+
+        assert asyncio.run(collect(merged, 10)) == ["a-1", "b-1", "b-2", "b-3"]
+
+    def test_streams_closed_when_closed(self) -> None:
+        closed: List[str] = []
+        merged = merge(
+            timed([(0, "a-1"), (1, "a-2")], closed),
+            timed([(1, "b-1")], closed),
+        )
+
+        assert asyncio.run(collect(merged, 1)) == ["a-1"]
+        assert sorted(closed) == ["a-1", "b-1"]
+
+
+class TestRedundantSubscription:
+    def test_first_arrival_kept_when_provider_dies(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(ConnectionSupervisor, "backoff_delay", lambda self: 0)
+        pool = EndpointPool([FIRST, SECOND])
+        subscription = RedundantSubscription(pool, redundancy=2)
+        connections: Dict[str, int] = {FIRST: 0, SECOND: 0}
+
+        async def listen(ws_endpoint: str) -> AsyncGenerator[Tuple[str, str], None]:
+            connections[ws_endpoint] += 1
+            if ws_endpoint == FIRST and connections[FIRST] == 1:
+                # Fastest provider, which dies after two transactions.
+                yield "account", "signature-1"
+                await asyncio.sleep(0.1)
+                yield "account", "signature-2"
+                raise ClientRPCConnectionException("Connection closed.")
+            if ws_endpoint == SECOND:
+                for index in range(1, 4):
+                    await asyncio.sleep(0.05 if index == 1 else 0.1)
+                    yield "account", f"signature-{index}"
+            await asyncio.Event().wait()
+
+        transactions = asyncio.run(
+            asyncio.wait_for(
+                collect(subscription.listen(listen, key=lambda item: item[1]), 3),
+                timeout=2,
+            )
+        )
+
+        assert [signature for _, signature in transactions] == [
+            "signature-1",
+            "signature-2",
+            "signature-3",
+        ]
+        assert pool.endpoints[FIRST].errors == 1
+        assert connections[FIRST] == 2
+        assert pool.endpoints[FIRST].first_arrivals == 2
+        assert pool.endpoints[SECOND].first_arrivals == 1
+        assert pool.endpoints[SECOND].arrivals == 3
@@ -0,0 +1,133 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+from sintra.subscriber.solana import SolanaRPCClient
+
+HTTP_ENDPOINT = "http://localhost:8899"
+
+# Account signatures, newest first as returned by `getSignaturesForAddress`.
+SIGNATURES = [f"signature-{index}" for index in reversed(range(10))]
+
+
+class FakeHTTPClient:
+    """Stands in for `AsynchronousClient`, serving `SIGNATURES`."""
+
+    def __init__(self, failing: bool = False) -> None:
+        self.failing = failing
+        self.requests: List[Optional[str]] = []
+
+    async def get_signatures_for_address(
+        self, account: str, before: Optional[str], until: Optional[str], limit: int
+    ) -> Dict[str, Any]:
+        self.requests.append(before)
+        if self.failing:
+            raise httpx.ConnectError("Connection refused.")
+
+        start = SIGNATURES.index(before) + 1 if before else 0
+        end = SIGNATURES.index(until) if until else len(SIGNATURES)
+        return {
+            "result": [
+                {"signature": signature} for signature in SIGNATURES[start:end][:limit]
+            ]
+        }
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch: pytest.MonkeyPatch) -> None:
+    for env_name in (
+        "SOLANA_RPC_HTTP_USERNAME",
+        "SOLANA_RPC_HTTP_PASSWORD",
+        "SOLANA_RPC_WS_USERNAME",
+        "SOLANA_RPC_WS_PASSWORD",
+    ):
+        monkeypatch.setenv(env_name, "")
+
+
+def rpc_client(
+    http_client: FakeHTTPClient, page_size: int = 3, max_signatures: int = 100
+) -> SolanaRPCClient:
+    client = SolanaRPCClient(
+        [HTTP_ENDPOINT],
+        10,
+        ["ws://localhost:8900"],
+        10,
+        backfill_page_size=page_size,
+        backfill_max_signatures=max_signatures,
+    )
+    client.http_clients[HTTP_ENDPOINT] = http_client
+    return client
+
+
+class TestSolanaRPCClient:
+    def test_get_signatures_until_pages_backwards(self) -> None:
+        http_client = FakeHTTPClient()
+
+        signatures = asyncio.run(
+            rpc_client(http_client).get_signatures_until("account", "signature-2")
+        )
+
+        assert [signature for signature, _ in signatures] == [
+            f"signature-{index}" for index in range(3, 10)
+        ]
+        assert http_client.requests == [None, "signature-7", "signature-4"]
+
+    def test_get_signatures_until_from_before(self) -> None:
+        signatures = asyncio.run(
+            rpc_client(FakeHTTPClient()).get_signatures_until(
+                "account", "signature-2", "signature-6"
+            )
+        )
+
+        assert [signature for signature, _ in signatures] == [
+            "signature-3",
+            "signature-4",
+            "signature-5",
+        ]
+
+    def test_get_signatures_until_capped(self) -> None:
+        http_client = FakeHTTPClient()
+
+        signatures = asyncio.run(
+            rpc_client(http_client, max_signatures=5).get_signatures_until(
+                "account", "signature-0"
+            )
+        )
+
+        # Paging stops once the cap is reached, keeping the newest signatures.
+        assert [signature for signature, _ in signatures] == [
+            f"signature-{index}" for index in range(4, 10)
+        ]
+        assert len(http_client.requests) == 2
+
+    def test_backfill_from_last_signature(self) -> None:
+        client = rpc_client(FakeHTTPClient())
+        client.last_signature_recv["account"] = "signature-7"
+
+        async def backfilled() -> List[str]:
+            return [
+                f"{account}/{signature}"
+                async for account, signature, _ in client._backfill("account")
+            ]
+
+        assert asyncio.run(backfilled()) == [
+            "account/signature-8",
+            "account/signature-9",
+        ]
+
+    @pytest.mark.parametrize(
+        "last_signature, failing", [(None, False), ("signature-7", True)]
+    )
+    def test_backfill_when_nothing_to_backfill(
+        self, last_signature: Optional[str], failing: bool
+    ) -> None:
+        client = rpc_client(FakeHTTPClient(failing))
+        if last_signature is not None:
+            client.last_signature_recv["account"] = last_signature
+
+        async def backfilled() -> List[str]:
+            return [signature async for _, signature, _ in client._backfill("account")]
+
+        assert asyncio.run(backfilled()) == []
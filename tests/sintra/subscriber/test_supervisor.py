@@ -0,0 +1,81 @@
+import asyncio
+from typing import AsyncGenerator, List
+
+import pytest
+
+from sintra.exception import ClientRPCConnectionException
+from sintra.subscriber import supervisor
+from sintra.subscriber.supervisor import ConnectionState, ConnectionSupervisor
+
+
+@pytest.fixture
+def delays(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    """Backoff delays the supervisor slept for, without sleeping."""
+    slept: List[float] = []
+
+    async def sleep(delay: float) -> None:
+        slept.append(delay)
+
+    monkeypatch.setattr(supervisor.asyncio, "sleep", sleep)
+    return slept
+
+
+class TestConnectionSupervisor:
+    @pytest.mark.parametrize(
+        "jitter_factor, expected",
+        [
+            # Jitter shortens the delay by up to half of it.
+            (0.5, [0.25, 0.5, 1, 2, 2, 2]),
+            (1, [0.5, 1, 2, 4, 4, 4]),
+        ],
+    )
+    def test_backoff_delay_bounds(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        jitter_factor: float,
+        expected: List[float],
+    ) -> None:
+        connection_supervisor = ConnectionSupervisor(
+            "test", initial_backoff=0.5, max_backoff=4, multiplier=2, jitter=0.5
+        )
+
+        def uniform(low: float, high: float) -> float:
+            assert (low, high) == (0.5, 1)
+            return jitter_factor
+
+        monkeypatch.setattr(supervisor.random, "uniform", uniform)
+        delays = []
+        for failures in range(1, 7):
+            connection_supervisor.consecutive_failures = failures
+            delays.append(connection_supervisor.backoff_delay())
+
+        assert delays == expected
+
+    def test_backoff_reset_after_success(self, delays: List[float]) -> None:
+        connection_supervisor = ConnectionSupervisor(
+            "test", initial_backoff=1, max_backoff=30, multiplier=2, jitter=0
+        )
+        attempts = [0]
+
+        async def connect() -> AsyncGenerator[str, None]:
+            attempts[0] += 1
+            if attempts[0] in (4, 5):
+                yield f"item-{attempts[0]}"
+            raise ClientRPCConnectionException("Connection refused.")
+
+        async def received() -> List[str]:
+            items = []
+            stream = connection_supervisor.run(connect)
+            async for item in stream:
+                items.append(item)
+                if len(items) == 2:
+                    break
+            await stream.aclose()
+            return items
+
+        assert asyncio.run(received()) == ["item-4", "item-5"]
+        # Three failed attempts back off exponentially, the connection that
+        # delivered data starts over from the initial backoff.
+        assert delays == [1, 2, 4, 1]
+        assert connection_supervisor.reconnects == 4
+        assert connection_supervisor.state == ConnectionState.CONNECTED
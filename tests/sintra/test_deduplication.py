@@ -0,0 +1,53 @@
+from sintra.deduplication import SignatureCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSignatureCache:
+    def test_add(self) -> None:
+        cache = SignatureCache(max_size=10, ttl=60, clock=FakeClock())
+
+        assert cache.add("first")
+        assert not cache.add("first")
+        assert "first" in cache
+
+    def test_least_recently_seen_evicted(self) -> None:
+        clock = FakeClock()
+        cache = SignatureCache(max_size=2, ttl=60, clock=clock)
+
+        cache.add("first")
+        clock.now = 1
+        cache.add("second")
+        clock.now = 2
+        # Seeing it again makes "first" the most recently seen one.
+        cache.add("first")
+        clock.now = 3
+        cache.add("third")
+
+        assert len(cache) == 2
+        assert "first" in cache
+        assert "second" not in cache
+        assert cache.add("second")
+
+    def test_expired_after_ttl(self) -> None:
+        clock = FakeClock()
+        cache = SignatureCache(max_size=10, ttl=60, clock=clock)
+
+        cache.add("first")
+        clock.now = 30
+        cache.add("second")
+        clock.now = 60
+
+        assert "first" not in cache
+        assert "second" in cache
+        assert cache.add("first")
+        # Expired entries are dropped on the next add.
+        clock.now = 90
+        cache.add("third")
+        assert len(cache) == 2
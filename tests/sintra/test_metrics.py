@@ -0,0 +1,54 @@
+from time import time_ns
+
+from sintra.kinesis.record import KinesisRecord
+from sintra.metrics import ACK_LATENCY_BUCKETS, WorkerMetrics
+
+
+def record(market_address: int, timestamp: int) -> KinesisRecord:
+    return KinesisRecord(65536, "MagicEden", market_address, "account", "", timestamp)
+
+
+class TestWorkerMetrics:
+    def test_render(self) -> None:
+        metrics = WorkerMetrics({65793: "MagicEden", 65794: "Solanart"})
+        metrics.duplicates[65794] += 2
+        metrics.register(
+            "sintra_worker_producer_queue_depth", "Records waiting.", lambda: 7
+        )
+        # Acknowledged 0.2 seconds after the signature was received.
+        metrics.observe_acknowledged([record(65793, time_ns() - 200_000_000)])
+
+        lines = metrics.render().splitlines()
+
+        assert lines[:8] == [
+            "# HELP sintra_worker_signatures_total Transaction signatures published to Kinesis.",
+            "# TYPE sintra_worker_signatures_total counter",
+            'sintra_worker_signatures_total{market="MagicEden"} 1',
+            'sintra_worker_signatures_total{market="Solanart"} 0',
+            "# HELP sintra_worker_duplicates_dropped_total Duplicate transaction signatures dropped.",
+            "# TYPE sintra_worker_duplicates_dropped_total counter",
+            'sintra_worker_duplicates_dropped_total{market="MagicEden"} 0',
+            'sintra_worker_duplicates_dropped_total{market="Solanart"} 2',
+        ]
+        assert "# TYPE sintra_worker_ack_latency_seconds histogram" in lines
+        assert (
+            'sintra_worker_ack_latency_seconds_bucket{market="MagicEden",le="0.1"} 0'
+            in lines
+        )
+        assert (
+            'sintra_worker_ack_latency_seconds_bucket{market="MagicEden",le="0.25"} 1'
+            in lines
+        )
+        assert (
+            'sintra_worker_ack_latency_seconds_bucket{market="MagicEden",le="+Inf"} 1'
+            in lines
+        )
+        assert 'sintra_worker_ack_latency_seconds_count{market="MagicEden"} 1' in lines
+        assert 'sintra_worker_ack_latency_seconds_count{market="Solanart"} 0' in lines
+        assert lines[-3:] == [
+            "# HELP sintra_worker_producer_queue_depth Records waiting.",
+            "# TYPE sintra_worker_producer_queue_depth gauge",
+            "sintra_worker_producer_queue_depth 7",
+        ]
+        # Buckets, sum and count of both markets, with HELP and TYPE.
+        assert len(lines) == 8 + 2 + 2 * (len(ACK_LATENCY_BUCKETS) + 3) + 3
@@ -0,0 +1,101 @@
+from typing import Any, Dict, List
+
+import pytest
+from cachetools import TTLCache
+
+from sintra import utils
+from sintra.utils import get_env_variable
+
+
+class ResourceNotFoundException(Exception):
+    pass
+
+
+class FakeSecretsManager:
+    """Stands in for secrets manager client, serving `secrets`."""
+
+    exceptions = type(
+        "Exceptions", (), {"ResourceNotFoundException": ResourceNotFoundException}
+    )
+
+    def __init__(self, secrets: Dict[str, str]) -> None:
+        self.secrets = secrets
+        self.failing = False
+        self.requests: List[str] = []
+
+    def get_secret_value(self, SecretId: str) -> Dict[str, Any]:
+        self.requests.append(SecretId)
+        if self.failing:
+            raise ConnectionError("Secrets manager is unreachable.")
+        if SecretId not in self.secrets:
+            raise ResourceNotFoundException(SecretId)
+        return {"SecretString": self.secrets[SecretId]}
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def timer(monkeypatch: pytest.MonkeyPatch) -> FakeTimer:
+    fake_timer = FakeTimer()
+    monkeypatch.setattr(
+        utils, "_secret_cache", TTLCache(maxsize=10, ttl=60, timer=fake_timer)
+    )
+    return fake_timer
+
+
+@pytest.fixture
+def secrets_manager(monkeypatch: pytest.MonkeyPatch) -> FakeSecretsManager:
+    fake_secrets_manager = FakeSecretsManager({"SINTRA_TEST_SECRET": "secret"})
+    monkeypatch.setattr(utils, "_secrets_manager", fake_secrets_manager)
+    monkeypatch.delenv("SINTRA_TEST_SECRET", raising=False)
+    monkeypatch.delenv("SINTRA_TEST_MISSING", raising=False)
+    return fake_secrets_manager
+
+
+class TestGetEnvVariable:
+    def test_environment_variable_preferred(
+        self, monkeypatch: pytest.MonkeyPatch, secrets_manager: FakeSecretsManager
+    ) -> None:
+        monkeypatch.setenv("SINTRA_TEST_SECRET", "local")
+
+        assert get_env_variable("SINTRA_TEST_SECRET") == "local"
+        assert secrets_manager.requests == []
+
+    def test_secret_cached(
+        self, timer: FakeTimer, secrets_manager: FakeSecretsManager
+    ) -> None:
+        assert get_env_variable("SINTRA_TEST_SECRET") == "secret"
+        assert get_env_variable("SINTRA_TEST_SECRET") == "secret"
+        # Missing secrets are cached as well.
+        assert get_env_variable("SINTRA_TEST_MISSING") is None
+        assert get_env_variable("SINTRA_TEST_MISSING") is None
+
+        assert secrets_manager.requests == ["SINTRA_TEST_SECRET", "SINTRA_TEST_MISSING"]
+
+    def test_secret_expired(
+        self, timer: FakeTimer, secrets_manager: FakeSecretsManager
+    ) -> None:
+        get_env_variable("SINTRA_TEST_SECRET")
+        secrets_manager.secrets["SINTRA_TEST_SECRET"] = "rotated"
+
+        timer.now = 59
+        assert get_env_variable("SINTRA_TEST_SECRET") == "secret"
+        timer.now = 61
+        assert get_env_variable("SINTRA_TEST_SECRET") == "rotated"
+
+    def test_failed_lookup_not_cached(
+        self, timer: FakeTimer, secrets_manager: FakeSecretsManager
+    ) -> None:
+        secrets_manager.failing = True
+        with pytest.raises(ConnectionError):
+            get_env_variable("SINTRA_TEST_SECRET")
+
+        secrets_manager.failing = False
+        assert get_env_variable("SINTRA_TEST_SECRET") == "secret"
+        assert secrets_manager.requests == ["SINTRA_TEST_SECRET"] * 2
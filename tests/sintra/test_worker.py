@@ -0,0 +1,69 @@
+import asyncio
+from types import SimpleNamespace
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+
+from sintra.checkpoint.store import CheckpointStore
+from sintra.worker import TransactionWorker
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    def __init__(self, failing: bool = False) -> None:
+        self.failing = failing
+        self.saved: List[Dict[str, str]] = []
+
+    def load(self, market_accounts: List[str]) -> Dict[str, str]:
+        if self.failing:
+            raise RuntimeError("Table not found.")
+        return {}
+
+    def save(self, checkpoints: Dict[str, str]) -> None:
+        self.saved.append(checkpoints)
+
+
+class StubTransactionWorker(TransactionWorker):
+    def transactions(
+        self, market_accounts: List[str]
+    ) -> AsyncGenerator[Tuple[str, str, int], None]:
+        raise NotImplementedError
+
+    def get_checkpoint(self, market_account: str) -> Optional[str]:
+        return None
+
+    def restore_checkpoints(self, checkpoints: Dict[str, str]) -> None:
+        pass
+
+    @classmethod
+    def build_from_settings(cls) -> TransactionWorker:
+        raise NotImplementedError
+
+
+class TestTransactionWorker:
+    def test_checkpoints_saved_once_acknowledged(self) -> None:
+        store = MemoryCheckpointStore()
+        worker = StubTransactionWorker("signatures", store, checkpoint_interval=0.01)
+        producer = SimpleNamespace(enqueued_count=3, sent_count=0)
+
+        async def save_checkpoints() -> List[List[Dict[str, str]]]:
+            task = asyncio.ensure_future(worker._save_checkpoints(producer))
+            # Checkpoints present at startup count as saved.
+            await asyncio.sleep(0)
+            worker.checkpoints = {"account": "signature-3"}
+            await asyncio.sleep(0.1)
+            # Records enqueued before the snapshot are still in flight.
+            unacknowledged = list(store.saved)
+
+            producer.sent_count = 3
+            await asyncio.sleep(0.1)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return [unacknowledged, store.saved]
+
+        unacknowledged, saved = asyncio.run(save_checkpoints())
+
+        assert unacknowledged == []
+        assert saved == [{"account": "signature-3"}]
+
+    def test_load_checkpoints_when_store_fails(self) -> None:
+        worker = StubTransactionWorker("signatures", MemoryCheckpointStore(True))
+
+        assert asyncio.run(worker._load_checkpoints(["account"])) == {}